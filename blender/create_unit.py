@@ -4,6 +4,11 @@
 Reads a blueprint file that describes body parameters, equipment, animations,
 and generates a self-contained .blend file with all Actions baked in.
 
+Several blueprints can be built in one Blender session. The decimated
+MakeHuman base (mesh, rig, skin, hair) is built once per distinct body,
+saved to blender/cache/bases/ and appended into a fresh scene for every
+unit that shares it, in this and later runs.
+
 Usage:
     blender --background --python blender/create_unit.py -- \\
         --blueprint blender/blueprints/archer.json
@@ -12,9 +17,20 @@ Usage:
     blender --background --python blender/create_unit.py -- \\
         --blueprint blender/blueprints/archer.json \\
         --output blender/models/custom_archer.blend
+
+    # Batch: several blueprints, or every blueprint, in one session
+    blender --background --python blender/create_unit.py -- \\
+        --blueprint blender/blueprints/archer.json blender/blueprints/clubman.json
+    blender --background --python blender/create_unit.py -- --all-blueprints
+
+    # Ignore cached bases (e.g. after editing an MPFB asset) and rebuild them
+    blender --background --python blender/create_unit.py -- \\
+        --blueprint blender/blueprints/archer.json --rebuild-base
 """
 
 import argparse
+import glob
+import hashlib
 import json
 import math
 import os
@@ -39,6 +55,15 @@ bpy.ops.preferences.addon_enable(module="bl_ext.blender_org.mpfb")
 from bl_ext.blender_org.mpfb.services.humanservice import HumanService  # noqa: E402
 from bl_ext.blender_org.mpfb.services.locationservice import LocationService  # noqa: E402
 
+BLUEPRINTS_DIR = os.path.join(PROJECT_ROOT, "blender", "blueprints")
+BASE_CACHE_DIR = os.path.join(PROJECT_ROOT, "blender", "cache", "bases")
+
+# Bump to invalidate cached bases after changing how they are built
+BASE_CACHE_VERSION = 1
+
+DEFAULT_SKIN = "young_caucasian_male"
+DEFAULT_DECIMATE_RATIO = 0.25
+
 
 def parse_args():
     """Parse CLI arguments (after Blender's -- separator)."""
@@ -50,15 +75,38 @@ def parse_args():
         argv = []
 
     parser = argparse.ArgumentParser(description="Create a unit model from blueprint")
-    parser.add_argument(
-        "--blueprint", required=True,
-        help="Path to blueprint JSON file",
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--blueprint", nargs="+",
+        help="Path(s) to blueprint JSON files, built in one Blender session",
+    )
+    source.add_argument(
+        "--all-blueprints", action="store_true",
+        help="Build every blueprint in blender/blueprints/",
     )
     parser.add_argument(
         "--output", default=None,
-        help="Output .blend path (default: blender/models/{name}.blend)",
+        help="Output .blend path (default: blender/models/{name}.blend; "
+             "single blueprint only)",
+    )
+    parser.add_argument(
+        "--base-cache-dir", default=BASE_CACHE_DIR,
+        help="Directory for cached decimated bases "
+             "(default: blender/cache/bases)",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--rebuild-base", action="store_true",
+        help="Rebuild decimated bases even if a cached one exists",
+    )
+    args = parser.parse_args(argv)
+    if args.all_blueprints:
+        args.blueprint = sorted(
+            path for path in glob.glob(os.path.join(BLUEPRINTS_DIR, "*.json"))
+            if os.path.basename(path) != "schema.json"
+        )
+    if args.output and len(args.blueprint) > 1:
+        parser.error("--output requires a single --blueprint")
+    return args
 
 
 def load_blueprint(path):
@@ -75,12 +123,8 @@ def load_blueprint(path):
     return blueprint
 
 
-def load_makehuman_base(mhm_path, body_config):
-    """Load the MakeHuman model with game_engine rig via MPFB2.
-
-    Enables skin material, body parts (eyes), and optionally clothes/hair
-    based on the blueprint's body config.
-    """
+def base_deserialization_settings():
+    """MPFB2 .mhm deserialization settings used for every unit base."""
     settings = HumanService.get_default_deserialization_settings()
     settings["override_rig"] = "game_engine"
     settings["subdiv_levels"] = 0
@@ -92,7 +136,16 @@ def load_makehuman_base(mhm_path, body_config):
     settings["load_clothes"] = True
     # Use GAMEENGINE skin model for better render performance
     settings["override_skin_model"] = "GAMEENGINE"
+    return settings
+
+
+def load_makehuman_base(mhm_path, body_config):
+    """Load the MakeHuman model with game_engine rig via MPFB2.
 
+    Enables skin material, body parts (eyes), and optionally clothes/hair
+    based on the blueprint's body config.
+    """
+    settings = base_deserialization_settings()
     basemesh = HumanService.deserialize_from_mhm(mhm_path, settings)
     print(f"  Loaded MakeHuman base: {basemesh.name}")
     print(f"    Verts: {len(basemesh.data.vertices)}, "
@@ -612,29 +665,42 @@ def cleanup_mesh(basemesh, decimate_ratio=0.25):
     print(f"    Armature modifier: {arm_mod.object.name if arm_mod.object else 'None'}")
 
 
-def main():
-    args = parse_args()
-    blueprint = load_blueprint(args.blueprint)
-    name = blueprint["name"]
-    body = blueprint["body"]
+def base_mesh_key(body):
+    """Cache key for the decimated base a body config produces.
 
-    # Resolve paths
+    Hashes the .mhm file contents, the deserialization settings, skin,
+    hair (loaded before decimation) and decimate ratio, so editing any of
+    them builds a new base.
+    """
     mhm_path = os.path.join(PROJECT_ROOT, body["mhm_file"])
-    output_path = args.output or os.path.join(
-        PROJECT_ROOT, "blender", "models", f"{name}.blend"
-    )
+    h = hashlib.sha256()
+    with open(mhm_path, "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps([
+        BASE_CACHE_VERSION,
+        bpy.app.version_string,
+        base_deserialization_settings(),
+        body.get("decimate_ratio", DEFAULT_DECIMATE_RATIO),
+        body.get("skin", DEFAULT_SKIN),
+        body.get("hair"),
+    ], sort_keys=True, default=str).encode())
+    return h.hexdigest()
 
-    print(f"=== Create Unit: {name} ===")
-    print(f"  Blueprint: {args.blueprint}")
-    print(f"  MHM: {mhm_path}")
-    print(f"  Output: {output_path}")
 
-    # Clear scene
-    bpy.ops.object.select_all(action="SELECT")
-    bpy.ops.object.delete(use_global=False)
+def reset_scene():
+    """Start a unit from an empty file, dropping the previous unit's data."""
+    bpy.ops.wm.read_homefile(use_empty=True)
+
+
+def build_base(body):
+    """Load, skin, add hair to and decimate the MakeHuman base.
+
+    Returns (basemesh, armature).
+    """
+    mhm_path = os.path.join(PROJECT_ROOT, body["mhm_file"])
+    print(f"  MHM: {mhm_path}")
 
     # 1. Load MakeHuman base model with rig
-    decimate_ratio = body.get("decimate_ratio", 0.25)
     basemesh, armature = load_makehuman_base(mhm_path, body)
     if not armature:
         print("ERROR: No armature found. Cannot create animations.",
@@ -642,7 +708,7 @@ def main():
         sys.exit(1)
 
     # 2. Apply skin texture
-    skin_name = body.get("skin", "young_caucasian_male")
+    skin_name = body.get("skin", DEFAULT_SKIN)
     print("  Applying skin...")
     apply_skin(basemesh, skin_name)
 
@@ -654,7 +720,97 @@ def main():
 
     # 4. Clean up mesh (preserving facial features)
     print("  Cleaning up mesh...")
-    cleanup_mesh(basemesh, decimate_ratio)
+    cleanup_mesh(basemesh, body.get("decimate_ratio", DEFAULT_DECIMATE_RATIO))
+
+    return basemesh, armature
+
+
+class BaseMeshCache:
+    """Decimated MakeHuman bases stored as library .blend files.
+
+    Each base lives in cache_dir as {key}.blend (its objects, with mesh,
+    rig, materials and images as dependencies) plus {key}.json naming the
+    objects. A unit whose key is cached appends a fresh copy of those
+    objects instead of rebuilding the base. With rebuild=True each key is
+    rebuilt once per session, replacing the cached copy.
+    """
+
+    def __init__(self, cache_dir, rebuild=False):
+        self.cache_dir = cache_dir
+        self.rebuild = rebuild
+        self.built = set()  # keys built in this session
+        self.reused = 0
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.blend", f"{base}.json"
+
+    def get(self, body):
+        """Put a base for body into the (empty) scene.
+
+        Returns (basemesh, armature).
+        """
+        key = base_mesh_key(body)
+        blend_path, info_path = self._paths(key)
+        cached = os.path.exists(blend_path) and os.path.exists(info_path)
+        if not cached or (self.rebuild and key not in self.built):
+            return self._build(body, key)
+
+        with open(info_path) as f:
+            info = json.load(f)
+        names = info["objects"]
+        with bpy.data.libraries.load(blend_path) as (data_from, data_to):
+            data_to.objects = list(names)
+        appended = {}
+        for name, obj in zip(names, data_to.objects):
+            if obj is None:
+                print(f"  WARNING: cached base {key[:12]} is missing {name}; "
+                      "rebuilding")
+                reset_scene()
+                return self._build(body, key)
+            bpy.context.scene.collection.objects.link(obj)
+            appended[name] = obj
+        self.reused += 1
+        print(f"  Reused cached base: {body['mhm_file']} ({key[:12]}, "
+              f"{len(appended)} objects)")
+        return appended[info["basemesh"]], appended[info["armature"]]
+
+    def _build(self, body, key):
+        """Build the base in the (empty) scene and write it to the cache."""
+        basemesh, armature = build_base(body)
+        objects = list(bpy.context.scene.objects)
+        blend_path, info_path = self._paths(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a partial base
+        tmp_path = f"{blend_path}.{os.getpid()}.tmp.blend"
+        bpy.data.libraries.write(tmp_path, set(objects), fake_user=True)
+        os.replace(tmp_path, blend_path)
+        with open(info_path, "w") as f:
+            json.dump({
+                "mhm_file": body["mhm_file"],
+                "objects": [obj.name for obj in objects],
+                "basemesh": basemesh.name,
+                "armature": armature.name,
+            }, f, indent=2)
+            f.write("\n")
+        self.built.add(key)
+        print(f"  Cached base: {blend_path}")
+        return basemesh, armature
+
+
+def build_unit(blueprint_path, blueprint, output_path, base_cache):
+    """Build one unit on a copy of its base and save it to output_path."""
+    name = blueprint["name"]
+    body = blueprint["body"]
+
+    print(f"=== Create Unit: {name} ===")
+    print(f"  Blueprint: {blueprint_path}")
+    print(f"  Output: {output_path}")
+
+    reset_scene()
+
+    # 1-4. Decimated base with rig, skin and hair
+    basemesh, armature = base_cache.get(body)
 
     # 5. Add equipment from blueprint
     print("  Adding equipment...")
@@ -711,5 +867,23 @@ def main():
     print(f"=== Done: {name} ===")
 
 
+def main():
+    args = parse_args()
+    # Load every blueprint first so a bad one fails before any building
+    blueprints = [(path, load_blueprint(path)) for path in args.blueprint]
+
+    base_cache = BaseMeshCache(args.base_cache_dir, rebuild=args.rebuild_base)
+    for path, blueprint in blueprints:
+        output_path = args.output or os.path.join(
+            PROJECT_ROOT, "blender", "models", f"{blueprint['name']}.blend"
+        )
+        build_unit(path, blueprint, output_path, base_cache)
+
+    if len(blueprints) > 1:
+        print(f"=== Batch done: {len(blueprints)} units, "
+              f"{len(base_cache.built)} base mesh(es) built, "
+              f"{base_cache.reused} reused ===")
+
+
 if __name__ == "__main__":
     main()
@@ -4,9 +4,22 @@
 Downscales 2x renders to game-ready 1x, restores magenta mask pixels,
 and generates manifest.json + sprite config for the game engine.
 
+For mirror-symmetric subjects (--mirror-symmetric), the ne/e/se frames are
+synthesized by horizontally flipping the nw/w/sw frames instead of being
+rendered. --validate-mirror compares those flips against real renders of
+the mirrored directions (only --mirror-reference directions if given) and
+fails when there are none to compare against.
+
+--lods writes extra downscaled copies of every frame (e.g. 64x64 and
+32x32) into lod_<size>/ subdirectories and lists them in the manifest's
+"lods" section; spritesheet_packer packs each into its own atlas.
+
 Usage:
     python3 blender/generate_manifest.py archer
     python3 blender/generate_manifest.py archer --render-dir blender/renders/archer
+    python3 blender/generate_manifest.py archer --mirror-symmetric
+    python3 blender/generate_manifest.py archer --mirror-symmetric --validate-mirror
+    python3 blender/generate_manifest.py archer --lods 64,32
 """
 from __future__ import annotations
 
@@ -47,6 +60,20 @@ MAGENTA_MAX_G = 120
 # Standard directions in render order
 DIRECTION_ORDER = ["s", "se", "e", "ne", "n", "nw", "w", "sw"]
 
+# Directions synthesized by mirroring for symmetric subjects: derived -> source
+MIRROR_DIRECTIONS = {"se": "sw", "e": "w", "ne": "nw"}
+
+# Default max mean per-channel difference (0-1) between a mirrored frame
+# and a real render of the same direction
+MIRROR_TOLERANCE = 0.03
+
+# Written by render_isometric into the render dir: the render profile
+# (preview/draft/final) that produced the frames
+RENDER_PROFILE_FILE = "render_profile.json"
+
+# Render quality profiles defined in render_isometric.RENDER_PROFILES
+RENDER_PROFILES = ["preview", "draft", "final"]
+
 # Filename pattern: {subject}_{animation}_{direction}_{frame:02d}.png
 FRAME_RE = re.compile(
     r"^(?P<subject>[a-z_]+)_(?P<anim>[a-z_]+)_(?P<dir>[a-z]+)_(?P<frame>\d+)\.png$"
@@ -96,6 +123,94 @@ def downscale_frame(src_path, dst_path):
     return magenta_count
 
 
+def lod_dir_name(size):
+    """Subdirectory of the sprite dir holding the size x size LOD frames."""
+    return f"lod_{size}"
+
+
+def parse_lods(value):
+    """Parse a comma-separated list of LOD canvas sizes (e.g. "64,32")."""
+    try:
+        sizes = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid LOD sizes: {value!r}")
+    if any(not 0 < size < UNIT_CANVAS[0] for size in sizes):
+        raise argparse.ArgumentTypeError(
+            f"LOD sizes must be between 1 and {UNIT_CANVAS[0] - 1}")
+    return sorted(set(sizes), reverse=True)
+
+
+def make_lod_frame(src_path, dst_path, size):
+    """Downscale a 1x game frame to a size x size LOD frame."""
+    _require_pil()
+    img = Image.open(src_path).convert("RGBA")
+    resized = img.resize((size, size), Image.LANCZOS)
+    result, _ = restore_magenta(resized)
+    dst_path.parent.mkdir(parents=True, exist_ok=True)
+    result.save(dst_path, "PNG")
+
+
+def mirror_frame(img):
+    """Return a horizontally flipped copy of a frame."""
+    _require_pil()
+    return img.transpose(Image.FLIP_LEFT_RIGHT)
+
+
+def mirror_diff(img_a, img_b):
+    """Mean absolute per-channel RGBA difference between two frames (0-1)."""
+    _require_pil()
+    from PIL import ImageChops, ImageStat
+
+    diff = ImageChops.difference(img_a.convert("RGBA"), img_b.convert("RGBA"))
+    means = ImageStat.Stat(diff).mean
+    return sum(means) / (len(means) * 255.0)
+
+
+def plan_mirrored_frames(frames, subject):
+    """Split scanned frames into (rendered, mirrored) for a symmetric subject.
+
+    Real renders of derived directions (ne/e/se) are dropped from the
+    rendered list. A mirrored entry is planned for every source frame
+    (nw/w/sw), carrying "mirrored_from" (source filename) and "render_path"
+    (the real render of that direction, or None) for optional validation.
+    """
+    real_derived = {
+        (f["animation"], f["direction"], f["frame"]): f["src_path"]
+        for f in frames if f["direction"] in MIRROR_DIRECTIONS
+    }
+    rendered = [f for f in frames if f["direction"] not in MIRROR_DIRECTIONS]
+    sources = {v: k for k, v in MIRROR_DIRECTIONS.items()}
+
+    mirrored = []
+    for f in rendered:
+        derived = sources.get(f["direction"])
+        if derived is None:
+            continue
+        mirrored.append({
+            "filename": (f"{subject}_{f['animation']}_{derived}_"
+                         f"{f['frame']:02d}.png"),
+            "animation": f["animation"],
+            "direction": derived,
+            "frame": f["frame"],
+            "src_path": None,
+            "mirrored_from": f["filename"],
+            "render_path": real_derived.get(
+                (f["animation"], derived, f["frame"])),
+        })
+    return rendered, mirrored
+
+
+def sort_frames(frames):
+    """Sort frames by animation name, direction order, frame number."""
+    dir_order = {d: i for i, d in enumerate(DIRECTION_ORDER)}
+    frames.sort(key=lambda f: (
+        f["animation"],
+        dir_order.get(f["direction"], 99),
+        f["frame"],
+    ))
+    return frames
+
+
 def scan_renders(render_dir, subject):
     """Scan render directory for frame PNGs and parse metadata.
 
@@ -122,38 +237,65 @@ def scan_renders(render_dir, subject):
             "src_path": path,
         })
 
-    # Sort: animation name, direction order, frame number
-    dir_order = {d: i for i, d in enumerate(DIRECTION_ORDER)}
-    frames.sort(key=lambda f: (
-        f["animation"],
-        dir_order.get(f["direction"], 99),
-        f["frame"],
-    ))
-    return frames
+    return sort_frames(frames)
 
 
-def generate_manifest(frames, subject):
-    """Generate manifest.json content from scanned frames."""
+def load_render_profile(render_dir):
+    """Return the render profile name recorded in render_dir, or None.
+
+    An unreadable file or a profile not in RENDER_PROFILES is ignored with
+    a warning, so the manifest is never stamped with a bogus profile.
+    """
+    path = render_dir / RENDER_PROFILE_FILE
+    if not path.is_file():
+        return None
+    try:
+        with open(path) as f:
+            profile = json.load(f).get("profile")
+    except (OSError, ValueError, AttributeError):
+        print(f"  WARNING: ignoring unreadable {path}")
+        return None
+    if profile not in RENDER_PROFILES:
+        print(f"  WARNING: ignoring unknown render profile {profile!r} in {path}")
+        return None
+    return profile
+
+
+def generate_manifest(frames, subject, render_profile=None, lods=()):
+    """Generate manifest.json content from scanned frames.
+
+    lods lists the extra LOD canvas sizes written alongside the 1x frames.
+    """
     animations = sorted(set(f["animation"] for f in frames))
     directions = [d for d in DIRECTION_ORDER
                   if any(f["direction"] == d for f in frames)]
 
-    sprites = [
-        {
+    sprites = []
+    for f in frames:
+        entry = {
             "filename": f["filename"],
             "animation": f["animation"],
             "direction": f["direction"],
             "frame": f["frame"],
         }
-        for f in frames
-    ]
+        if f.get("mirrored_from"):
+            entry["mirrored_from"] = f["mirrored_from"]
+        sprites.append(entry)
 
-    return {
+    manifest = {
         "canvas_size": list(UNIT_CANVAS),
         "directions": directions,
         "animations": animations,
         "sprites": sprites,
     }
+    if render_profile:
+        manifest["render_profile"] = render_profile
+    if lods:
+        manifest["lods"] = [
+            {"canvas_size": [size, size], "dir": lod_dir_name(size)}
+            for size in lods
+        ]
+    return manifest
 
 
 def generate_sprite_config(subject, animations):
@@ -200,11 +342,37 @@ def main(argv=None):
         help="Directory for game-ready 1x PNGs "
              "(default: assets/sprites/units/<subject>)"
     )
+    parser.add_argument(
+        "--mirror-symmetric", action="store_true",
+        help="Synthesize ne/e/se frames by flipping nw/w/sw frames"
+    )
+    parser.add_argument(
+        "--validate-mirror", action="store_true",
+        help="Pixel-diff mirrored frames against real renders of the same "
+             "direction (requires --mirror-symmetric)"
+    )
+    parser.add_argument(
+        "--mirror-reference", nargs="+", choices=list(MIRROR_DIRECTIONS),
+        default=None,
+        help="Only validate against real renders of these directions, e.g. "
+             "the one asset_pipeline just rendered (default: any present)"
+    )
+    parser.add_argument(
+        "--mirror-tolerance", type=float, default=MIRROR_TOLERANCE,
+        help=f"Max mean channel difference (0-1) for --validate-mirror "
+             f"(default: {MIRROR_TOLERANCE})"
+    )
+    parser.add_argument(
+        "--lods", type=parse_lods, default=[],
+        help="Comma-separated extra LOD canvas sizes to emit, e.g. 64,32"
+    )
     parser.add_argument(
         "--dry-run", action="store_true",
         help="Print what would be done without writing files"
     )
     args = parser.parse_args(argv)
+    if args.validate_mirror and not args.mirror_symmetric:
+        parser.error("--validate-mirror requires --mirror-symmetric")
 
     render_dir = args.render_dir or (
         PROJECT_ROOT / "blender" / "renders" / args.subject
@@ -228,17 +396,35 @@ def main(argv=None):
               file=sys.stderr)
         return 1
 
+    mirrored = []
+    if args.mirror_symmetric:
+        frames, mirrored = plan_mirrored_frames(frames, args.subject)
+    if args.validate_mirror:
+        # Real renders outside the reference directions may be left over
+        # from an earlier run and are not compared
+        for f in mirrored:
+            if args.mirror_reference and f["direction"] not in args.mirror_reference:
+                f["render_path"] = None
+        if not any(f["render_path"] is not None for f in mirrored):
+            print("Error: --validate-mirror found no real renders of "
+                  f"{', '.join(args.mirror_reference or MIRROR_DIRECTIONS)} "
+                  f"in {render_dir} to compare against", file=sys.stderr)
+            return 1
+
     animations = sorted(set(f["animation"] for f in frames))
-    anim_counts = {}
-    for f in frames:
-        key = (f["animation"], f["direction"])
-        anim_counts[key] = max(anim_counts.get(key, 0), f["frame"])
+    render_profile = load_render_profile(render_dir)
 
     print(f"=== Generate Manifest: {args.subject} ===")
     print(f"  Render dir: {render_dir}")
+    if render_profile:
+        print(f"  Profile:    {render_profile}")
     print(f"  Output dir: {output_dir}")
     print(f"  Frames:     {len(frames)}")
     print(f"  Animations: {', '.join(animations)}")
+    if args.mirror_symmetric:
+        print(f"  Mirrored:   {len(mirrored)} frames "
+              f"({', '.join(MIRROR_DIRECTIONS)} from "
+              f"{', '.join(MIRROR_DIRECTIONS.values())})")
 
     prefix = "[DRY RUN] " if args.dry_run else ""
 
@@ -256,8 +442,44 @@ def main(argv=None):
         print(f"  Downscaled {len(frames)} frames to {UNIT_CANVAS[0]}x{UNIT_CANVAS[1]}")
         print(f"  Magenta pixels restored: {total_magenta}")
 
+    # Mirror source frames into the derived directions
+    mirror_failures = 0
+    for f in mirrored:
+        if args.dry_run:
+            print(f"  {prefix}Would mirror: {f['mirrored_from']} -> "
+                  f"{f['filename']}")
+            continue
+        src = Image.open(output_dir / f["mirrored_from"]).convert("RGBA")
+        flipped = mirror_frame(src)
+        flipped.save(output_dir / f["filename"], "PNG")
+        if args.validate_mirror and f["render_path"] is not None:
+            real = Image.open(f["render_path"]).convert("RGBA").resize(
+                UNIT_CANVAS, Image.LANCZOS)
+            real, _ = restore_magenta(real)
+            diff = mirror_diff(flipped, real)
+            status = "OK" if diff <= args.mirror_tolerance else "FAIL"
+            if status == "FAIL":
+                mirror_failures += 1
+            print(f"  Mirror check {status}: {f['filename']} diff={diff:.4f}")
+    if mirrored and not args.dry_run:
+        print(f"  Mirrored {len(mirrored)} frames")
+
+    frames = sort_frames(frames + mirrored)
+
+    # Downscale the finished 1x frames into each LOD set
+    for size in args.lods:
+        lod_dir = output_dir / lod_dir_name(size)
+        if args.dry_run:
+            print(f"  {prefix}Would write {len(frames)} LOD frames: {lod_dir}")
+            continue
+        for f in frames:
+            make_lod_frame(output_dir / f["filename"], lod_dir / f["filename"],
+                           size)
+        print(f"  LOD {size}x{size}: {len(frames)} frames in {lod_dir}")
+
     # Generate manifest
-    manifest = generate_manifest(frames, args.subject)
+    manifest = generate_manifest(frames, args.subject, render_profile,
+                                 lods=args.lods)
     if args.dry_run:
         print(f"  {prefix}Would write: {manifest_path}")
     else:
@@ -278,6 +500,12 @@ def main(argv=None):
             fp.write("\n")
         print(f"  Wrote: {config_path}")
 
+    if mirror_failures:
+        print(f"Error: {mirror_failures} mirrored frame(s) exceed tolerance "
+              f"{args.mirror_tolerance}; subject may not be symmetric",
+              file=sys.stderr)
+        return 1
+
     print(f"=== {prefix}Done ===")
     return 0
 
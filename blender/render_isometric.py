@@ -7,15 +7,25 @@ Produces 2x resolution PNGs (downscaling handled by process_sprite.py).
 Usage (called via Blender):
     blender --background --python blender/render_isometric.py -- [options]
 
+Render server (JSON jobs on stdin, replies on stdout; see serve()):
+    blender --background --python blender/render_isometric.py -- --server
+
 Or via the CLI wrapper:
     ./tools/ror blender-render --poc
     ./tools/ror blender-archer
 """
 
 import argparse
+import glob
+import hashlib
+import json
 import math
 import os
+import struct
 import sys
+import time
+import traceback
+from array import array
 
 # Blender's bpy is only available when run inside Blender
 try:
@@ -60,6 +70,48 @@ DIRECTIONS = {
     "se": 315,
 }
 
+# For mirror-symmetric subjects these directions are derived by flipping
+# their source direction (derived -> source) instead of being rendered
+MIRROR_DIRECTIONS = {"se": "sw", "e": "w", "ne": "nw"}
+
+# Named render quality profiles. "final" is the shipping configuration;
+# "preview" trades shading and anti-aliasing for speed so a new template
+# can be checked in seconds. resolution_percentage scales the 2x canvas
+# (50 renders at 1x game resolution). samples is EEVEE TAA samples, or
+# the Workbench anti-aliasing sample count (0 = off).
+RENDER_PROFILES = {
+    "preview": {
+        "engine": "workbench",
+        "samples": 0,
+        "resolution_percentage": 50,
+        "filter_size": 0.0,
+        "film_transparent": True,
+    },
+    "draft": {
+        "engine": "eevee",
+        "samples": 8,
+        "resolution_percentage": 100,
+        "filter_size": 1.0,
+        "film_transparent": True,
+    },
+    "final": {
+        "engine": "eevee",
+        "samples": 64,
+        "resolution_percentage": 100,
+        "filter_size": 1.5,
+        "film_transparent": True,
+    },
+}
+DEFAULT_RENDER_PROFILE = "final"
+
+# Written into the output directory so generate_manifest can stamp the
+# profile that produced the frames into manifest.json
+RENDER_PROFILE_FILE = "render_profile.json"
+
+# Bump to invalidate every render cache entry (e.g. after changing how
+# frames are produced in ways the scene-state hash cannot see)
+RENDER_CACHE_VERSION = 1
+
 # Blender 5.x always has use_nodes enabled; setting it raises DeprecationWarning
 _NEEDS_USE_NODES = bpy.app.version < (5, 0, 0)
 
@@ -103,10 +155,7 @@ def setup_camera(azimuth_deg, footprint=None, asset_type="building"):
     """Create an orthographic camera at isometric angle."""
     cam_data = bpy.data.cameras.new("IsoCam")
     cam_data.type = "ORTHO"
-    if asset_type == "unit":
-        cam_data.ortho_scale = UNIT_ORTHO_SCALE
-    else:
-        cam_data.ortho_scale = ORTHO_SCALE[footprint]
+    _set_ortho_scale(cam_data, footprint, asset_type)
 
     cam_obj = bpy.data.objects.new("IsoCam", cam_data)
     bpy.context.scene.collection.objects.link(cam_obj)
@@ -116,6 +165,14 @@ def setup_camera(azimuth_deg, footprint=None, asset_type="building"):
     return cam_obj
 
 
+def _set_ortho_scale(cam_data, footprint=None, asset_type="building"):
+    """Set the ortho scale for the asset type (units) or footprint."""
+    if asset_type == "unit":
+        cam_data.ortho_scale = UNIT_ORTHO_SCALE
+    else:
+        cam_data.ortho_scale = ORTHO_SCALE[footprint]
+
+
 def _position_camera(cam_obj, azimuth_deg):
     """Position camera at given azimuth, isometric elevation."""
     distance = 20.0
@@ -167,28 +224,51 @@ def setup_lighting():
 # Render config
 # ---------------------------------------------------------------------------
 
-def setup_render(footprint=None, asset_type="building"):
-    """Configure render settings for transparent isometric output."""
-    scene = bpy.context.scene
-    render = scene.render
-
+def _set_engine(scene, engine):
+    """Select the render engine for a profile ("eevee" or "workbench")."""
+    if engine == "workbench":
+        scene.render.engine = "BLENDER_WORKBENCH"
+        return
     # Engine — try EEVEE_NEXT (Blender 4.x) then EEVEE (Blender 5.x)
     try:
         scene.render.engine = "BLENDER_EEVEE_NEXT"
     except TypeError:
         scene.render.engine = "BLENDER_EEVEE"
 
-    # Resolution at 2x canvas
+
+def setup_render(footprint=None, asset_type="building",
+                 profile=DEFAULT_RENDER_PROFILE):
+    """Configure render settings for transparent isometric output.
+
+    profile names an entry of RENDER_PROFILES.
+    """
+    settings = RENDER_PROFILES[profile]
+    scene = bpy.context.scene
+    render = scene.render
+
+    _set_engine(scene, settings["engine"])
+    if settings["engine"] == "workbench":
+        # Flat material colors; the magenta mask reads as the material's
+        # viewport color, so preview frames are for motion checks only
+        scene.display.shading.light = "STUDIO"
+        scene.display.shading.color_type = "MATERIAL"
+        samples = settings["samples"]
+        scene.display.render_aa = str(samples) if samples else "OFF"
+    else:
+        scene.eevee.taa_render_samples = settings["samples"]
+    render.filter_size = settings["filter_size"]
+
+    # Resolution at 2x canvas, scaled by the profile
     if asset_type == "unit":
         w, h = UNIT_CANVAS_2X
     else:
         w, h = CANVAS_2X[footprint]
     render.resolution_x = w
     render.resolution_y = h
-    render.resolution_percentage = 100
+    render.resolution_percentage = settings["resolution_percentage"]
 
     # Transparent background
-    render.film_transparent = True
+    render.film_transparent = settings["film_transparent"]
 
     # Output format
     render.image_settings.file_format = "PNG"
@@ -201,6 +281,22 @@ def setup_render(footprint=None, asset_type="building"):
     scene.view_settings.look = "None"
 
 
+def write_render_profile(output_dir, profile):
+    """Record the render profile used for output_dir's frames.
+
+    Shards of one render write identical content, so the file is replaced
+    atomically rather than locked.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    info = {"profile": profile, **RENDER_PROFILES[profile]}
+    path = os.path.join(output_dir, RENDER_PROFILE_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(info, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
 # ---------------------------------------------------------------------------
 # PoC house model
 # ---------------------------------------------------------------------------
@@ -301,9 +397,13 @@ def build_poc_house():
 # ---------------------------------------------------------------------------
 
 def _clear_model_objects():
-    """Remove all mesh/empty objects from the scene, keeping camera and lights."""
+    """Remove all mesh/empty objects from the scene, keeping camera and lights.
+
+    Only objects linked directly to the scene collection are removed;
+    models loaded from .blend files live in their own collections.
+    """
     to_delete = []
-    for obj in bpy.data.objects:
+    for obj in bpy.context.scene.collection.objects:
         if obj.type in {"MESH", "EMPTY"}:
             to_delete.append(obj)
     bpy.ops.object.select_all(action="DESELECT")
@@ -705,35 +805,394 @@ def animate_archer(root, animation, frame, total_frames):
 # Animated unit render loop
 # ---------------------------------------------------------------------------
 
+def build_render_jobs(animations, frames_per_anim, directions):
+    """Expand animations x frames x directions into an ordered job list.
+
+    Each job is (animation, frame_idx, n_frames, direction). Jobs are ordered
+    so that all directions of one pose are adjacent, letting the render loop
+    set each pose once.
+    """
+    jobs = []
+    for anim, n_frames in zip(animations, frames_per_anim):
+        for frame_idx in range(n_frames):
+            for dir_name in directions:
+                jobs.append((anim, frame_idx, n_frames, dir_name))
+    return jobs
+
+
+def parse_shard(value):
+    """Parse a '--shard i/N' value into (index, count), 0 <= index < count."""
+    try:
+        index, count = (int(v) for v in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid shard '{value}', expected i/N (e.g. 0/4)")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(
+            f"Shard index must satisfy 0 <= i < N, got {value}")
+    return index, count
+
+
+def shard_jobs(jobs, shard):
+    """Return the contiguous slice of jobs owned by shard (index, count).
+
+    Slices are disjoint, cover the whole list, and differ in size by at
+    most one job. Contiguous slices keep poses grouped within a shard.
+    """
+    if shard is None:
+        return jobs
+    index, count = shard
+    start = len(jobs) * index // count
+    end = len(jobs) * (index + 1) // count
+    return jobs[start:end]
+
+
+# ---------------------------------------------------------------------------
+# Render cache (scene state hashing)
+# ---------------------------------------------------------------------------
+
+def _hash_floats(h, values):
+    """Feed rounded floats into a hash (rounding absorbs float noise)."""
+    values = [round(float(v), 6) for v in values]
+    h.update(struct.pack(f"<{len(values)}d", *values))
+
+
+def _hash_matrix(h, matrix):
+    """Feed a mathutils.Matrix into a hash."""
+    _hash_floats(h, [v for row in matrix for v in row])
+
+
+def _hash_socket_value(h, value):
+    """Feed a node socket default_value (scalar or vector) into a hash."""
+    if isinstance(value, (bool, int, float)):
+        _hash_floats(h, [value])
+    elif isinstance(value, str):
+        h.update(value.encode())
+    else:
+        try:
+            _hash_floats(h, list(value))
+        except TypeError:
+            h.update(repr(value).encode())
+
+
+def static_state_digest():
+    """Hash scene state that does not change between jobs.
+
+    Covers render and color-management settings, camera lens, lights,
+    world and material node parameters, and mesh vertex data.
+    """
+    scene = bpy.context.scene
+    render = scene.render
+    h = hashlib.sha256()
+    h.update(f"render-cache-v{RENDER_CACHE_VERSION}".encode())
+
+    settings = [
+        render.engine, render.resolution_x, render.resolution_y,
+        render.resolution_percentage, render.film_transparent,
+        render.filter_size, render.image_settings.file_format,
+        render.image_settings.color_mode, render.image_settings.color_depth,
+        render.image_settings.compression, scene.view_settings.view_transform,
+        scene.view_settings.look,
+    ]
+    eevee = getattr(scene, "eevee", None)
+    if eevee is not None:
+        settings.append(getattr(eevee, "taa_render_samples", None))
+    display = getattr(scene, "display", None)
+    if display is not None:
+        settings.append(getattr(display, "render_aa", None))
+        shading = getattr(display, "shading", None)
+        if shading is not None:
+            settings.extend([getattr(shading, "light", None),
+                             getattr(shading, "color_type", None)])
+    h.update(repr(settings).encode())
+
+    for cam in sorted(bpy.data.cameras, key=lambda c: c.name):
+        h.update(f"{cam.name}:{cam.type}".encode())
+        _hash_floats(h, [cam.ortho_scale, cam.clip_start, cam.clip_end])
+    for light in sorted(bpy.data.lights, key=lambda lt: lt.name):
+        h.update(f"{light.name}:{light.type}".encode())
+        _hash_floats(h, [light.energy, *light.color])
+
+    # Only data used by objects in the scene; a render server keeps other
+    # subjects' models resident and those must not affect this digest
+    meshes = {}
+    materials = {}
+    for obj in scene.objects:
+        if obj.type == "MESH":
+            meshes[obj.data.name] = obj.data
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                materials[slot.material.name] = slot.material
+
+    trees = [(f"mat:{name}", m.node_tree) for name, m in materials.items()]
+    if scene.world:
+        trees.append((f"world:{scene.world.name}", scene.world.node_tree))
+    for name, tree in sorted(trees, key=lambda t: t[0]):
+        h.update(name.encode())
+        if tree is None:
+            continue
+        for node in sorted(tree.nodes, key=lambda n: n.name):
+            h.update(f"{node.name}:{node.bl_idname}".encode())
+            image = getattr(node, "image", None)
+            if image is not None:
+                h.update(image.filepath.encode())
+            for sock in node.inputs:
+                if hasattr(sock, "default_value") and not sock.is_linked:
+                    h.update(sock.identifier.encode())
+                    _hash_socket_value(h, sock.default_value)
+        for link in tree.links:
+            h.update(f"{link.from_node.name}.{link.from_socket.identifier}->"
+                     f"{link.to_node.name}.{link.to_socket.identifier}".encode())
+
+    for _name, mesh in sorted(meshes.items()):
+        coords = array("f", [0.0]) * (len(mesh.vertices) * 3)
+        mesh.vertices.foreach_get("co", coords)
+        h.update(mesh.name.encode())
+        h.update(coords.tobytes())
+        h.update(repr([m.name if m else None for m in mesh.materials]).encode())
+
+    return h.hexdigest()
+
+
+def job_state_hash(static_digest):
+    """Hash the per-job scene state on top of the static digest.
+
+    Covers every object's local transform, parenting and visibility plus
+    armature pose-bone matrices, i.e. the current pose and camera azimuth.
+    """
+    h = hashlib.sha256(static_digest.encode())
+    for obj in sorted(bpy.context.scene.objects, key=lambda o: o.name):
+        parent = obj.parent.name if obj.parent else ""
+        h.update(f"{obj.name}:{obj.type}:{parent}:{obj.parent_bone}:"
+                 f"{obj.hide_render}".encode())
+        _hash_matrix(h, obj.matrix_basis)
+        _hash_matrix(h, obj.matrix_parent_inverse)
+        if obj.type == "ARMATURE":
+            for pb in obj.pose.bones:
+                h.update(pb.name.encode())
+                _hash_matrix(h, pb.matrix_basis)
+    return h.hexdigest()
+
+
+class RenderCache:
+    """Scene-state hashes of rendered frames, stored beside the render dir.
+
+    Entries map output filename to {hash, size, mtime_ns}. A job is skipped
+    when its state hash matches and the PNG on disk is the one recorded.
+    Each shard writes its own file ({output_dir}.render_cache[.shard].json)
+    so parallel shards never race; all files are merged on load, keeping
+    the most recently rendered entry (largest mtime_ns) for each frame.
+    """
+
+    def __init__(self, output_dir, shard=None):
+        base = os.path.normpath(output_dir)
+        suffix = f".shard{shard[0]}of{shard[1]}" if shard else ""
+        self.path = f"{base}.render_cache{suffix}.json"
+        self.output_dir = output_dir
+        self.entries = {}
+        self.static_digest = None
+        self.skipped = 0
+        for path in sorted(glob.glob(glob.escape(base) + ".render_cache*.json")):
+            try:
+                with open(path) as f:
+                    frames = json.load(f).get("frames", {})
+            except (OSError, ValueError):
+                print(f"  WARNING: ignoring unreadable render cache {path}")
+                continue
+            # Stale shard files from an earlier run must not shadow newer
+            # entries, whatever order the files sort in
+            for fname, entry in frames.items():
+                current = self.entries.get(fname)
+                if (current is None or entry.get("mtime_ns", 0)
+                        > current.get("mtime_ns", 0)):
+                    self.entries[fname] = entry
+
+    def job_hash(self):
+        """Hash the current scene state (static part computed once)."""
+        if self.static_digest is None:
+            self.static_digest = static_state_digest()
+        return job_state_hash(self.static_digest)
+
+    def is_fresh(self, fname, digest):
+        """True if fname exists on disk and was rendered from this state."""
+        entry = self.entries.get(fname)
+        if not entry or entry.get("hash") != digest:
+            return False
+        try:
+            st = os.stat(os.path.join(self.output_dir, fname))
+        except OSError:
+            return False
+        return (st.st_size == entry.get("size")
+                and st.st_mtime_ns == entry.get("mtime_ns"))
+
+    def record(self, fname, digest):
+        """Record a freshly rendered frame."""
+        st = os.stat(os.path.join(self.output_dir, fname))
+        self.entries[fname] = {
+            "hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+        }
+
+    def save(self):
+        """Write this process's cache file."""
+        with open(self.path, "w") as f:
+            json.dump({"version": RENDER_CACHE_VERSION,
+                       "frames": dict(sorted(self.entries.items()))},
+                      f, indent=1)
+            f.write("\n")
+
+
+# ---------------------------------------------------------------------------
+# Job rendering (shared by procedural and action-based units)
+# ---------------------------------------------------------------------------
+
+def _job_filename(subject, job):
+    """Output filename for a job: {subject}_{anim}_{dir}_{NN}.png"""
+    anim, frame_idx, _n_frames, dir_name = job
+    return f"{subject}_{anim}_{dir_name}_{frame_idx + 1:02d}.png"
+
+
+def render_jobs(cam_obj, jobs, output_dir, subject, apply_pose, cache=None):
+    """Render each job as a still: apply pose, aim camera, render.
+
+    Jobs whose scene-state hash matches the cache are skipped.
+    Returns the number of frames rendered.
+    """
+    total_rendered = 0
+    for job in jobs:
+        apply_pose(job)
+        _position_camera(cam_obj, DIRECTIONS[job[3]])
+
+        fname = _job_filename(subject, job)
+        digest = None
+        if cache is not None:
+            digest = cache.job_hash()
+            if cache.is_fresh(fname, digest):
+                cache.skipped += 1
+                continue
+
+        filepath = os.path.join(output_dir, fname)
+        bpy.context.scene.render.filepath = filepath
+        bpy.ops.render.render(write_still=True)
+        total_rendered += 1
+        if cache is not None:
+            cache.record(fname, digest)
+    return total_rendered
+
+
+def render_keyframed(cam_obj, jobs, output_dir, subject, apply_pose, key_pose,
+                     cache=None):
+    """Render a job list with a single animation render call.
+
+    Each job to render gets its own timeline frame t (1-based): the camera
+    azimuth is keyed at t and key_pose(t) keys the pose set by
+    apply_pose(job). Every timeline frame carries a key, so interpolation
+    never blends between jobs. Blender writes numbered frames which are
+    then renamed to {subject}_{anim}_{dir}_{NN}.png, avoiding per-still
+    render setup. Jobs whose scene-state hash matches the cache get no
+    timeline frame.
+    """
+    scene = bpy.context.scene
+    timeline = []  # (fname, digest) per timeline frame
+
+    for job in jobs:
+        apply_pose(job)
+        _position_camera(cam_obj, DIRECTIONS[job[3]])
+        fname = _job_filename(subject, job)
+        digest = None
+        if cache is not None:
+            digest = cache.job_hash()
+            if cache.is_fresh(fname, digest):
+                cache.skipped += 1
+                continue
+        t = len(timeline) + 1
+        cam_obj.keyframe_insert(data_path="location", frame=t)
+        cam_obj.keyframe_insert(data_path="rotation_euler", frame=t)
+        key_pose(t)
+        timeline.append((fname, digest))
+
+    if not timeline:
+        return 0
+
+    scene.frame_start = 1
+    scene.frame_end = len(timeline)
+    scene.frame_step = 1
+    digits = max(4, len(str(len(timeline))))
+    tmp_prefix = os.path.join(output_dir, f"_keyframed_{subject}_")
+    scene.render.filepath = tmp_prefix + "#" * digits
+    scene.render.use_file_extension = True
+    bpy.ops.render.render(animation=True)
+    # Drop the camera keys so later still renders can aim it freely
+    cam_obj.animation_data_clear()
+
+    # Map timeline frame numbers back to per-job filenames
+    total_rendered = 0
+    for t, (fname, digest) in enumerate(timeline, 1):
+        src = f"{tmp_prefix}{t:0{digits}d}.png"
+        if not os.path.exists(src):
+            print(f"  WARNING: keyframed render missing frame {t} ({fname})")
+            continue
+        os.replace(src, os.path.join(output_dir, fname))
+        total_rendered += 1
+        if cache is not None:
+            cache.record(fname, digest)
+    return total_rendered
+
+
+def _finish_render(jobs, total_rendered, cache, keyframed):
+    """Persist the cache and print the job summary."""
+    if cache is not None:
+        cache.save()
+    counts = {}
+    for anim, _frame_idx, _n_frames, _dir_name in jobs:
+        counts[anim] = counts.get(anim, 0) + 1
+    for anim, n in counts.items():
+        print(f"  {anim}: {n} jobs")
+    mode = " (keyframed)" if keyframed else ""
+    print(f"  Total: {total_rendered} frames rendered{mode}")
+    if cache is not None:
+        print(f"  Cached: {cache.skipped} frames unchanged, skipped")
+
+
 def render_animated_unit(cam_obj, directions, animations, frames_per_anim,
-                         output_dir, subject, root):
+                         output_dir, subject, root, shard=None, keyframed=False,
+                         cache=None):
     """Render animated unit: all frames x directions x animations.
 
     Output naming: {subject}_{animation}_{direction}_{frame:02d}.png
+    With shard=(i, N), only the i-th slice of the job list is rendered.
+    With keyframed=True, all jobs are rendered by one animation render.
+    With a RenderCache, jobs whose scene state is unchanged are skipped.
     """
     os.makedirs(output_dir, exist_ok=True)
-    total_rendered = 0
+    jobs = shard_jobs(
+        build_render_jobs(animations, frames_per_anim, directions), shard)
 
-    for anim, n_frames in zip(animations, frames_per_anim):
-        for frame_idx in range(n_frames):
+    current = [None]
+
+    def apply_pose(job):
+        anim, frame_idx, n_frames, _dir_name = job
+        if current[0] != (anim, frame_idx):
             # Set pose for this animation frame
             animate_archer(root, anim, frame_idx, n_frames)
+            current[0] = (anim, frame_idx)
 
-            for dir_name in directions:
-                azimuth = DIRECTIONS[dir_name]
-                _position_camera(cam_obj, azimuth)
+    if keyframed:
+        parts = [root] + list(root.children)
 
-                # 1-indexed frame number in filename
-                fname = f"{subject}_{anim}_{dir_name}_{frame_idx + 1:02d}.png"
-                filepath = os.path.join(output_dir, fname)
-                bpy.context.scene.render.filepath = filepath
-                bpy.ops.render.render(write_still=True)
-                total_rendered += 1
+        def key_pose(t):
+            for obj in parts:
+                obj.keyframe_insert(data_path="location", frame=t)
+                obj.keyframe_insert(data_path="rotation_euler", frame=t)
 
-        print(f"  {anim}: {n_frames} frames x {len(directions)} dirs = "
-              f"{n_frames * len(directions)} renders")
+        total_rendered = render_keyframed(cam_obj, jobs, output_dir, subject,
+                                          apply_pose, key_pose, cache)
+        for obj in parts:
+            obj.animation_data_clear()
+    else:
+        total_rendered = render_jobs(cam_obj, jobs, output_dir, subject,
+                                     apply_pose, cache)
 
-    print(f"  Total: {total_rendered} frames rendered")
+    _finish_render(jobs, total_rendered, cache, keyframed)
     return total_rendered
 
 
@@ -741,59 +1200,117 @@ def render_animated_unit(cam_obj, directions, animations, frames_per_anim,
 # Action-based animation rendering (for rigged .blend models)
 # ---------------------------------------------------------------------------
 
-def _find_armature():
-    """Find the first armature object in the scene."""
-    for obj in bpy.data.objects:
+def _find_armature(objects=None):
+    """Find the first armature among objects (default: the scene's)."""
+    for obj in objects if objects is not None else bpy.context.scene.objects:
         if obj.type == "ARMATURE":
             return obj
     return None
 
 
+def _snapshot_pose(armature):
+    """Capture the evaluated pose-bone channels of an armature."""
+    return {
+        pb.name: (pb.location.copy(), pb.rotation_euler.copy(),
+                  pb.rotation_quaternion.copy(), pb.scale.copy())
+        for pb in armature.pose.bones
+    }
+
+
+def _bake_action_timeline(armature, jobs, available_actions):
+    """Prepare (apply_pose, key_pose) that bake action poses onto a timeline.
+
+    Poses are sampled once per (animation, frame) from the source Actions.
+    apply_pose writes a sampled pose back onto the bones and key_pose keys
+    it on a fresh timeline action, leaving the source Actions untouched.
+    """
+    poses = {}
+    for anim, frame_idx, _n_frames, _dir_name in jobs:
+        if (anim, frame_idx) in poses:
+            continue
+        armature.animation_data.action = available_actions[anim]
+        bpy.context.scene.frame_set(frame_idx + 1)
+        poses[(anim, frame_idx)] = _snapshot_pose(armature)
+
+    armature.animation_data.action = bpy.data.actions.new("IsoRenderTimeline")
+
+    def apply_pose(job):
+        anim, frame_idx, _n_frames, _dir_name = job
+        for name, (loc, rot_e, rot_q, scale) in poses[(anim, frame_idx)].items():
+            pb = armature.pose.bones[name]
+            pb.location = loc
+            pb.rotation_euler = rot_e
+            pb.rotation_quaternion = rot_q
+            pb.scale = scale
+
+    def key_pose(t):
+        for pb in armature.pose.bones:
+            for path in ("location", "rotation_euler", "rotation_quaternion",
+                         "scale"):
+                pb.keyframe_insert(data_path=path, frame=t, group=pb.name)
+
+    return apply_pose, key_pose
+
+
 def render_action_animations(cam_obj, directions, animations, frames_per_anim,
-                             output_dir, subject, armature):
+                             output_dir, subject, armature, shard=None,
+                             keyframed=False, cache=None, actions=None):
     """Render using Blender Actions stored on the armature.
 
-    Each animation name maps to a Blender Action. The Action's keyframes
-    are evaluated at integer frames 1..N for each animation.
+    Each animation name maps to a Blender Action (actions, default: every
+    Action in bpy.data by name). The Action's keyframes are evaluated at
+    integer frames 1..N for each animation.
+    With shard=(i, N), only the i-th slice of the job list is rendered.
+    With keyframed=True, poses are baked onto one timeline and all jobs
+    are rendered by one animation render.
+    With a RenderCache, jobs whose scene state is unchanged are skipped.
     """
     os.makedirs(output_dir, exist_ok=True)
-    total_rendered = 0
 
     if not armature.animation_data:
         armature.animation_data_create()
 
     # Map available actions by name
-    available_actions = {a.name: a for a in bpy.data.actions}
+    available_actions = actions or {a.name: a for a in bpy.data.actions}
     print(f"  Available actions: {list(available_actions.keys())}")
 
+    # Drop missing actions before sharding so every shard sees the same list
+    present = []
     for anim, n_frames in zip(animations, frames_per_anim):
-        action = available_actions.get(anim)
-        if not action:
+        if anim not in available_actions:
             print(f"  WARNING: Action '{anim}' not found, skipping")
             continue
-
-        # Assign this action to the armature
-        armature.animation_data.action = action
-
-        for frame_idx in range(n_frames):
-            # Set Blender scene frame (Actions use 1-indexed frames)
-            frame = frame_idx + 1
-            bpy.context.scene.frame_set(frame)
-
-            for dir_name in directions:
-                azimuth = DIRECTIONS[dir_name]
-                _position_camera(cam_obj, azimuth)
-
-                fname = f"{subject}_{anim}_{dir_name}_{frame_idx + 1:02d}.png"
-                filepath = os.path.join(output_dir, fname)
-                bpy.context.scene.render.filepath = filepath
-                bpy.ops.render.render(write_still=True)
-                total_rendered += 1
-
-        print(f"  {anim}: {n_frames} frames x {len(directions)} dirs = "
-              f"{n_frames * len(directions)} renders")
-
-    print(f"  Total: {total_rendered} frames rendered")
+        present.append((anim, n_frames))
+    jobs = shard_jobs(
+        build_render_jobs([a for a, _ in present], [n for _, n in present],
+                          directions),
+        shard)
+
+    if keyframed:
+        apply_pose, key_pose = _bake_action_timeline(armature, jobs,
+                                                     available_actions)
+        total_rendered = render_keyframed(cam_obj, jobs, output_dir, subject,
+                                          apply_pose, key_pose, cache)
+        timeline = armature.animation_data.action
+        armature.animation_data.action = None
+        bpy.data.actions.remove(timeline)
+    else:
+        current = [None]
+
+        def apply_pose(job):
+            anim, frame_idx, _n_frames, _dir_name = job
+            if current[0] is None or current[0][0] != anim:
+                # Assign this action to the armature
+                armature.animation_data.action = available_actions[anim]
+            if current[0] != (anim, frame_idx):
+                # Set Blender scene frame (Actions use 1-indexed frames)
+                bpy.context.scene.frame_set(frame_idx + 1)
+                current[0] = (anim, frame_idx)
+
+        total_rendered = render_jobs(cam_obj, jobs, output_dir, subject,
+                                     apply_pose, cache)
+
+    _finish_render(jobs, total_rendered, cache, keyframed)
     return total_rendered
 
 
@@ -819,15 +1336,12 @@ def render_directions(cam_obj, directions, output_dir, subject):
 # Main
 # ---------------------------------------------------------------------------
 
-def parse_args():
-    """Parse arguments after Blender's -- separator."""
-    # Blender passes everything after '--' to the script
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
+class RenderJobError(Exception):
+    """A render job cannot run (bad arguments or no model builder)."""
+
 
+def build_parser():
+    """Build the render_isometric argument parser (CLI and server jobs)."""
     parser = argparse.ArgumentParser(
         description="Render isometric sprites from Blender"
     )
@@ -872,17 +1386,143 @@ def parse_args():
         "--building-stages", type=int, default=0,
         help="Render N construction stages (e.g., 4 for farm build sequence)"
     )
+    parser.add_argument(
+        "--shard", type=parse_shard, default=None,
+        help="Render only slice i of N of the animation job list (e.g. 0/4); "
+             "used by asset_pipeline to split renders across processes"
+    )
+    parser.add_argument(
+        "--mirror-symmetric", action="store_true",
+        help="Skip ne/e/se; generate_manifest derives them by mirroring "
+             "nw/w/sw"
+    )
+    parser.add_argument(
+        "--no-render-cache", action="store_true",
+        help="Re-render every frame, ignoring the scene-state render cache"
+    )
+    parser.add_argument(
+        "--keyframed", action="store_true",
+        help="Key camera azimuth and pose onto the timeline and render all "
+             "animation frames with a single animation render"
+    )
+    parser.add_argument(
+        "--profile", choices=list(RENDER_PROFILES),
+        default=DEFAULT_RENDER_PROFILE,
+        help="Render quality profile: preview (Workbench, 1x, no AA), "
+             f"draft or final (default: {DEFAULT_RENDER_PROFILE})"
+    )
+    parser.add_argument(
+        "--server", action="store_true",
+        help="Run as a persistent render server reading JSON jobs on stdin"
+    )
+    return parser
 
-    return parser.parse_args(argv)
 
+def parse_args(argv=None):
+    """Parse arguments (default: everything after Blender's -- separator)."""
+    if argv is None:
+        # Blender passes everything after '--' to the script
+        argv = sys.argv
+        if "--" in argv:
+            argv = argv[argv.index("--") + 1:]
+        else:
+            argv = []
+    return build_parser().parse_args(argv)
 
-def main():
-    args = parse_args()
 
-    # Determine project root (script is at <project>/blender/render_isometric.py)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
+class RenderSession:
+    """Scene state kept between render jobs.
 
+    Holds the camera/light rig and every .blend model loaded so far. Each
+    .blend is loaded once into its own collection; a job links only its
+    subject's collection into the scene, so a long-lived server keeps
+    meshes, materials and actions resident across jobs. A .blend whose
+    mtime or size has changed since it was loaded (e.g. rebuilt by
+    create_unit.py) is dropped and loaded again.
+    """
+
+    def __init__(self):
+        self.cam = None
+        # blend path -> (collection, {action name: Action}, (mtime_ns, size))
+        self.resident = {}
+
+    def prepare(self, azimuth_deg, footprint, asset_type,
+                profile=DEFAULT_RENDER_PROFILE):
+        """Reset the scene for a new job and return the camera."""
+        if self.cam is None:
+            clear_scene()
+            setup_lighting()
+            self.cam = setup_camera(azimuth_deg, footprint=footprint,
+                                    asset_type=asset_type)
+        else:
+            _clear_model_objects()
+            for collection, _actions, _stamp in self.resident.values():
+                if collection.name in bpy.context.scene.collection.children:
+                    bpy.context.scene.collection.children.unlink(collection)
+            _set_ortho_scale(self.cam.data, footprint, asset_type)
+            _position_camera(self.cam, azimuth_deg)
+        setup_render(footprint=footprint, asset_type=asset_type,
+                     profile=profile)
+        return self.cam
+
+    def load_blend(self, blend_path):
+        """Link a .blend's objects into the scene, loading it on first use.
+
+        Returns (collection, actions) where actions maps each Action's name
+        in the .blend to the loaded Action (names may be suffixed in
+        bpy.data when several models share action names).
+        """
+        key = os.path.abspath(blend_path)
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if key in self.resident and self.resident[key][2] != stamp:
+            self._unload(key)
+            print(f"  Changed on disk: {blend_path}")
+        if key not in self.resident:
+            with bpy.data.libraries.load(blend_path) as (data_from, data_to):
+                data_to.objects = data_from.objects
+                data_to.actions = data_from.actions
+                action_names = list(data_from.actions)
+            collection = bpy.data.collections.new(
+                os.path.splitext(os.path.basename(blend_path))[0])
+            collection.use_fake_user = True
+            for obj in data_to.objects:
+                if obj is not None:
+                    collection.objects.link(obj)
+            actions = {name: act for name, act in
+                       zip(action_names, data_to.actions) if act is not None}
+            self.resident[key] = (collection, actions, stamp)
+            print(f"  Loaded: {blend_path}")
+        else:
+            print(f"  Reused: {blend_path}")
+        collection, actions, _stamp = self.resident[key]
+        bpy.context.scene.collection.children.link(collection)
+        return collection, actions
+
+    def _unload(self, key):
+        """Remove a resident model's objects, actions and orphaned data."""
+        collection, actions, _stamp = self.resident.pop(key)
+        if collection.name in bpy.context.scene.collection.children:
+            bpy.context.scene.collection.children.unlink(collection)
+        for obj in list(collection.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+        for action in actions.values():
+            bpy.data.actions.remove(action)
+        bpy.data.collections.remove(collection)
+        for block in bpy.data.meshes:
+            if block.users == 0:
+                bpy.data.meshes.remove(block)
+        for block in bpy.data.materials:
+            if block.users == 0:
+                bpy.data.materials.remove(block)
+
+
+def run_render(args, project_root, session):
+    """Run one render job described by parsed args.
+
+    Returns the number of planned renders. Raises RenderJobError when the
+    job cannot run.
+    """
     if args.poc:
         args.subject = "poc_house"
         args.footprint = 2
@@ -893,6 +1533,14 @@ def main():
     if asset_type == "unit" and args.directions == ["s"]:
         args.directions = list(DIRECTIONS.keys())
 
+    # Symmetric subjects: drop directions that will be mirrored from a
+    # direction that is also being rendered
+    if args.mirror_symmetric:
+        args.directions = [
+            d for d in args.directions
+            if MIRROR_DIRECTIONS.get(d) not in args.directions
+        ]
+
     output_dir = args.output_dir or os.path.join(
         project_root, "blender", "renders", args.subject
     )
@@ -908,9 +1556,8 @@ def main():
             # Default: 4 frames per animation
             frames_per_anim = [4] * len(animations)
         if len(animations) != len(frames_per_anim):
-            print("ERROR: --animations and --frames-per-anim must have same count",
-                  file=sys.stderr)
-            sys.exit(1)
+            raise RenderJobError(
+                "--animations and --frames-per-anim must have same count")
 
     if args.building_stages > 0:
         total_frames = args.building_stages * len(args.directions)
@@ -932,29 +1579,30 @@ def main():
         print(f"  Animations: {', '.join(animations)}")
         print(f"  Frames:     {', '.join(str(f) for f in frames_per_anim)}")
     print(f"  Total:      {total_frames} renders")
+    if args.shard:
+        print(f"  Shard:      {args.shard[0]}/{args.shard[1]}")
+    if args.keyframed and animations:
+        print("  Mode:       keyframed (single animation render)")
+    print(f"  Profile:    {args.profile}")
     print(f"  Output:     {output_dir}")
 
     # Scene setup
-    clear_scene()
-    setup_lighting()
-    cam = setup_camera(DIRECTIONS[args.directions[0]],
-                       footprint=args.footprint, asset_type=asset_type)
-    setup_render(footprint=args.footprint, asset_type=asset_type)
+    cam = session.prepare(DIRECTIONS[args.directions[0]],
+                          footprint=args.footprint, asset_type=asset_type,
+                          profile=args.profile)
+    write_render_profile(output_dir, args.profile)
 
     # Build or load model
     archer_root = None
+    model_objects = None
+    actions = None
     blend_path = args.blend_file or os.path.join(
         project_root, "blender", "models", f"{args.subject}.blend")
 
     if args.blend_file or os.path.exists(blend_path):
         # Load .blend file (explicit or auto-detected from blender/models/)
-        with bpy.data.libraries.load(blend_path) as (data_from, data_to):
-            data_to.objects = data_from.objects
-            data_to.actions = data_from.actions
-        for obj in data_to.objects:
-            if obj is not None:
-                bpy.context.scene.collection.objects.link(obj)
-        print(f"  Loaded: {blend_path}")
+        collection, actions = session.load_blend(blend_path)
+        model_objects = list(collection.all_objects)
     elif args.subject == "poc_house" or args.poc:
         build_poc_house()
         print("  Built PoC house model")
@@ -971,6 +1619,11 @@ def main():
         print(f"  Expected: {blend_path}")
         print(f"  Rendering empty scene.")
 
+    # Scene-state cache for animated unit renders
+    cache = None
+    if animations and not args.no_render_cache:
+        cache = RenderCache(output_dir, shard=args.shard)
+
     # Render — building stages take priority
     if args.building_stages > 0:
         # Map subjects to their stage builder functions
@@ -982,21 +1635,22 @@ def main():
             render_building_stages(cam, args.directions, args.building_stages,
                                    output_dir, args.subject, build_fn)
         else:
-            print(f"  ERROR: No stage builder for '{args.subject}'",
-                  file=sys.stderr)
-            sys.exit(1)
+            raise RenderJobError(f"No stage builder for '{args.subject}'")
     elif animations and archer_root:
         # Geometric archer: procedural animation
         render_animated_unit(cam, args.directions, animations,
                              frames_per_anim, output_dir, args.subject,
-                             archer_root)
+                             archer_root, shard=args.shard,
+                             keyframed=args.keyframed, cache=cache)
     elif animations:
         # Action-based animation from loaded .blend armature
-        armature = _find_armature()
+        armature = _find_armature(model_objects)
         if armature:
             render_action_animations(cam, args.directions, animations,
                                      frames_per_anim, output_dir,
-                                     args.subject, armature)
+                                     args.subject, armature, shard=args.shard,
+                                     keyframed=args.keyframed, cache=cache,
+                                     actions=actions)
         else:
             print("  WARNING: Animations requested but no armature found. "
                   "Rendering static.")
@@ -1005,6 +1659,124 @@ def main():
         render_directions(cam, args.directions, output_dir, args.subject)
 
     print(f"=== Done: {total_frames} render(s) complete ===")
+    return total_frames
+
+
+# ---------------------------------------------------------------------------
+# Render server
+# ---------------------------------------------------------------------------
+
+# Prefix marking protocol lines on stdout (Blender writes its own log there)
+SERVER_REPLY_PREFIX = "@@ROR_RENDER "
+
+# JSON job keys that map onto CLI flags (value flags, then boolean flags)
+_JOB_VALUE_FLAGS = {
+    "type": "--type",
+    "footprint": "--footprint",
+    "output_dir": "--output-dir",
+    "blend_file": "--blend-file",
+    "animations": "--animations",
+    "frames_per_anim": "--frames-per-anim",
+    "building_stages": "--building-stages",
+    "shard": "--shard",
+    "profile": "--profile",
+}
+_JOB_BOOL_FLAGS = {
+    "poc": "--poc",
+    "mirror_symmetric": "--mirror-symmetric",
+    "no_render_cache": "--no-render-cache",
+    "keyframed": "--keyframed",
+}
+
+
+def job_to_argv(job):
+    """Convert a JSON render job into render_isometric CLI arguments.
+
+    A job either carries "argv" (the exact CLI arguments) or named fields:
+    subject, type, footprint, directions, output_dir, blend_file,
+    animations, frames_per_anim, building_stages, shard, profile and
+    boolean flags.
+    """
+    if "argv" in job:
+        return [str(a) for a in job["argv"]]
+    argv = [job["subject"]] if job.get("subject") else []
+    for key, flag in _JOB_VALUE_FLAGS.items():
+        value = job.get(key)
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ",".join(str(v) for v in value)
+        argv.extend([flag, str(value)])
+    if job.get("directions"):
+        argv.append("--directions")
+        argv.extend(job["directions"])
+    for key, flag in _JOB_BOOL_FLAGS.items():
+        if job.get(key):
+            argv.append(flag)
+    return argv
+
+
+def _server_reply(payload):
+    """Write one protocol line to stdout."""
+    print(SERVER_REPLY_PREFIX + json.dumps(payload), flush=True)
+
+
+def serve(project_root):
+    """Serve JSON render jobs from stdin, one per line, until EOF.
+
+    Replies with one prefixed JSON line per job:
+    {"id", "ok", "renders", "seconds"} or {"id", "ok": false, "error"}.
+    A {"command": "shutdown"} job stops the server.
+    """
+    session = RenderSession()
+    _server_reply({"ready": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            _server_reply({"ok": False, "error": f"invalid JSON job: {e}"})
+            continue
+
+        job_id = job.get("id")
+        if job.get("command") == "shutdown":
+            _server_reply({"id": job_id, "ok": True})
+            break
+
+        started = time.monotonic()
+        try:
+            args = parse_args(job_to_argv(job))
+            renders = run_render(args, project_root, session)
+        except SystemExit:
+            _server_reply({"id": job_id, "ok": False,
+                           "error": "invalid render arguments"})
+        except Exception as e:  # keep serving after a failed job
+            traceback.print_exc()
+            _server_reply({"id": job_id, "ok": False, "error": str(e)})
+        else:
+            _server_reply({"id": job_id, "ok": True, "renders": renders,
+                           "seconds": round(time.monotonic() - started, 3)})
+
+
+def main():
+    args = parse_args()
+
+    # Determine project root (script is at <project>/blender/render_isometric.py)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
+
+    if args.server:
+        serve(project_root)
+        return
+
+    try:
+        run_render(args, project_root, RenderSession())
+    except RenderJobError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+class_name DebugPayloads
+extends RefCounted
+## Static helpers for the debug server's compact responses: /screenshot
+## regions (x/y/w/h, or centred on an entity) encoded as PNG or raw RGBA8,
+## and /pathfinding solidity grids as per-cell lists or run-length rows.
+
+const DEFAULT_ENTITY_PADDING: int = 80
+
+
+## Screenshot region from query params, clamped to the image: padding px
+## (default 80) each side of entity_center if given, else x/y/w/h. No params
+## selects the whole image; an empty Rect2i means no overlap.
+static func screenshot_region(params: Dictionary, image_size: Vector2i, entity_center: Variant = null) -> Rect2i:
+	var full := Rect2i(Vector2i.ZERO, image_size)
+	if entity_center != null:
+		var pad: int = int(params.get("padding", str(DEFAULT_ENTITY_PADDING)))
+		var c: Vector2 = entity_center
+		return full.intersection(Rect2i(Vector2i(c) - Vector2i(pad, pad), Vector2i(pad * 2, pad * 2)))
+	if not (params.has("x") or params.has("y") or params.has("w") or params.has("h")):
+		return full
+	var x: int = int(params.get("x", "0"))
+	var y: int = int(params.get("y", "0"))
+	var w: int = int(params.get("w", str(image_size.x - x)))
+	var h: int = int(params.get("h", str(image_size.y - y)))
+	if w <= 0 or h <= 0:
+		return Rect2i()
+	return full.intersection(Rect2i(x, y, w, h))
+
+
+## Pixel of a named scene entity in a capture of image_size taken from
+## viewport, or null if there is no such entity or no camera.
+static func entity_screen_position(viewport: Viewport, entity_name: String, image_size: Vector2i) -> Variant:
+	var root := viewport.get_tree().current_scene
+	var camera := viewport.get_camera_2d()
+	if root == null or camera == null:
+		return null
+	var entity := root.get_node_or_null(NodePath(entity_name)) as Node2D
+	if entity == null:
+		return null
+	var vp_size := Vector2(viewport.get_visible_rect().size)
+	var pos := (entity.global_position - camera.global_position) * camera.zoom + vp_size / 2.0
+	# The captured texture may be larger than the visible rect (e.g. HiDPI)
+	return pos * Vector2(image_size) / vp_size
+
+
+## region of image as PNG, or as RGBA8 bytes when fmt is "raw" (skips the
+## PNG encode). Empty if encoding failed.
+static func encode_image(image: Image, region: Rect2i, fmt: String) -> PackedByteArray:
+	if region.size != image.get_size():
+		image = image.get_region(region)
+	if fmt != "raw":
+		return image.save_png_to_buffer()
+	if image.get_format() != Image.FORMAT_RGBA8:
+		image.convert(Image.FORMAT_RGBA8)
+	return image.get_data()
+
+
+## Content-Type, Content-Length and X-Region (the "x,y,w,h" actually
+## returned) header lines for an encoded screenshot of size bytes.
+static func image_headers(fmt: String, region: Rect2i, size: int) -> String:
+	var header := "Content-Type: %s\r\n" % ("application/octet-stream" if fmt == "raw" else "image/png")
+	header += "Content-Length: %d\r\n" % size
+	header += "X-Region: %d,%d,%d,%d\r\n" % [region.position.x, region.position.y, region.size.x, region.size.y]
+	return header
+
+
+## /pathfinding grid of map_size x map_size cells: one {"x", "y"} per solid
+## cell, or with fmt "rle" one rle_encode_row string per row. All cells are
+## open if astar is null.
+static func solidity_grid(astar: AStarGrid2D, map_size: int, fmt: String) -> Dictionary:
+	var result: Dictionary = {"map_size": map_size}
+	if fmt != "rle":
+		var solid_cells: Array[Dictionary] = []
+		if astar != null:
+			for x in map_size:
+				for y in map_size:
+					if astar.is_point_solid(Vector2i(x, y)):
+						solid_cells.append({"x": x, "y": y})
+		result["solid_cell_count"] = solid_cells.size()
+		result["solid_cells"] = solid_cells
+		return result
+	var rows := PackedStringArray()
+	var row := PackedByteArray()
+	row.resize(map_size)
+	var solid_count := 0
+	for y in map_size:
+		row.fill(0)
+		if astar != null:
+			for x in map_size:
+				if astar.is_point_solid(Vector2i(x, y)):
+					row[x] = 1
+					solid_count += 1
+		rows.append(rle_encode_row(row))
+	result["format"] = "rle"
+	result["solid_cell_count"] = solid_count
+	result["rows"] = rows
+	return result
+
+
+## Run lengths of a row of cells (0 open, non-zero solid), alternating
+## open/solid and starting with open: [0,0,1,1,1,0] -> "2,3,1".
+static func rle_encode_row(row: PackedByteArray) -> String:
+	var runs := PackedStringArray()
+	var solid := false
+	var length := 0
+	for cell: int in row:
+		if (cell != 0) != solid:
+			runs.append(str(length))
+			solid = not solid
+			length = 0
+		length += 1
+	runs.append(str(length))
+	return ",".join(runs)
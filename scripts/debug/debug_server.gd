@@ -2,10 +2,14 @@ extends Node
 ## Lightweight HTTP debug server for dev tooling (screenshot capture, status, commands).
 ## Only activates when --debug-server is passed via OS.get_cmdline_user_args().
 ## Listens on 127.0.0.1:9222, handles one request at a time.
+## Clients that send "Connection: keep-alive" keep their connection open for
+## further requests (polled each frame) until it idles out.
 
 const DEFAULT_PORT: int = 9222
 const BIND_HOST: String = "127.0.0.1"
 const MAX_REQUEST_SIZE: int = 4096
+const KEEP_ALIVE_TIMEOUT_MS: int = 5000
+const MAX_KEEP_ALIVE_PEERS: int = 8
 const UnitScript := preload("res://scripts/prototype/prototype_unit.gd")
 const ResourceNodeScript := preload("res://scripts/prototype/prototype_resource_node.gd")
 const BuildingScript := preload("res://scripts/prototype/prototype_building.gd")
@@ -18,8 +22,13 @@ const RESOURCE_NAMES: Array[String] = [
 	"fish",
 ]
 
+## Whether the response being written keeps its connection open.
+static var _keep_alive: bool = false
+
 var _server: TCPServer = null
 var _active: bool = false
+## Open keep-alive connections waiting for their next request: {"peer", "since"}.
+var _idle_peers: Array[Dictionary] = []
 
 
 func _ready() -> void:
@@ -39,6 +48,7 @@ func _ready() -> void:
 func _process(_delta: float) -> void:
 	if not _active:
 		return
+	_poll_idle_peers()
 	if not _server.is_connection_available():
 		return
 	var peer: StreamPeerTCP = _server.take_connection()
@@ -47,6 +57,26 @@ func _process(_delta: float) -> void:
 	_handle_connection(peer)
 
 
+func _poll_idle_peers() -> void:
+	var now := Time.get_ticks_msec()
+	var waiting: Array[Dictionary] = []
+	var ready: Array[StreamPeerTCP] = []
+	for entry: Dictionary in _idle_peers:
+		var peer: StreamPeerTCP = entry["peer"]
+		peer.poll()
+		if peer.get_status() != StreamPeerTCP.STATUS_CONNECTED:
+			continue
+		if peer.get_available_bytes() > 0:
+			ready.append(peer)
+		elif now - int(entry["since"]) > KEEP_ALIVE_TIMEOUT_MS:
+			peer.disconnect_from_host()
+		else:
+			waiting.append(entry)
+	_idle_peers = waiting
+	for peer: StreamPeerTCP in ready:
+		_handle_connection(peer)
+
+
 func _handle_connection(peer: StreamPeerTCP) -> void:
 	# Read the HTTP request headers until we get a blank line.
 	var request_data := ""
@@ -76,6 +106,8 @@ func _handle_connection(peer: StreamPeerTCP) -> void:
 	var body_text := ""
 	if method == "POST":
 		body_text = _read_body(peer, request_data, headers, start_tick)
+	var keep_alive := wants_keep_alive(headers)
+	_keep_alive = keep_alive
 	# Split path from query string
 	var query_string := ""
 	var base_path := path
@@ -86,7 +118,7 @@ func _handle_connection(peer: StreamPeerTCP) -> void:
 	if method == "GET" and base_path == "/ping":
 		_send_json(peer, 200, {"status": "ok"})
 	elif method == "GET" and base_path == "/screenshot":
-		await _handle_screenshot(peer, query_string)
+		await _handle_screenshot(peer, query_string, keep_alive)
 	elif method == "GET" and base_path == "/status":
 		_handle_status(peer)
 	elif method == "GET" and base_path == "/combat-log":
@@ -105,7 +137,19 @@ func _handle_connection(peer: StreamPeerTCP) -> void:
 		_handle_command(peer, body_text)
 	else:
 		_send_json(peer, 404, {"error": "not found", "path": path})
-	peer.disconnect_from_host()
+	if keep_alive and _idle_peers.size() < MAX_KEEP_ALIVE_PEERS:
+		_idle_peers.append({"peer": peer, "since": Time.get_ticks_msec()})
+	else:
+		peer.disconnect_from_host()
+
+
+## True if the client asked to keep the connection open after the response.
+static func wants_keep_alive(headers: Dictionary) -> bool:
+	return str(headers.get("connection", "")).to_lower() == "keep-alive"
+
+
+static func _connection_header(keep_alive: bool) -> String:
+	return "Connection: keep-alive\r\n" if keep_alive else "Connection: close\r\n"
 
 
 static func _read_body(peer: StreamPeerTCP, request_data: String, headers: Dictionary, start_tick: int) -> String:
@@ -157,7 +201,9 @@ static func _parse_request(raw: String) -> Dictionary:
 	return {"method": parts[0], "path": parts[1], "headers": headers}
 
 
-func _handle_screenshot(peer: StreamPeerTCP, query_string: String) -> void:
+## GET /screenshot — viewport capture. Optional region x/y/w/h or
+## entity=<name>&padding=<px>, and format=raw for RGBA8 (see DebugPayloads).
+func _handle_screenshot(peer: StreamPeerTCP, query_string: String, keep_alive: bool = false) -> void:
 	var viewport := get_viewport()
 	if viewport == null:
 		_send_json(peer, 500, {"error": "no viewport"})
@@ -171,23 +217,35 @@ func _handle_screenshot(peer: StreamPeerTCP, query_string: String) -> void:
 		# Wait two frames: one for layout, one for draw
 		await get_tree().process_frame
 		await get_tree().process_frame
+		# Other requests may have been served while waiting
+		_keep_alive = keep_alive
 	var image := viewport.get_texture().get_image()
 	if overlay != null:
 		overlay.queue_free()
 	if image == null:
 		_send_json(peer, 500, {"error": "failed to capture image"})
 		return
-	var png_data := image.save_png_to_buffer()
-	if png_data.is_empty():
-		_send_json(peer, 500, {"error": "failed to encode PNG"})
+	var center: Variant = null
+	if params.has("entity"):
+		center = DebugPayloads.entity_screen_position(viewport, str(params["entity"]), image.get_size())
+		if center == null:
+			_send_json(peer, 404, {"error": "entity not found", "entity": params["entity"]})
+			return
+	var region := DebugPayloads.screenshot_region(params, image.get_size(), center)
+	if not region.has_area():
+		_send_json(peer, 400, {"error": "region outside viewport"})
+		return
+	var fmt := str(params.get("format", "png"))
+	var data := DebugPayloads.encode_image(image, region, fmt)
+	if data.is_empty():
+		_send_json(peer, 500, {"error": "failed to encode image"})
 		return
 	var header := "HTTP/1.1 200 OK\r\n"
-	header += "Content-Type: image/png\r\n"
-	header += "Content-Length: %d\r\n" % png_data.size()
-	header += "Connection: close\r\n"
+	header += DebugPayloads.image_headers(fmt, region, data.size())
+	header += _connection_header(keep_alive)
 	header += "\r\n"
 	peer.put_data(header.to_utf8_buffer())
-	peer.put_data(png_data)
+	peer.put_data(data)
 
 
 func _create_annotation_overlay() -> CanvasLayer:
@@ -428,11 +486,19 @@ func _cmd_right_click(peer: StreamPeerTCP, body: Dictionary) -> void:
 	var target: Node = null
 	if root and "_target_detector" in root and root._target_detector:
 		target = root._target_detector.detect(wp) if root._target_detector.has_method("detect") else null
-	# Resolve command via the same table the input handler uses
+	# Resolve command via the same table the input handler uses.
+	# Optional unit_ids commands those units instead of the selection.
 	var selected: Array[Node] = []
-	for u: Node2D in _get_player_units(0):
-		if "selected" in u and u.selected:
-			selected.append(u)
+	var ids: Array = body.get("unit_ids", []) as Array
+	if ids.is_empty():
+		for u: Node2D in _get_player_units(0):
+			if "selected" in u and u.selected:
+				selected.append(u)
+	elif root != null:
+		for uid: Variant in ids:
+			var n := root.get_node_or_null(NodePath(str(uid)))
+			if n is Node2D:
+				selected.append(n)
 	var tbl: Dictionary = GameUtils.dl_settings("commands").get("command_table", {})
 	var cmd := CommandResolver.resolve(
 		CommandResolver.get_primary_unit_type(selected), CommandResolver.get_target_category(target), tbl
@@ -647,14 +713,16 @@ static func _send_json(peer: StreamPeerTCP, status_code: int, data: Dictionary)
 		status_text = "Not Found"
 	elif status_code == 500:
 		status_text = "Internal Server Error"
-	var body := JSON.stringify(data)
+	# Byte length, not character count: a kept-alive client relies on it to
+	# find the end of the response
+	var body := JSON.stringify(data).to_utf8_buffer()
 	var header := "HTTP/1.1 %d %s\r\n" % [status_code, status_text]
 	header += "Content-Type: application/json\r\n"
-	header += "Content-Length: %d\r\n" % body.length()
-	header += "Connection: close\r\n"
+	header += "Content-Length: %d\r\n" % body.size()
+	header += _connection_header(_keep_alive)
 	header += "\r\n"
 	peer.put_data(header.to_utf8_buffer())
-	peer.put_data(body.to_utf8_buffer())
+	peer.put_data(body)
 
 
 func _handle_entities(peer: StreamPeerTCP, query_string: String) -> void:
@@ -1108,18 +1176,8 @@ func _handle_pathfinding(peer: StreamPeerTCP, query_string: String) -> void:
 		return
 	var pf: Node = root._pathfinder
 	var ms: int = int(pf._map_size)
-	var solid_cells: Array[Dictionary] = []
-	if pf._astar != null:
-		for x in ms:
-			for y in ms:
-				if pf._astar.is_point_solid(Vector2i(x, y)):
-					solid_cells.append({"x": x, "y": y})
-	var result: Dictionary = {
-		"map_size": ms,
-		"solid_cell_count": solid_cells.size(),
-		"solid_cells": solid_cells,
-	}
 	var params := parse_query_string(query_string)
+	var result := DebugPayloads.solidity_grid(pf._astar, ms, str(params.get("format", "")))
 	if params.has("unit"):
 		var un: String = params["unit"]
 		var node: Node = root.get_node_or_null(NodePath(un))
@@ -1244,6 +1302,9 @@ static func serialize_entity_verbose(entity: Node2D) -> Dictionary:
 
 
 func _exit_tree() -> void:
+	for entry: Dictionary in _idle_peers:
+		(entry["peer"] as StreamPeerTCP).disconnect_from_host()
+	_idle_peers.clear()
 	if _server != null:
 		_server.stop()
 		_active = false
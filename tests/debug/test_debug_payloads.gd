@@ -0,0 +1,114 @@
+extends GdUnitTestSuite
+## Tests for debug_payloads.gd — debug server screenshot region helpers.
+
+const DebugPayloadsScript := preload("res://scripts/debug/debug_payloads.gd")
+
+# -- screenshot_region tests --
+
+
+func test_screenshot_region_defaults_to_full_image() -> void:
+	var r := DebugPayloadsScript.screenshot_region({}, Vector2i(800, 600))
+	assert_that(r).is_equal(Rect2i(0, 0, 800, 600))
+
+
+func test_screenshot_region_inside_image() -> void:
+	var params := {"x": "10", "y": "20", "w": "160", "h": "120"}
+	var r := DebugPayloadsScript.screenshot_region(params, Vector2i(800, 600))
+	assert_that(r).is_equal(Rect2i(10, 20, 160, 120))
+
+
+func test_screenshot_region_clamped_to_image() -> void:
+	var params := {"x": "700", "y": "-20", "w": "160", "h": "120"}
+	var r := DebugPayloadsScript.screenshot_region(params, Vector2i(800, 600))
+	assert_that(r).is_equal(Rect2i(700, 0, 100, 100))
+
+
+func test_screenshot_region_outside_image_is_empty() -> void:
+	var params := {"x": "900", "y": "0", "w": "10", "h": "10"}
+	var r := DebugPayloadsScript.screenshot_region(params, Vector2i(800, 600))
+	assert_bool(r.has_area()).is_false()
+
+
+func test_screenshot_region_centred_on_entity() -> void:
+	var r := DebugPayloadsScript.screenshot_region({"padding": "20"}, Vector2i(800, 600), Vector2(100, 590))
+	assert_that(r).is_equal(Rect2i(80, 570, 40, 30))
+
+
+func test_screenshot_region_entity_default_padding() -> void:
+	var r := DebugPayloadsScript.screenshot_region({}, Vector2i(800, 600), Vector2(400, 300))
+	assert_that(r).is_equal(Rect2i(320, 220, 160, 160))
+
+
+# -- encode_image tests --
+
+
+func test_encode_image_raw_is_rgba8_region() -> void:
+	var image := Image.create(8, 8, false, Image.FORMAT_RGB8)
+	var data := DebugPayloadsScript.encode_image(image, Rect2i(2, 2, 3, 4), "raw")
+	assert_int(data.size()).is_equal(3 * 4 * 4)
+
+
+func test_encode_image_png() -> void:
+	var image := Image.create(8, 8, false, Image.FORMAT_RGBA8)
+	var data := DebugPayloadsScript.encode_image(image, Rect2i(0, 0, 8, 8), "png")
+	assert_int(data[0]).is_equal(0x89)
+
+
+func test_image_headers() -> void:
+	var header := DebugPayloadsScript.image_headers("raw", Rect2i(1, 2, 3, 4), 48)
+	assert_str(header).contains("Content-Type: application/octet-stream\r\n")
+	assert_str(header).contains("Content-Length: 48\r\n")
+	assert_str(header).contains("X-Region: 1,2,3,4\r\n")
+	assert_str(DebugPayloadsScript.image_headers("png", Rect2i(), 0)).contains("Content-Type: image/png\r\n")
+
+
+# -- rle_encode_row tests --
+
+
+func test_rle_encode_row_starts_with_open_run() -> void:
+	var row := PackedByteArray([0, 0, 1, 1, 1, 0])
+	assert_str(DebugPayloadsScript.rle_encode_row(row)).is_equal("2,3,1")
+
+
+func test_rle_encode_row_leading_solid() -> void:
+	var row := PackedByteArray([1, 1, 0, 1])
+	assert_str(DebugPayloadsScript.rle_encode_row(row)).is_equal("0,2,1,1")
+
+
+func test_rle_encode_row_all_open() -> void:
+	var row := PackedByteArray()
+	row.resize(256)
+	row.fill(0)
+	assert_str(DebugPayloadsScript.rle_encode_row(row)).is_equal("256")
+
+
+# -- solidity_grid tests --
+
+
+func _astar_with_solid(cells: Array[Vector2i]) -> AStarGrid2D:
+	var astar := AStarGrid2D.new()
+	astar.region = Rect2i(0, 0, 4, 4)
+	astar.update()
+	for cell in cells:
+		astar.set_point_solid(cell)
+	return astar
+
+
+func test_solidity_grid_rle_rows() -> void:
+	var astar := _astar_with_solid([Vector2i(1, 0), Vector2i(2, 0), Vector2i(0, 3)])
+	var grid := DebugPayloadsScript.solidity_grid(astar, 4, "rle")
+	assert_str(grid["format"]).is_equal("rle")
+	assert_int(grid["solid_cell_count"]).is_equal(3)
+	assert_array(Array(grid["rows"])).is_equal(["1,2,1", "4", "4", "0,1,3"])
+
+
+func test_solidity_grid_cells() -> void:
+	var grid := DebugPayloadsScript.solidity_grid(_astar_with_solid([Vector2i(2, 1)]), 4, "")
+	assert_int(grid["map_size"]).is_equal(4)
+	assert_array(grid["solid_cells"]).is_equal([{"x": 2, "y": 1}])
+
+
+func test_solidity_grid_without_astar_is_open() -> void:
+	var grid := DebugPayloadsScript.solidity_grid(null, 2, "rle")
+	assert_int(grid["solid_cell_count"]).is_equal(0)
+	assert_array(Array(grid["rows"])).is_equal(["2", "2"])
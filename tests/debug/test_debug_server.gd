@@ -418,6 +418,24 @@ func test_resource_names_does_not_contain_villager() -> void:
 	assert_bool("villager" in DebugServerScript.RESOURCE_NAMES).is_false()
 
 
+# -- keep-alive tests --
+
+
+func test_wants_keep_alive_with_header() -> void:
+	var parsed := DebugServerScript._parse_request("GET /status HTTP/1.1\r\nConnection: Keep-Alive\r\n\r\n")
+	assert_bool(DebugServerScript.wants_keep_alive(parsed.get("headers", {}))).is_true()
+
+
+func test_wants_keep_alive_defaults_to_close() -> void:
+	var parsed := DebugServerScript._parse_request("GET /status HTTP/1.1\r\nHost: localhost\r\n\r\n")
+	assert_bool(DebugServerScript.wants_keep_alive(parsed.get("headers", {}))).is_false()
+
+
+func test_connection_header_matches_keep_alive() -> void:
+	assert_str(DebugServerScript._connection_header(true)).is_equal("Connection: keep-alive\r\n")
+	assert_str(DebugServerScript._connection_header(false)).is_equal("Connection: close\r\n")
+
+
 # -- world_to_screen tests --
 
 
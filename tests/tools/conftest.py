@@ -0,0 +1,170 @@
+"""Shared fixtures for tools/ tests."""
+from __future__ import annotations
+
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubDebugServer:
+    """Local stand-in for the game's debug server (scripts/debug/debug_server.gd).
+
+    routes maps (method, path) to a callable(query: dict, body: bytes)
+    returning either a dict (sent as JSON), (content_type, bytes) or
+    (content_type, bytes, extra headers). Like the game, a connection is
+    kept open only when the request asks for "Connection: keep-alive" (and
+    keep_alive is True), and /screenshot honours x/y/w/h, entity/padding
+    and format=raw (region support needs Pillow).
+    """
+
+    TILE = 32
+
+    def __init__(self):
+        self.keep_alive = True
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self.commands: list[dict] = []
+        self.entities: list[dict] = []
+        self.screenshot = b"\x89PNG stub"
+        self.camera_position = {"x": 0.0, "y": 0.0}
+        self.routes = {
+            ("GET", "/status"): lambda q, b: {
+                "game_time": 1.0, "game_speed": 1.0,
+                "camera_position": self.camera_position,
+                "camera_zoom": {"x": 1.0, "y": 1.0}},
+            ("GET", "/entities"): lambda q, b: {
+                "entities": self.entities, "count": len(self.entities)},
+            ("GET", "/screenshot"): self._screenshot,
+            ("GET", "/perf"): lambda q, b: {"fps": 60.0, "frame_time_ms": 16.6},
+            ("POST", "/command"): self._command,
+        }
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def _screenshot(self, query, body):
+        keys = {"x", "y", "w", "h", "entity", "format"}
+        if not keys & query.keys():
+            return "image/png", self.screenshot
+        import io
+
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(self.screenshot)).convert("RGBA")
+        if "entity" in query:
+            ent = next((e for e in self.entities if e["name"] == query["entity"]), None)
+            if ent is None:
+                return 404, {"error": "entity not found"}
+            cx = ent["position"]["x"] - self.camera_position["x"] + img.width / 2
+            cy = ent["position"]["y"] - self.camera_position["y"] + img.height / 2
+            pad = int(query.get("padding", 80))
+            box = (int(cx) - pad, int(cy) - pad, int(cx) + pad, int(cy) + pad)
+        else:
+            x, y = int(query.get("x", 0)), int(query.get("y", 0))
+            box = (x, y, x + int(query.get("w", img.width - x)),
+                   y + int(query.get("h", img.height - y)))
+        box = (max(0, box[0]), max(0, box[1]),
+               min(img.width, box[2]), min(img.height, box[3]))
+        region = img.crop(box)
+        headers = {"X-Region": f"{box[0]},{box[1]},{region.width},{region.height}"}
+        if query.get("format") == "raw":
+            return "application/octet-stream", region.tobytes(), headers
+        buf = io.BytesIO()
+        region.save(buf, "PNG")
+        return "image/png", buf.getvalue(), headers
+
+    def _command(self, query, body):
+        payload = json.loads(body)
+        self.commands.append(payload)
+        reply = {"action": payload.get("action"), "status": "ok"}
+        if payload.get("action") == "spawn":
+            # Spawned units show up in /entities; world = grid * TILE
+            reply["name"] = f"DebugUnit_{len(self.entities)}"
+            self.entities.append({
+                "name": reply["name"],
+                "unit_category": payload.get("type", ""),
+                "position": {"x": payload.get("grid_x", 0) * self.TILE,
+                             "y": payload.get("grid_y", 0) * self.TILE},
+            })
+        return reply
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this,
+            # Nagle + delayed ACK stall every keep-alive response ~40ms
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, method):
+                url = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(url.query))
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.requests.append((method, self.path))
+                route = stub.routes.get((method, url.path))
+                if route is None:
+                    status, result = 404, {"error": "not found", "path": self.path}
+                else:
+                    status, result = 200, route(query, body)
+                    if isinstance(result, tuple) and isinstance(result[0], int):
+                        status, result = result
+                extra = {}
+                if isinstance(result, dict):
+                    content_type, data = "application/json", json.dumps(result).encode()
+                elif len(result) == 3:
+                    content_type, data, extra = result
+                else:
+                    content_type, data = result
+                keep = (stub.keep_alive
+                        and self.headers.get("Connection", "").lower() == "keep-alive")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Connection", "keep-alive" if keep else "close")
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+                self.close_connection = not keep
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def debug_stub():
+    """A running StubDebugServer; its .url is the debug server base URL."""
+    stub = StubDebugServer()
+    stub.start()
+    yield stub
+    stub.stop()
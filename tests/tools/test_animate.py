@@ -1,6 +1,7 @@
 """Tests for tools/animate.py — live animation filmstrip capture."""
 from __future__ import annotations
 
+import asyncio
 import sys
 from pathlib import Path
 from unittest import mock
@@ -12,6 +13,7 @@ TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
 sys.path.insert(0, str(TOOLS_DIR))
 
 import animate
+import debug_client
 
 try:
     from PIL import Image as _PIL_Image
@@ -90,6 +92,217 @@ class TestPingServer:
             assert animate.ping_server() is False
 
 
+class TestDebugServerCalls:
+    def test_commands_share_one_connection(self, debug_stub):
+        with mock.patch.object(animate, "DEBUG_SERVER", debug_stub.url):
+            assert animate.ping_server() is True
+            animate.spawn_villager(10, 20)
+            animate.move_in_direction(10, 20, "ne")
+            assert animate.capture_screenshot() == debug_stub.screenshot
+            assert [e["name"] for e in animate.get_entities()] == ["DebugUnit_0"]
+            animate.reset_game()
+        assert [c["action"] for c in debug_stub.commands] == [
+            "spawn", "right-click", "reset"
+        ]
+        assert debug_stub.commands[0]["grid_x"] == 10
+        assert debug_stub.commands[1] == {"action": "right-click", "grid_x": 20, "grid_y": 10}
+        assert debug_stub.connections == 1
+
+    def test_move_named_units(self, debug_stub):
+        with mock.patch.object(animate, "DEBUG_SERVER", debug_stub.url):
+            animate.move_in_direction(0, 0, "s", unit_ids=["DebugUnit_3"])
+        assert debug_stub.commands[0]["unit_ids"] == ["DebugUnit_3"]
+
+
+def png_bytes(size=(320, 240), color=(0, 120, 0, 255)) -> bytes:
+    import io
+
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGBA", size, color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def slow(route, seconds):
+    """Wrap a stub route so it answers after a delay."""
+    import time
+
+    def handler(query, body):
+        time.sleep(seconds)
+        return route(query, body)
+
+    return handler
+
+
+@requires_pil
+class TestCaptureFrames:
+    def test_cadence_does_not_drift_with_latency(self, debug_stub):
+        debug_stub.screenshot = png_bytes()
+        for key in (("GET", "/screenshot"), ("GET", "/entities")):
+            debug_stub.routes[key] = slow(debug_stub.routes[key], 0.06)
+        client = debug_client.DebugClient(debug_stub.url)
+        frames = asyncio.run(animate.capture_frames(5, 0.1, client=client))
+        client.close()
+
+        assert [f["index"] for f in frames] == list(range(5))
+        for f in frames:
+            # Requests go out on schedule even though each takes 60ms
+            assert f["scheduled"] <= f["captured"] < f["scheduled"] + 0.05
+            # Screenshot and entities are fetched concurrently, not back to back
+            assert f["received"] - f["captured"] < 0.115
+            assert f["image"].size == (160, 160)
+
+    def test_uses_custom_crop(self, debug_stub):
+        debug_stub.entities = [{"name": "v"}]
+        client = debug_client.DebugClient(debug_stub.url)
+        frames = asyncio.run(animate.capture_frames(
+            2, 0.01, crop=lambda shot, ents: (shot, ents), client=client))
+        client.close()
+        assert frames[0]["image"] == (debug_stub.screenshot, [{"name": "v"}])
+
+    def test_frame_timings_in_ms(self):
+        frames = [{"index": 0, "scheduled": 0.0, "captured": 0.0012,
+                   "received": 0.0512, "image": None}]
+        timings = animate.frame_timings(frames, 0.3)
+        assert timings["frame_duration_ms"] == 300.0
+        assert timings["frames"] == [{"index": 0, "scheduled_ms": 0.0,
+                                      "captured_ms": 1.2, "latency_ms": 50.0}]
+
+
+class TestScreenPositions:
+    CAMERA = {"position": {"x": 100.0, "y": 50.0}, "zoom": {"x": 2.0, "y": 2.0}}
+
+    def test_world_to_screen_matches_server(self):
+        # (world - cam) * zoom + viewport / 2, as in debug_server._world_to_screen
+        pos = animate.world_to_screen({"x": 110.0, "y": 40.0}, self.CAMERA, (800, 600))
+        assert pos == (420.0, 280.0)
+
+    def test_entity_screen_pos_prefers_screen_fields(self):
+        ent = {"screen_x": 5, "screen_y": 6, "position": {"x": 0, "y": 0}}
+        assert animate.entity_screen_pos(ent, self.CAMERA, (800, 600)) == (5, 6)
+
+    def test_entity_screen_pos_needs_camera(self):
+        assert animate.entity_screen_pos({"position": {"x": 0, "y": 0}}, None, (8, 8)) is None
+
+    def test_spread_origin_moves_towards_direction(self):
+        assert animate.spread_origin(50, 50, "ne", 4) == (54, 46)
+        assert animate.spread_origin(50, 50, "s", 4) == (50, 54)
+        origins = {animate.spread_origin(50, 50, d) for d in animate.ALL_DIRECTIONS}
+        assert len(origins) == 8
+
+
+def marked_screenshot(size, marks) -> bytes:
+    """PNG with a 9x9 square of colour at each (x, y) in marks."""
+    import io
+
+    from PIL import Image
+
+    img = Image.new("RGBA", size, (0, 0, 0, 255))
+    for (x, y), color in marks.items():
+        img.paste(color, (int(x) - 4, int(y) - 4, int(x) + 5, int(y) + 5))
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+@requires_pil
+class TestCropEntities:
+    def test_crops_each_entity_from_one_screenshot(self):
+        camera = {"position": {"x": 0.0, "y": 0.0}, "zoom": {"x": 1.0, "y": 1.0}}
+        entities = [
+            {"name": "a", "position": {"x": -100.0, "y": 0.0}},
+            {"name": "b", "position": {"x": 100.0, "y": 50.0}},
+        ]
+        shot = marked_screenshot((400, 300), {(100, 150): (255, 0, 0, 255),
+                                              (300, 200): (0, 0, 255, 255)})
+        crops = animate.crop_entities(shot, entities, {"a": "w", "b": "e", "gone": "n"},
+                                      padding=20, camera=camera)
+        assert crops["w"].getpixel((20, 20)) == (255, 0, 0, 255)
+        assert crops["e"].getpixel((20, 20)) == (0, 0, 255, 255)
+        assert crops["n"].size == (40, 40)  # centre crop for a missing entity
+
+
+@requires_pil
+class TestCaptureAllDirections:
+    @pytest.mark.parametrize("full_frame", [False, True])
+    def test_one_pass_captures_every_direction(
+        self, debug_stub, tmp_path, monkeypatch, full_frame
+    ):
+        tile = debug_stub.TILE
+        debug_stub.camera_position = {"x": 50.0 * tile, "y": 50.0 * tile}
+        viewport = (640, 480)
+        colors = {d: (20 + i * 25, 200, 100, 255) for i, d in enumerate(animate.ALL_DIRECTIONS)}
+        marks = {}
+        for d in animate.ALL_DIRECTIONS:
+            gx, gy = animate.spread_origin(50, 50, d)
+            marks[((gx - 50) * tile + viewport[0] / 2, (gy - 50) * tile + viewport[1] / 2)] = colors[d]
+        debug_stub.screenshot = marked_screenshot(viewport, marks)
+
+        monkeypatch.setattr(animate, "DEBUG_SERVER", debug_stub.url)
+        monkeypatch.setattr(animate, "OUTPUT_DIR", tmp_path)
+        monkeypatch.setattr(animate, "load_frame_duration", lambda: 0.01)
+        monkeypatch.setattr(animate, "load_frame_count", lambda d: 3)
+        monkeypatch.setattr(animate.time, "sleep", lambda s: None)
+
+        outputs = animate.capture_all_directions(50, 50, full_frame=full_frame)
+
+        assert [p.name for p in outputs] == [f"walk_{d}.png" for d in animate.ALL_DIRECTIONS]
+        from PIL import Image
+
+        for d, path in zip(animate.ALL_DIRECTIONS, outputs):
+            strip = Image.open(path)
+            assert strip.size == (3 * 160, 160)
+            assert strip.getpixel((80, 80)) == colors[d]
+            assert (tmp_path / f"walk_{d}.json").is_file()
+
+        actions = [c["action"] for c in debug_stub.commands]
+        assert actions.count("spawn") == 8
+        moves = [c for c in debug_stub.commands if c["action"] == "right-click"]
+        assert sorted(m["unit_ids"][0] for m in moves) == sorted(e["name"] for e in debug_stub.entities)
+        assert actions[-1] == "reset"
+        shots = [r[1] for r in debug_stub.requests if r[1].startswith("/screenshot")]
+        if full_frame:
+            # One full screenshot per frame serves all eight directions
+            assert shots == ["/screenshot"] * 3
+        else:
+            # One raw region per villager per frame, no full screenshots
+            assert len(shots) == 3 * 8
+            assert all("entity=" in q and "format=raw" in q for q in shots)
+
+
+@requires_pil
+class TestRegionScreenshots:
+    def test_raw_region_round_trips(self, debug_stub):
+        debug_stub.screenshot = marked_screenshot((200, 100), {(50, 50): (9, 8, 7, 255)})
+        client = debug_client.DebugClient(debug_stub.url)
+        shot = client.screenshot_region(x=40, y=40, w=30, h=400)
+        client.close()
+        assert shot.format == "raw"
+        assert shot.region == (40, 40, 30, 60)
+        img = animate.screenshot_to_image(shot)
+        assert img.size == (30, 60)
+        assert img.getpixel((10, 10)) == (9, 8, 7, 255)
+
+    def test_png_region(self, debug_stub):
+        debug_stub.screenshot = png_bytes((100, 100))
+        client = debug_client.DebugClient(debug_stub.url)
+        shot = client.screenshot_region(x=0, y=0, w=10, h=10, fmt="png")
+        client.close()
+        assert shot.format == "png"
+        assert animate.screenshot_to_image(shot).size == (10, 10)
+
+    def test_missing_entity_gives_blank_frame(self, debug_stub):
+        debug_stub.screenshot = png_bytes((100, 100))
+        client = debug_client.DebugClient(debug_stub.url)
+        frames = asyncio.run(animate.capture_frames(
+            1, 0.01, client=client, regions={"ghost": "s"}, padding=10))
+        client.close()
+        image = frames[0]["image"]["s"]
+        assert image.size == (20, 20)
+        assert image.getbbox() is None
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -104,6 +317,10 @@ class TestCLI:
         with mock.patch.object(animate, "ping_server", return_value=True):
             assert animate.main(["idle", "s"]) == 1
 
+    def test_concurrent_rejects_direction(self):
+        with mock.patch.object(animate, "ping_server", return_value=True):
+            assert animate.main(["walk", "s", "--concurrent"]) == 1
+
     def test_invalid_direction_exits_with_error(self):
         with mock.patch.object(animate, "ping_server", return_value=True):
             assert animate.main(["walk", "xyz"]) == 1
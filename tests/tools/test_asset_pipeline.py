@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import json
 import sys
+import threading
+import time
 from pathlib import Path
 from unittest import mock
 
@@ -15,6 +17,19 @@ sys.path.insert(0, str(TOOLS_DIR))
 import asset_pipeline as ap
 
 
+def render_args(**overrides):
+    """Build step_render/step_manifest args with every option defaulted."""
+    base = dict(
+        subject="archer", type="unit", footprint=None,
+        animations=["idle", "walk"], frames=[4, 8], directions=None,
+        shards=1, keyframed=False, mirror_symmetric=False,
+        validate_mirror=False, no_render_cache=False, profile="final",
+        lods=None,
+    )
+    base.update(overrides)
+    return mock.Mock(**base)
+
+
 class TestFindBlender:
     def test_finds_from_env_var(self):
         with mock.patch.dict("os.environ", {"BLENDER_BIN": "/usr/bin/blender"}):
@@ -59,7 +74,7 @@ class TestSteps:
     def test_step_manifest_calls_generate_manifest(self):
         with mock.patch("subprocess.run") as mock_run:
             mock_run.return_value = mock.Mock(returncode=0)
-            args = mock.Mock(subject="archer")
+            args = render_args()
             result = ap.step_manifest(args)
             assert result is True
             mock_run.assert_called_once()
@@ -70,7 +85,7 @@ class TestSteps:
     def test_step_pack_calls_spritesheet_packer(self):
         with mock.patch("subprocess.run") as mock_run:
             mock_run.return_value = mock.Mock(returncode=0)
-            args = mock.Mock(subject="archer")
+            args = render_args()
             result = ap.step_pack(args)
             assert result is True
             cmd = mock_run.call_args[0][0]
@@ -79,11 +94,7 @@ class TestSteps:
     def test_step_render_calls_blender(self):
         with mock.patch("subprocess.run") as mock_run:
             mock_run.return_value = mock.Mock(returncode=0)
-            args = mock.Mock(
-                subject="archer", type="unit", footprint=None,
-                animations=["idle", "walk"], frames=[4, 8],
-                directions=None
-            )
+            args = render_args()
             result = ap.step_render(args, "/usr/bin/blender")
             assert result is True
             cmd = mock_run.call_args[0][0]
@@ -91,12 +102,423 @@ class TestSteps:
             assert "--background" in cmd
             assert "archer" in cmd
 
+    def test_step_render_passes_keyframed(self):
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            args = render_args(keyframed=True)
+            assert ap.step_render(args, "/usr/bin/blender") is True
+            assert "--keyframed" in mock_run.call_args[0][0]
+
+    def test_step_render_passes_no_render_cache(self):
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            ap.step_render(render_args(), "/usr/bin/blender")
+            assert "--no-render-cache" not in mock_run.call_args[0][0]
+            ap.step_render(render_args(no_render_cache=True), "/usr/bin/blender")
+            assert "--no-render-cache" in mock_run.call_args[0][0]
+
     def test_step_render_returns_false_on_failure(self):
         with mock.patch("subprocess.run") as mock_run:
             mock_run.return_value = mock.Mock(returncode=1)
-            args = mock.Mock(
-                subject="test", type="unit", footprint=None,
-                animations=None, frames=None, directions=None
-            )
+            args = render_args(subject="test", animations=None, frames=None)
             result = ap.step_render(args, "/usr/bin/blender")
             assert result is False
+
+
+class TestBlueprintSubjects:
+    def test_loads_blueprints_skipping_schema(self, tmp_path):
+        (tmp_path / "schema.json").write_text("{}")
+        (tmp_path / "b.json").write_text(json.dumps({
+            "name": "clubman",
+            "animations": {"frame_counts": {"idle": 2, "walk": 4}},
+        }))
+        (tmp_path / "a.json").write_text(json.dumps({"name": "archer"}))
+        subjects = ap.load_blueprint_subjects(tmp_path)
+        assert [name for name, _ in subjects] == ["archer", "clubman"]
+        assert subjects[1][1]["animations"]["frame_counts"] == {"idle": 2, "walk": 4}
+
+    def test_repo_blueprints_include_archer(self):
+        names = [name for name, _ in ap.load_blueprint_subjects()]
+        assert "archer" in names
+
+
+class TestSubjectOptions:
+    def _args(self, **overrides):
+        base = dict(subjects=[], type="unit", animations=None, frames=None,
+                    mirror_symmetric=False)
+        base.update(overrides)
+        return ap.argparse.Namespace(**base)
+
+    def test_blueprint_frame_counts_used_by_default(self):
+        opts, error = ap.parse_subject_options(
+            self._args(), {"animations": {"frame_counts": {"idle": 2, "attack": 5}}})
+        assert error is None
+        assert opts.animations == ["idle", "attack"]
+        assert opts.frames == [2, 5]
+
+    def test_explicit_animations_pick_blueprint_counts(self):
+        opts, error = ap.parse_subject_options(
+            self._args(animations="attack"),
+            {"animations": {"frame_counts": {"idle": 2, "attack": 5}}})
+        assert error is None
+        assert opts.frames == [5]
+
+    def test_unit_defaults_without_blueprint(self):
+        opts, _ = ap.parse_subject_options(self._args())
+        assert opts.animations == ap.DEFAULT_UNIT_ANIMS
+        assert opts.frames == ap.DEFAULT_UNIT_FRAMES
+
+    def test_blueprint_declares_mirror_symmetric(self):
+        opts, _ = ap.parse_subject_options(self._args(),
+                                           {"mirror_symmetric": True})
+        assert opts.mirror_symmetric is True
+        opts, _ = ap.parse_subject_options(self._args())
+        assert opts.mirror_symmetric is False
+
+    def test_mismatch_reports_error(self):
+        _, error = ap.parse_subject_options(
+            self._args(animations="idle,walk", frames="4"))
+        assert error
+
+
+class TestMultiSubject:
+    def test_runs_every_subject_and_prints_table(self, capsys):
+        with mock.patch.object(ap, "step_manifest", return_value=True) as manifest, \
+                mock.patch.object(ap, "step_pack", return_value=True):
+            result = ap.main(["archer", "clubman", "--skip-render",
+                              "--skip-validate", "--cpu-jobs", "2"])
+        assert result == 0
+        subjects = sorted(c.args[0].subject for c in manifest.call_args_list)
+        assert subjects == ["archer", "clubman"]
+        out = capsys.readouterr().out
+        assert "Timing Summary" in out
+        assert "Manifest" in out
+
+    def test_failure_in_one_subject_fails_run(self):
+        def manifest(args):
+            return args.subject != "clubman"
+
+        with mock.patch.object(ap, "step_manifest", side_effect=manifest), \
+                mock.patch.object(ap, "step_pack", return_value=True):
+            result = ap.main(["archer", "clubman", "--skip-render",
+                              "--skip-validate"])
+        assert result == 1
+
+    def test_blender_jobs_caps_concurrent_renders(self):
+        lock = ap.threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_run(cmd, cwd=None):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            ap.time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return mock.Mock(returncode=0)
+
+        with mock.patch.object(ap, "find_blender", return_value="/usr/bin/blender"), \
+                mock.patch("subprocess.run", side_effect=fake_run), \
+                mock.patch.object(ap, "step_manifest", return_value=True):
+            result = ap.main(["a", "b", "c", "d", "--skip-pack",
+                              "--skip-validate", "--blender-jobs", "2"])
+        assert result == 0
+        assert state["peak"] <= 2
+
+    def test_render_timing_excludes_waiting_for_a_slot(self):
+        slots = threading.Semaphore(1)
+        slots.acquire()
+        threading.Timer(0.5, slots.release).start()
+
+        def fake_run(cmd, cwd=None):
+            time.sleep(0.05)
+            return mock.Mock(returncode=0)
+
+        args = render_args(shards=2, animations=["idle"], frames=[2])
+        with mock.patch("subprocess.run", side_effect=fake_run), \
+                mock.patch.object(ap, "missing_render_frames", return_value=[]):
+            result = ap.run_subject(args, [("Render", ap.step_render)],
+                                    "/usr/bin/blender", slots)
+        assert result["ok"]
+        assert result["total"] >= 0.5
+        # Two shards of ~0.05s each, run one after the other
+        assert 0.1 <= result["timings"]["Render"] < 0.4
+
+    def test_no_subjects_is_usage_error(self):
+        with pytest.raises(SystemExit):
+            ap.main([])
+
+
+class TestTimingTable:
+    def test_formats_rows_and_failures(self):
+        results = [
+            {"subject": "archer", "ok": True, "failed_step": None,
+             "timings": {"Render": 12.0, "Manifest": 1.5}, "total": 13.5},
+            {"subject": "clubman", "ok": False, "failed_step": "Render",
+             "timings": {"Render": 3.0}, "total": 3.0},
+        ]
+        table = ap.format_timing_table(results, ["Render", "Manifest"])
+        lines = table.splitlines()
+        assert "Subject" in lines[0] and "Total" in lines[0]
+        assert "12.0s" in lines[2] and "13.5s" in lines[2]
+        assert "FAILED (Render)" in lines[3]
+
+
+class TestShardedRender:
+    def _args(self, **overrides):
+        base = dict(animations=["idle"], frames=[2], directions=["s", "n"],
+                    shards=2)
+        base.update(overrides)
+        return render_args(**base)
+
+    def test_expected_frames_cover_every_job(self):
+        names = ap.expected_render_frames("archer", ["idle", "walk"], [2, 1],
+                                          ["s", "n"])
+        assert names == [
+            "archer_idle_s_01.png", "archer_idle_n_01.png",
+            "archer_idle_s_02.png", "archer_idle_n_02.png",
+            "archer_walk_s_01.png", "archer_walk_n_01.png",
+        ]
+
+    def test_expected_frames_default_to_all_directions(self):
+        names = ap.expected_render_frames("archer", ["idle"], [1])
+        assert len(names) == 8
+
+    def test_missing_render_frames(self, tmp_path):
+        (tmp_path / "archer_idle_s_01.png").write_bytes(b"")
+        missing = ap.missing_render_frames(tmp_path, "archer", ["idle"], [1],
+                                           ["s", "n"])
+        assert missing == ["archer_idle_n_01.png"]
+
+    def test_launches_one_blender_per_shard(self, tmp_path):
+        render_dir = tmp_path / "blender" / "renders" / "archer"
+        render_dir.mkdir(parents=True)
+        (tmp_path / "blender" / "render_isometric.py").write_text("")
+        for name in ap.expected_render_frames("archer", ["idle"], [2],
+                                              ["s", "n"]):
+            (render_dir / name).write_bytes(b"")
+        with mock.patch.object(ap, "PROJECT_ROOT", tmp_path), \
+                mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            assert ap.step_render(self._args(), "/usr/bin/blender") is True
+        shard_args = sorted(
+            c.args[0][c.args[0].index("--shard") + 1]
+            for c in mock_run.call_args_list
+        )
+        assert shard_args == ["0/2", "1/2"]
+
+    def test_fails_when_merged_set_incomplete(self, tmp_path):
+        (tmp_path / "blender" / "renders" / "archer").mkdir(parents=True)
+        (tmp_path / "blender" / "render_isometric.py").write_text("")
+        with mock.patch.object(ap, "PROJECT_ROOT", tmp_path), \
+                mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            assert ap.step_render(self._args(), "/usr/bin/blender") is False
+
+    def test_fails_when_a_shard_fails(self):
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.side_effect = [mock.Mock(returncode=0),
+                                    mock.Mock(returncode=1)]
+            assert ap.step_render(self._args(), "/usr/bin/blender") is False
+
+    def test_buildings_are_not_sharded(self):
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            args = self._args(type="building", footprint=2, animations=None,
+                              frames=None)
+            assert ap.step_render(args, "/usr/bin/blender") is True
+        mock_run.assert_called_once()
+        assert "--shard" not in mock_run.call_args[0][0]
+
+
+class TestMirrorSymmetric:
+    def test_rendered_directions_skip_mirrored(self):
+        assert ap.rendered_directions(None, True) == ["s", "sw", "w", "nw", "n"]
+        assert ap.rendered_directions(None, False) == ap.ALL_DIRECTIONS
+
+    def test_rendered_directions_keep_unpaired(self):
+        # "e" has no rendered source, so it must still be rendered
+        assert ap.rendered_directions(["s", "e"], True) == ["s", "e"]
+
+    def test_step_render_and_manifest_pass_flag(self):
+        args = render_args(mirror_symmetric=True)
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            ap.step_render(args, "/usr/bin/blender")
+            assert mock_run.call_count == 1
+            assert "--mirror-symmetric" in mock_run.call_args[0][0]
+            ap.step_manifest(args)
+            cmd = mock_run.call_args[0][0]
+            assert "--mirror-symmetric" in cmd
+            assert "--validate-mirror" not in cmd
+
+    def test_mirror_check_direction(self):
+        assert ap.mirror_check_direction(None) == "se"
+        assert ap.mirror_check_direction(["s", "w", "e"]) == "e"
+        assert ap.mirror_check_direction(["s", "e"]) is None
+
+    def test_validate_mirror_renders_a_real_reference(self):
+        args = render_args(mirror_symmetric=True, validate_mirror=True)
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            assert ap.step_render(args, "/usr/bin/blender") is True
+            main, check = [c[0][0] for c in mock_run.call_args_list]
+            assert "--mirror-symmetric" in main
+            assert "--mirror-symmetric" not in check
+            assert check[check.index("--directions") + 1:] == ["se"]
+            assert check[check.index("--animations") + 1] == "idle,walk"
+            ap.step_manifest(args)
+            cmd = mock_run.call_args[0][0]
+        assert "--validate-mirror" in cmd
+        assert cmd[cmd.index("--mirror-reference") + 1] == "se"
+
+    def test_failed_render_skips_reference(self):
+        args = render_args(mirror_symmetric=True, validate_mirror=True)
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=1)
+            assert ap.step_render(args, "/usr/bin/blender") is False
+            assert mock_run.call_count == 1
+
+
+class TestLods:
+    def test_step_manifest_passes_lods(self):
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            ap.step_manifest(render_args(lods="64,32"))
+            cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("--lods") + 1] == "64,32"
+
+
+class TestRenderProfile:
+    def test_step_render_passes_profile(self):
+        with mock.patch("subprocess.run") as mock_run:
+            mock_run.return_value = mock.Mock(returncode=0)
+            ap.step_render(render_args(profile="preview"), "/usr/bin/blender")
+            cmd = mock_run.call_args[0][0]
+        assert cmd[cmd.index("--profile") + 1] == "preview"
+
+    def test_rejects_unknown_profile(self):
+        with pytest.raises(SystemExit):
+            ap.main(["archer", "--profile", "ultra"])
+
+
+FAKE_SERVER = '''#!{python}
+import json, os, sys, time
+PREFIX = "@@ROR_RENDER "
+log = open({log!r}, "a")
+print("Blender 4.2 (fake) starting", flush=True)
+print(PREFIX + json.dumps({{"ready": True, "pid": os.getpid()}}), flush=True)
+for line in sys.stdin:
+    job = json.loads(line)
+    if job.get("command") == "shutdown":
+        print(PREFIX + json.dumps({{"ok": True}}), flush=True)
+        break
+    log.write(json.dumps([os.getpid()] + job["argv"]) + "\\n")
+    log.flush()
+    if "slow" in job["argv"]:
+        time.sleep(0.3)
+    if "crash" in job["argv"]:
+        sys.exit(3)
+    print("Fra:1 rendering", flush=True)
+    ok = "fail" not in job["argv"]
+    reply = {{"id": job["id"], "ok": ok}} if ok else {{"id": job["id"], "ok": False, "error": "boom"}}
+    print(PREFIX + json.dumps(reply), flush=True)
+'''
+
+
+@pytest.fixture
+def fake_blender(tmp_path):
+    """A stand-in for `blender ... render_isometric.py -- --server`."""
+    log = tmp_path / "jobs.log"
+    script = tmp_path / "fake_blender"
+    script.write_text(FAKE_SERVER.format(python=sys.executable, log=str(log)))
+    script.chmod(0o755)
+
+    def jobs():
+        if not log.exists():
+            return []
+        return [json.loads(line) for line in log.read_text().splitlines()]
+
+    return str(script), jobs
+
+
+class TestRenderServerPool:
+    def test_worker_runs_jobs_and_shuts_down(self, fake_blender):
+        blender, jobs = fake_blender
+        worker = ap.BlenderWorker(blender)
+        assert worker.run(["archer", "--type", "unit"]) is True
+        assert worker.run(["archer", "fail"]) is False
+        worker.close()
+        assert not worker.alive
+        assert [j[1:] for j in jobs()] == [["archer", "--type", "unit"],
+                                           ["archer", "fail"]]
+
+    def test_pool_reuses_workers(self, fake_blender):
+        blender, jobs = fake_blender
+        pool = ap.BlenderWorkerPool(blender, size=2)
+        try:
+            for i in range(5):
+                assert pool.run([f"unit{i}"]) is True
+        finally:
+            pool.close()
+        pids = {j[0] for j in jobs()}
+        assert len(jobs()) == 5
+        assert len(pids) == 1  # serial jobs reuse the same idle worker
+
+    def test_pool_caps_workers_under_concurrency(self, fake_blender):
+        blender, jobs = fake_blender
+        pool = ap.BlenderWorkerPool(blender, size=2)
+        try:
+            with ap.ThreadPoolExecutor(max_workers=6) as ex:
+                results = list(ex.map(pool.run, [[f"u{i}"] for i in range(12)]))
+        finally:
+            pool.close()
+        assert all(results)
+        assert len({j[0] for j in jobs()}) <= 2
+
+    def test_pool_replaces_crashed_worker(self, fake_blender):
+        blender, jobs = fake_blender
+        pool = ap.BlenderWorkerPool(blender, size=1)
+        try:
+            assert pool.run(["crash"]) is False
+            assert pool.run(["archer"]) is True
+        finally:
+            pool.close()
+        pids = [j[0] for j in jobs()]
+        assert pids[0] != pids[1]
+
+    def test_waiter_gets_replacement_when_worker_crashes(self, fake_blender):
+        blender, jobs = fake_blender
+        pool = ap.BlenderWorkerPool(blender, size=1)
+        results = {}
+
+        def run(key, argv):
+            results[key] = pool.run(argv)
+
+        try:
+            first = threading.Thread(target=run, args=("crash", ["slow", "crash"]), daemon=True)
+            first.start()
+            deadline = time.monotonic() + 10
+            while not jobs() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # The only worker is busy, so this job waits for it
+            second = threading.Thread(target=run, args=("archer", ["archer"]), daemon=True)
+            second.start()
+            first.join(10)
+            second.join(10)
+            assert not second.is_alive()
+        finally:
+            pool.close()
+        assert results == {"crash": False, "archer": True}
+        pids = [j[0] for j in jobs()]
+        assert pids[0] != pids[1]
+
+    def test_step_render_sends_job_to_pool(self):
+        pool = mock.Mock(spec=ap.BlenderWorkerPool)
+        pool.run.return_value = True
+        with mock.patch("subprocess.run") as mock_run:
+            assert ap.step_render(render_args(), "/usr/bin/blender", pool) is True
+            mock_run.assert_not_called()
+        argv = pool.run.call_args[0][0]
+        assert argv[0] == "archer"
+        assert "--background" not in argv
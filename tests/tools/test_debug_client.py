@@ -0,0 +1,83 @@
+"""Tests for tools/debug_client.py — pooled keep-alive debug server client."""
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import debug_client as dc  # noqa: E402
+
+
+class TestKeepAlive:
+    def test_requests_reuse_one_connection(self, debug_stub):
+        with dc.DebugClient(debug_stub.url) as client:
+            for _ in range(5):
+                client.status()
+            client.screenshot()
+            client.command("select_all")
+        assert debug_stub.connections == 1
+        assert client.connections_opened == 1
+        assert len(debug_stub.requests) == 7
+
+    def test_close_only_server_still_works(self, debug_stub):
+        debug_stub.keep_alive = False
+        with dc.DebugClient(debug_stub.url) as client:
+            for _ in range(3):
+                assert client.status()["game_time"] == 1.0
+        assert debug_stub.connections == 3
+
+    def test_retries_when_idle_connection_was_dropped(self, debug_stub):
+        with dc.DebugClient(debug_stub.url) as client:
+            client.status()
+            # Server side closes the idle connection (e.g. keep-alive timeout)
+            client._idle[0].sock.shutdown(2)
+            assert client.status()["game_time"] == 1.0
+
+    def test_concurrent_requests_use_pool(self, debug_stub):
+        with dc.DebugClient(debug_stub.url, max_idle=2) as client:
+            with ThreadPoolExecutor(4) as pool:
+                results = list(pool.map(lambda _: client.perf(), range(20)))
+        assert all(r["fps"] == 60.0 for r in results)
+        assert debug_stub.connections == client.connections_opened <= 20
+
+
+class TestHelpers:
+    def test_entities_filters_and_unwraps(self, debug_stub):
+        debug_stub.entities = [{"name": "Villager1"}]
+        with dc.DebugClient(debug_stub.url) as client:
+            assert client.entities(owner=0, type=None) == [{"name": "Villager1"}]
+        assert debug_stub.requests[-1] == ("GET", "/entities?owner=0")
+
+    def test_screenshot_returns_bytes(self, debug_stub):
+        with dc.DebugClient(debug_stub.url) as client:
+            assert client.screenshot() == debug_stub.screenshot
+
+    def test_command_posts_action_and_fields(self, debug_stub):
+        with dc.DebugClient(debug_stub.url) as client:
+            reply = client.command("spawn", type="villager", x=5, y=6)
+        assert reply["status"] == "ok"
+        assert debug_stub.commands == [
+            {"action": "spawn", "type": "villager", "x": 5, "y": 6}
+        ]
+
+    def test_http_error_raises_with_status(self, debug_stub):
+        with dc.DebugClient(debug_stub.url) as client:
+            with pytest.raises(dc.DebugServerError) as exc:
+                client.get("/nope")
+            assert exc.value.status == 404
+            # The connection survives an error response
+            client.status()
+        assert debug_stub.connections == 1
+
+
+class TestPing:
+    def test_ping_live_server(self, debug_stub):
+        assert dc.DebugClient(debug_stub.url).ping() is True
+
+    def test_ping_missing_server(self):
+        assert dc.DebugClient("http://127.0.0.1:19999", timeout=1).ping() is False
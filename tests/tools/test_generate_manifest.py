@@ -0,0 +1,209 @@
+"""Tests for blender/generate_manifest.py — manifest generation from renders."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# generate_manifest imports without bpy; Pillow is loaded lazily
+BLENDER_DIR = Path(__file__).resolve().parent.parent.parent / "blender"
+sys.path.insert(0, str(BLENDER_DIR))
+
+import generate_manifest as gm
+
+try:
+    from PIL import Image as _PIL_Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+requires_pil = pytest.mark.skipif(not HAS_PIL, reason="Pillow not installed")
+
+
+def frame(subject, anim, direction, number, render_dir=Path("renders")):
+    """A scan_renders-style frame dict."""
+    name = f"{subject}_{anim}_{direction}_{number:02d}.png"
+    return {"filename": name, "animation": anim, "direction": direction,
+            "frame": number, "src_path": render_dir / name}
+
+
+def make_render(path, flip=False):
+    """An asymmetric 64x64 render: opaque red on the left half only."""
+    from PIL import Image
+
+    img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+    for y in range(64):
+        for x in range(32):
+            img.putpixel((x, y), (200, 30, 30, 255))
+    if flip:
+        img = img.transpose(Image.FLIP_LEFT_RIGHT)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(path, "PNG")
+
+
+class TestPlanMirroredFrames:
+    def test_plans_derived_frames_from_sources(self):
+        frames = [frame("knight", "idle", d, n)
+                  for d in ["s", "sw", "w", "nw", "n"] for n in (1, 2)]
+        rendered, mirrored = gm.plan_mirrored_frames(frames, "knight")
+        assert rendered == frames
+        assert len(mirrored) == 6
+        by_name = {f["filename"]: f for f in mirrored}
+        se = by_name["knight_idle_se_02.png"]
+        assert se["mirrored_from"] == "knight_idle_sw_02.png"
+        assert (se["animation"], se["direction"], se["frame"]) == ("idle", "se", 2)
+        assert se["src_path"] is None
+        assert se["render_path"] is None
+        assert {f["direction"] for f in mirrored} == set(gm.MIRROR_DIRECTIONS)
+
+    def test_real_renders_of_derived_directions_are_paired(self):
+        w1, e1 = frame("knight", "walk", "w", 1), frame("knight", "walk", "e", 1)
+        w2 = frame("knight", "walk", "w", 2)
+        rendered, mirrored = gm.plan_mirrored_frames([w1, w2, e1], "knight")
+        assert rendered == [w1, w2]
+        paths = {f["filename"]: f["render_path"] for f in mirrored}
+        assert paths == {"knight_walk_e_01.png": e1["src_path"],
+                         "knight_walk_e_02.png": None}
+
+    def test_pairing_matches_animation(self):
+        frames = [frame("knight", "idle", "w", 1), frame("knight", "walk", "e", 1)]
+        _, mirrored = gm.plan_mirrored_frames(frames, "knight")
+        assert [f["render_path"] for f in mirrored] == [None]
+
+    def test_directions_without_source_are_not_mirrored(self):
+        frames = [frame("knight", "idle", "s", 1), frame("knight", "idle", "n", 1)]
+        rendered, mirrored = gm.plan_mirrored_frames(frames, "knight")
+        assert rendered == frames
+        assert mirrored == []
+
+
+@requires_pil
+class TestMirrorDiff:
+    def test_flip_of_flip_matches(self, tmp_path):
+        make_render(tmp_path / "a.png")
+        img = _PIL_Image.open(tmp_path / "a.png")
+        assert gm.mirror_diff(gm.mirror_frame(gm.mirror_frame(img)), img) == 0.0
+
+    def test_mean_channel_difference(self):
+        black = _PIL_Image.new("RGBA", (4, 4), (0, 0, 0, 255))
+        white = _PIL_Image.new("RGBA", (4, 4), (255, 255, 255, 255))
+        # RGB differ fully, alpha not at all
+        assert gm.mirror_diff(black, white) == pytest.approx(0.75)
+
+
+@requires_pil
+class TestValidateMirror:
+    def _setup(self, tmp_path, monkeypatch, references=()):
+        """Render dir with idle sources and real renders of references."""
+        monkeypatch.setattr(gm, "PROJECT_ROOT", tmp_path)
+        render_dir = tmp_path / "renders"
+        for direction in ["s", "sw", "w", "nw", "n"]:
+            make_render(render_dir / f"knight_idle_{direction}_01.png")
+        for direction, flip in references:
+            make_render(render_dir / f"knight_idle_{direction}_01.png", flip=flip)
+        return ["knight", "--render-dir", str(render_dir),
+                "--output-dir", str(tmp_path / "out"),
+                "--mirror-symmetric", "--validate-mirror"]
+
+    def test_passes_against_matching_render(self, tmp_path, monkeypatch):
+        argv = self._setup(tmp_path, monkeypatch, [("e", True)])
+        assert gm.main(argv) == 0
+        manifest = json.loads((tmp_path / "out" / "manifest.json").read_text())
+        e = [s for s in manifest["sprites"] if s["direction"] == "e"]
+        assert e == [{"filename": "knight_idle_e_01.png", "animation": "idle",
+                      "direction": "e", "frame": 1,
+                      "mirrored_from": "knight_idle_w_01.png"}]
+
+    def test_fails_against_asymmetric_render(self, tmp_path, monkeypatch):
+        argv = self._setup(tmp_path, monkeypatch, [("e", False)])
+        assert gm.main(argv) == 1
+
+    def test_fails_without_reference(self, tmp_path, monkeypatch, capsys):
+        argv = self._setup(tmp_path, monkeypatch)
+        assert gm.main(argv) == 1
+        assert "no real renders" in capsys.readouterr().err
+        assert not (tmp_path / "out").exists()
+
+    def test_reference_ignores_other_leftover_renders(self, tmp_path, monkeypatch):
+        # A stale ne render that no longer matches, and a fresh e render
+        argv = self._setup(tmp_path, monkeypatch, [("e", True), ("ne", False)])
+        assert gm.main(argv) == 1
+        assert gm.main(argv + ["--mirror-reference", "e"]) == 0
+
+    def test_reference_without_its_render_fails(self, tmp_path, monkeypatch):
+        argv = self._setup(tmp_path, monkeypatch, [("e", True)])
+        assert gm.main(argv + ["--mirror-reference", "se"]) == 1
+
+
+class TestRenderProfile:
+    def _write(self, tmp_path, text):
+        (tmp_path / gm.RENDER_PROFILE_FILE).write_text(text)
+        return tmp_path
+
+    def test_missing_file(self, tmp_path):
+        assert gm.load_render_profile(tmp_path) is None
+
+    def test_reads_recorded_profile(self, tmp_path):
+        self._write(tmp_path, json.dumps({"profile": "preview", "engine": "X"}))
+        assert gm.load_render_profile(tmp_path) == "preview"
+
+    def test_unknown_profile_is_ignored(self, tmp_path, capsys):
+        self._write(tmp_path, json.dumps({"profile": "ultra"}))
+        assert gm.load_render_profile(tmp_path) is None
+        assert "unknown render profile 'ultra'" in capsys.readouterr().out
+
+    def test_unreadable_file_is_ignored(self, tmp_path, capsys):
+        self._write(tmp_path, "{not json")
+        assert gm.load_render_profile(tmp_path) is None
+        self._write(tmp_path, "[]")
+        assert gm.load_render_profile(tmp_path) is None
+        assert "unreadable" in capsys.readouterr().out
+
+    def test_manifest_stamps_profile(self):
+        frames = [frame("knight", "idle", "s", 1)]
+        assert gm.generate_manifest(frames, "knight", "draft")["render_profile"] == "draft"
+        assert "render_profile" not in gm.generate_manifest(frames, "knight")
+
+
+class TestLods:
+    def test_parse_sizes_largest_first(self):
+        assert gm.parse_lods("32,64") == [64, 32]
+        assert gm.parse_lods("64, 32,64,") == [64, 32]
+        assert gm.parse_lods("") == []
+
+    @pytest.mark.parametrize("value", ["64,abc", "0", "128", "-8", "64,200"])
+    def test_parse_rejects_bad_sizes(self, value):
+        with pytest.raises(argparse.ArgumentTypeError):
+            gm.parse_lods(value)
+
+    def test_manifest_lists_lod_sets(self):
+        manifest = gm.generate_manifest([frame("knight", "idle", "s", 1)], "knight",
+                                        lods=[64, 32])
+        assert manifest["lods"] == [{"canvas_size": [64, 64], "dir": "lod_64"},
+                                    {"canvas_size": [32, 32], "dir": "lod_32"}]
+        assert "lods" not in gm.generate_manifest([], "knight")
+
+    @requires_pil
+    def test_make_lod_frame_downscales_and_keeps_magenta(self, tmp_path):
+        src = tmp_path / "frame.png"
+        _PIL_Image.new("RGBA", gm.UNIT_CANVAS, (255, 0, 255, 255)).save(src)
+        dst = tmp_path / "lod_32" / "frame.png"
+        gm.make_lod_frame(src, dst, 32)
+        img = _PIL_Image.open(dst)
+        assert img.size == (32, 32)
+        assert img.getpixel((16, 16)) == (255, 0, 255, 255)
+
+    @requires_pil
+    def test_main_writes_each_lod_set(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(gm, "PROJECT_ROOT", tmp_path)
+        render_dir = tmp_path / "renders"
+        make_render(render_dir / "knight_idle_s_01.png")
+        out = tmp_path / "out"
+        assert gm.main(["knight", "--render-dir", str(render_dir),
+                        "--output-dir", str(out), "--lods", "64,32"]) == 0
+        for size in (64, 32):
+            lod = _PIL_Image.open(out / f"lod_{size}" / "knight_idle_s_01.png")
+            assert lod.size == (size, size)
@@ -0,0 +1,128 @@
+"""Tests for tools/pathfinding_grid.py — RLE pathfinding grids and diffs."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import pathfinding_grid as pg  # noqa: E402
+from debug_client import DebugClient  # noqa: E402
+
+
+def grid_from_rows(rows):
+    """Grid from strings of '#' (solid) and '.' (open)."""
+    cells = bytearray(1 if ch == "#" else 0 for row in rows for ch in row)
+    return pg.Grid(len(rows[0]), len(rows), cells)
+
+
+def pathfinding_route(stub, grid):
+    """Serve grid from the stub's /pathfinding in whichever format is asked."""
+    def route(query, body):
+        reply = {"map_size": grid.width}
+        if query.get("format") == "rle":
+            reply.update(format="rle", rows=grid.to_rle())
+        else:
+            reply["solid_cells"] = [{"x": i % grid.width, "y": i // grid.width}
+                                    for i, v in enumerate(grid.cells) if v]
+        if "unit" in query:
+            reply["unit_path"] = {"name": query["unit"], "waypoints": []}
+        return reply
+    stub.routes[("GET", "/pathfinding")] = route
+
+
+class TestRle:
+    @pytest.mark.parametrize("row, text", [
+        ([0, 0, 1, 1, 1, 0], "2,3,1"),
+        ([1, 1, 0, 1], "0,2,1,1"),
+        ([0] * 256, "256"),
+        ([1, 1], "0,2"),
+    ])
+    def test_round_trip(self, row, text):
+        assert pg.encode_rle_row(row) == text
+        assert pg.decode_rle_row(text, len(row)) == bytearray(row)
+
+    def test_wrong_width_is_rejected(self):
+        with pytest.raises(pg.GridFormatError):
+            pg.decode_rle_row("2,3", 6)
+
+    def test_bad_runs_are_rejected(self):
+        with pytest.raises(pg.GridFormatError):
+            pg.decode_rle_row("2,x", 3)
+
+
+class TestGrid:
+    ROWS = ["..#.", "####", "....", "#..#"]
+
+    def test_rle_and_cells_formats_agree(self):
+        grid = grid_from_rows(self.ROWS)
+        rle = pg.Grid.from_reply({"map_size": 4, "format": "rle", "rows": grid.to_rle()})
+        cells = pg.Grid.from_reply({"map_size": 4, "solid_cells": [
+            {"x": x, "y": y} for y in range(4) for x in range(4) if grid.is_solid(x, y)]})
+        assert rle == cells == grid
+        assert grid.solid_count() == 7
+        assert grid.is_solid(2, 0) and not grid.is_solid(0, 0)
+
+    def test_error_reply(self):
+        with pytest.raises(pg.GridFormatError, match="pathfinder not available"):
+            pg.Grid.from_reply({"error": "pathfinder not available"})
+
+    def test_snapshot_round_trip(self, tmp_path):
+        grid = grid_from_rows(self.ROWS)
+        pg.save_snapshot(grid, tmp_path / "snap.json")
+        assert pg.load_snapshot(tmp_path / "snap.json") == grid
+
+    def test_rle_is_compact_on_large_maps(self):
+        grid = pg.Grid(256, 256)
+        for y in range(0, 256, 2):
+            grid.cells[y * 256 + 10:y * 256 + 40] = b"\x01" * 30
+        snapshot = json.dumps(grid.to_snapshot())
+        cells = json.dumps([{"x": i % 256, "y": i // 256}
+                            for i, v in enumerate(grid.cells) if v])
+        assert len(snapshot) * 20 < len(cells)
+
+
+class TestDiff:
+    def test_added_and_removed_cells(self):
+        before = grid_from_rows(["....", ".##.", "...."])
+        after = grid_from_rows(["#...", ".#..", "...."])
+        changes = pg.diff(before, after)
+        assert changes.added == [(0, 0)]
+        assert changes.removed == [(2, 1)]
+
+    def test_identical_grids(self):
+        grid = grid_from_rows([".#", "#."])
+        assert pg.diff(grid, grid) == pg.GridDiff([], [])
+
+    def test_size_mismatch(self):
+        with pytest.raises(pg.GridFormatError):
+            pg.diff(pg.Grid(2, 2), pg.Grid(3, 3))
+
+
+class TestLive:
+    def test_fetch_requests_rle(self, debug_stub):
+        grid = grid_from_rows(["#.", ".."])
+        pathfinding_route(debug_stub, grid)
+        with DebugClient(debug_stub.url) as client:
+            fetched, reply = pg.fetch(client, unit="Villager1")
+        assert fetched == grid
+        assert reply["unit_path"]["name"] == "Villager1"
+        assert debug_stub.requests[-1] == ("GET", "/pathfinding?unit=Villager1&format=rle")
+
+    def test_main_save_then_diff_against_live(self, debug_stub, tmp_path, capsys):
+        pathfinding_route(debug_stub, grid_from_rows(["..", ".."]))
+        snap = tmp_path / "before.json"
+        assert pg.main(["--url", debug_stub.url, "fetch", "--save", str(snap)]) == 0
+        pathfinding_route(debug_stub, grid_from_rows(["..", ".#"]))
+        capsys.readouterr()
+        assert pg.main(["--url", debug_stub.url, "diff", str(snap), "--json"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"added": [[1, 1]], "removed": []}
+
+    def test_main_reports_missing_pathfinder(self, debug_stub):
+        debug_stub.routes[("GET", "/pathfinding")] = lambda q, b: {
+            "error": "pathfinder not available"}
+        assert pg.main(["--url", debug_stub.url, "fetch"]) == 1
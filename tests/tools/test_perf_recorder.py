@@ -0,0 +1,169 @@
+"""Tests for tools/perf_recorder.py — perf telemetry recording and summaries."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import perf_recorder as pr  # noqa: E402
+from debug_client import DebugClient  # noqa: E402
+
+PERF_COLUMNS = pr.columns_for(["perf"])
+
+
+def write_rows(path, rows, flush_every=pr.DEFAULT_FLUSH_ROWS):
+    with pr.RecordingWriter(path, PERF_COLUMNS, {"interval": 1.0}, flush_every) as w:
+        for row in rows:
+            w.append(row)
+
+
+def perf_rows(n, units=lambda i: i, frame=lambda i: 10.0 + i):
+    return [{"t": 1000.0 + i, "fps": 60.0, "frame_time_ms": frame(i),
+             "memory_static_bytes": 2**33 + i, "units": units(i)} for i in range(n)]
+
+
+class TestFileFormat:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        write_rows(path, perf_rows(5), flush_every=2)
+        rec = pr.read_recording(path)
+        assert len(rec) == 5
+        assert rec.header["interval"] == 1.0
+        assert list(rec.columns["units"]) == [0, 1, 2, 3, 4]
+        assert rec.columns["memory_static_bytes"][4] == 2**33 + 4
+        assert rec.columns["frame_time_ms"][2] == pytest.approx(12.0)
+        assert list(rec.columns["buildings"]) == [0] * 5
+
+    def test_appends_to_existing_file(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        write_rows(path, perf_rows(3))
+        write_rows(path, perf_rows(2))
+        assert list(pr.read_recording(path).columns["units"]) == [0, 1, 2, 0, 1]
+
+    def test_truncated_block_is_ignored(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        write_rows(path, perf_rows(4), flush_every=2)
+        path.write_bytes(path.read_bytes()[:-7])
+        assert len(pr.read_recording(path)) == 2
+
+    def test_mismatched_columns_refuse_to_append(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        write_rows(path, perf_rows(1))
+        with pytest.raises(pr.RecordingError):
+            pr.RecordingWriter(path, pr.columns_for(["perf", "status"]))
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        path.write_bytes(b"not a recording")
+        with pytest.raises(pr.RecordingError):
+            pr.read_recording(path)
+
+
+class TestStats:
+    def test_percentile_interpolates(self):
+        values = list(range(1, 101))
+        assert pr.percentile(values, 50) == pytest.approx(50.5)
+        assert pr.percentile(values, 99) == pytest.approx(99.01)
+        assert pr.percentile([7.0], 95) == 7.0
+
+    def test_regression_recovers_linear_scaling(self):
+        x = [10, 20, 30, 40]
+        fit = pr.regression(x, [2.0 + 0.5 * v for v in x])
+        assert fit["slope"] == pytest.approx(0.5)
+        assert fit["intercept"] == pytest.approx(2.0)
+        assert fit["r2"] == pytest.approx(1.0)
+
+    def test_regression_needs_varying_x(self):
+        assert pr.regression([5, 5, 5], [1.0, 2.0, 3.0]) is None
+
+    def test_summarize(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        write_rows(path, perf_rows(100, units=lambda i: 2 * i,
+                                   frame=lambda i: 4.0 + 0.25 * i))
+        summary = pr.summarize(pr.read_recording(path))
+        assert summary["samples"] == 100
+        assert summary["duration_s"] == pytest.approx(99.0)
+        assert summary["frame_time_ms"]["p95"] == pytest.approx(4.0 + 0.25 * 94.05)
+        assert summary["regression"]["slope"] == pytest.approx(0.125)
+        assert summary["units"] == {"min": 0, "max": 198}
+
+    def test_summarize_unknown_column(self, tmp_path):
+        path = tmp_path / "r.perfrec"
+        write_rows(path, perf_rows(2))
+        with pytest.raises(pr.RecordingError):
+            pr.summarize(pr.read_recording(path), x="nope")
+
+
+class TestDownsample:
+    def test_buckets_by_time(self, tmp_path):
+        src, dst = tmp_path / "r.perfrec", tmp_path / "d.perfrec"
+        write_rows(src, perf_rows(10))
+        assert pr.downsample(src, dst, every=4) == 3
+        rec = pr.read_recording(dst)
+        assert list(rec.columns["t"]) == [1000.0, 1004.0, 1008.0]
+        assert list(rec.columns["units"]) == [2, 6, 8]
+        assert list(rec.columns["frame_time_ms"]) == pytest.approx([11.5, 15.5, 18.5])
+        assert rec.header["interval"] == 4
+        assert rec.header["aggregate"] == "mean"
+
+    def test_max_keeps_spikes(self, tmp_path):
+        src, dst = tmp_path / "r.perfrec", tmp_path / "d.perfrec"
+        write_rows(src, perf_rows(4, frame=lambda i: 100.0 if i == 1 else 10.0))
+        pr.downsample(src, dst, every=4, agg="max")
+        assert list(pr.read_recording(dst).columns["frame_time_ms"]) == [100.0]
+
+    def test_rejects_unknown_aggregate(self, tmp_path):
+        with pytest.raises(ValueError):
+            pr.downsample(tmp_path / "a", tmp_path / "b", every=1, agg="median")
+
+
+class TestRecord:
+    def test_samples_perf_status_and_economy(self, debug_stub, tmp_path):
+        debug_stub.routes[("GET", "/perf")] = lambda q, b: {
+            "fps": 58.0, "frame_time_ms": 17.0, "entity_counts": {"unit": 42}}
+        debug_stub.routes[("GET", "/economy")] = lambda q, b: {
+            "total_villagers": 9, "player_resources": {"wood": 150}}
+        path = tmp_path / "r.perfrec"
+        with DebugClient(debug_stub.url) as client:
+            stats = pr.record(client, path, interval=0.01,
+                              sources=["perf", "status", "economy"], max_samples=3)
+        assert stats["samples"] == 3 and stats["errors"] == 0
+        rec = pr.read_recording(path)
+        assert rec.header["sources"] == ["perf", "status", "economy"]
+        assert list(rec.columns["units"]) == [42] * 3
+        assert list(rec.columns["game_time"]) == [1.0] * 3
+        assert list(rec.columns["villagers"]) == [9] * 3
+        assert list(rec.columns["wood"]) == [150] * 3
+        assert ("GET", "/economy?limit=0") in debug_stub.requests
+        assert debug_stub.connections == 1
+
+    def test_failed_samples_are_counted_not_written(self, debug_stub, tmp_path):
+        debug_stub.routes[("GET", "/perf")] = lambda q, b: (500, {"error": "boom"})
+        path = tmp_path / "r.perfrec"
+        with DebugClient(debug_stub.url) as client:
+            stats = pr.record(client, path, interval=0.01, duration=0.05)
+        assert stats["samples"] == 0
+        assert stats["errors"] >= 1
+        assert len(pr.read_recording(path)) == 0
+
+
+class TestMain:
+    def test_record_then_summary_json(self, debug_stub, tmp_path, capsys):
+        path = tmp_path / "r.perfrec"
+        assert pr.main(["record", str(path), "--url", debug_stub.url,
+                        "--interval", "0.01", "--samples", "4"]) == 0
+        capsys.readouterr()
+        assert pr.main(["summary", str(path), "--json"]) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["samples"] == 4
+        assert summary["frame_time_ms"]["p50"] == pytest.approx(16.6)
+        assert summary["regression"] is None
+
+    def test_record_without_server_fails(self, tmp_path):
+        assert pr.main(["record", str(tmp_path / "r.perfrec"),
+                        "--url", "http://127.0.0.1:19999", "--samples", "1"]) == 1
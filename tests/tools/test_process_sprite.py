@@ -370,3 +370,85 @@ class TestCLI:
         from PIL import Image
         result = Image.open(output)
         assert result.size == (384, 256)
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+@requires_pil
+class TestBatch:
+    def _setup(self, tmp_path):
+        src = tmp_path / "src"
+        make_png_with_content(src / "house_01.png", 400, 300)
+        make_png_with_content(src / "barracks_02.png", 400, 300)
+        config = tmp_path / "config.json"
+        data_dir = tmp_path / "data"
+        make_config(config)
+        make_building_data(data_dir, "house", [1, 1])
+        make_building_data(data_dir, "barracks", [3, 3])
+        return src, config, data_dir
+
+    def test_footprint_index(self, tmp_path):
+        _, _, data_dir = self._setup(tmp_path)
+        index = ps.load_footprint_index(data_dir)
+        assert index == {"barracks": (3, 3), "house": (1, 1)}
+        with pytest.raises(FileNotFoundError):
+            ps.indexed_footprint("castle", index, data_dir)
+
+    def test_directory_batch_writes_outputs_and_summary(self, tmp_path):
+        src, config, data_dir = self._setup(tmp_path)
+        out = tmp_path / "out"
+
+        exit_code = ps.main([
+            str(src), "--output", str(out), "--config", str(config),
+            "--data-dir", str(data_dir), "--jobs", "2",
+        ])
+
+        assert exit_code == 0
+        from PIL import Image
+        assert Image.open(out / "house.png").size == (128, 128)
+        assert Image.open(out / "barracks.png").size == (384, 256)
+        summary = json.loads((out / "process_summary.json").read_text())
+        assert summary["processed"] == 2
+        assert summary["failed"] == 0
+        assert {s["building"] for s in summary["sprites"]} == {"house", "barracks"}
+
+    def test_glob_batch_reports_missing_footprint(self, tmp_path):
+        src, config, data_dir = self._setup(tmp_path)
+        make_png_with_content(src / "castle_01.png", 100, 100)
+        summary_path = tmp_path / "summary.json"
+
+        exit_code = ps.main([
+            str(src / "*_0[12].png"), "--output", str(tmp_path / "out"),
+            "--config", str(config), "--data-dir", str(data_dir),
+            "--summary", str(summary_path), "--jobs", "1",
+        ])
+
+        assert exit_code == 1
+        summary = json.loads(summary_path.read_text())
+        assert summary["processed"] == 2
+        assert [Path(e["source"]).name for e in summary["errors"]] == ["castle_01.png"]
+
+    def test_variants_sharing_an_output_are_errors(self, tmp_path):
+        src, config, data_dir = self._setup(tmp_path)
+        make_png_with_content(src / "house_02.png", 200, 150)
+        out = tmp_path / "out"
+
+        exit_code = ps.main([
+            str(src), "--output", str(out), "--config", str(config),
+            "--data-dir", str(data_dir), "--jobs", "2",
+        ])
+
+        assert exit_code == 1
+        assert not (out / "house.png").exists()
+        summary = json.loads((out / "process_summary.json").read_text())
+        assert summary["processed"] == 1
+        assert sorted(Path(e["source"]).name for e in summary["errors"]) == [
+            "house_01.png", "house_02.png"]
+        assert "house.png" in summary["errors"][0]["error"]
+
+    def test_building_override_rejected_in_batch(self, tmp_path):
+        src, config, _ = self._setup(tmp_path)
+        assert ps.main([str(src), "--building", "house",
+                        "--config", str(config)]) == 1
@@ -0,0 +1,192 @@
+"""Tests for tools/scenario_bench.py — scenario perf benchmarks and baseline gate."""
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import scenario_bench as sb  # noqa: E402
+from debug_client import DebugClient  # noqa: E402
+from perf_recorder import read_recording  # noqa: E402
+
+# Stand-in for curl on PATH while ror runs steps, modelled on the mock in
+# test_scenario_assertions.sh. Every call is logged to $CURL_LOG.
+CURL_MOCK = r"""#!/usr/bin/env bash
+url="" data=""
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        -d) data="$2"; shift 2 ;;
+        -X|-H|-o) shift 2 ;;
+        http*) url="$1"; shift ;;
+        *) shift ;;
+    esac
+done
+echo "$url $data" >> "$CURL_LOG"
+if [[ "$url" == *"/status"* ]]; then
+    echo "${MOCK_STATUS_JSON:-{\}}"
+elif [[ "$url" == *"/entities"* ]]; then
+    echo '{"entities": []}'
+elif [[ "$url" == *"/command"* ]]; then
+    echo '{"status": "ok"}'
+else
+    echo "{}"
+fi
+"""
+
+
+@pytest.fixture
+def curl_mock(tmp_path, monkeypatch):
+    """Path of the log the mocked curl writes each request to."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    curl = bin_dir / "curl"
+    curl.write_text(CURL_MOCK)
+    curl.chmod(curl.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "curl.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("CURL_LOG", str(log))
+    monkeypatch.setenv("MOCK_STATUS_JSON",
+                       '{"game_time": 5.0, "player_resources": {"food": 200}}')
+    return log
+
+
+def write_scenario(tmp_path, text, name="bench"):
+    path = tmp_path / f"{name}.scenario"
+    path.write_text(text)
+    return path
+
+
+def frame_time_runner(stub, seconds=0.15):
+    """Runner for steps "load <ms>": sets the stub's frame time for a while."""
+    def run(step):
+        stub.routes[("GET", "/perf")] = lambda q, b: {
+            "fps": 60.0, "frame_time_ms": float(step.split()[1])}
+        time.sleep(seconds)
+        return True
+    return run
+
+
+def result_with(p95s, samples=10):
+    steps = [{"index": i, "step": f"sleep {i}", "samples": samples, "p95": p}
+             for i, p in enumerate(p95s)]
+    return {"steps": steps, "overall": {"samples": samples * len(p95s), "p95": max(p95s)}}
+
+
+class TestLoadSteps:
+    def test_strips_comments_and_splits_semicolons(self, tmp_path):
+        path = write_scenario(tmp_path, "# header\nspeed 5\n\n  sleep 1 ; status\n")
+        assert sb.load_steps(path) == ["speed 5", "sleep 1", "status"]
+
+    def test_bundled_scenarios_parse(self):
+        steps = sb.load_steps(sb.resolve_scenario("enemy_raid"))
+        assert steps[0] == "speed 5"
+        assert "assert-count --owner 1 == 0" in steps
+
+
+class TestBenchScenario:
+    def test_samples_are_attributed_to_steps(self, debug_stub, tmp_path):
+        path = write_scenario(tmp_path, "load 5\nload 40\n")
+        with DebugClient(debug_stub.url) as client:
+            result = sb.bench_scenario(client, path, interval=0.01,
+                                       runner=frame_time_runner(debug_stub))
+        first, second = result["steps"]
+        assert result["failed_step"] is None
+        assert first["samples"] >= 5 and second["samples"] >= 5
+        assert second["p50"] == 40.0
+        assert first["p50"] == 5.0
+        assert result["overall"]["max"] == 40.0
+
+    def test_stops_at_failing_step(self, debug_stub, tmp_path):
+        path = write_scenario(tmp_path, "ok\nfail\nnever\n")
+        with DebugClient(debug_stub.url) as client:
+            result = sb.bench_scenario(client, path, interval=0.01,
+                                       runner=lambda step: step != "fail")
+        assert result["failed_step"] == 1
+        assert [s["step"] for s in result["steps"]] == ["ok", "fail"]
+
+    def test_runs_steps_through_ror(self, debug_stub, tmp_path, curl_mock):
+        path = write_scenario(tmp_path, "spawn villager 3 4 0\nsleep 0.2\nassert food>=100\n")
+        with DebugClient(debug_stub.url) as client:
+            result = sb.bench_scenario(client, path, interval=0.02)
+        assert result["failed_step"] is None
+        log = curl_mock.read_text()
+        assert '"action": "spawn"' in log and '"grid_x": 3' in log
+        assert "/status" in log
+        assert result["steps"][1]["samples"] >= 5
+
+    def test_failed_ror_assertion_fails_scenario(self, debug_stub, tmp_path, curl_mock):
+        path = write_scenario(tmp_path, "assert food>=999\nstatus\n")
+        with DebugClient(debug_stub.url) as client:
+            result = sb.bench_scenario(client, path, interval=0.02)
+        assert result["failed_step"] == 0
+
+
+class TestCompare:
+    def test_within_threshold_passes(self):
+        assert sb.compare(result_with([10.0, 20.0]), result_with([9.5, 18.0])) == []
+
+    def test_p95_regression_is_reported(self):
+        regressions = sb.compare(result_with([10.0, 30.0]), result_with([10.0, 20.0]))
+        assert len(regressions) == 2
+        assert regressions[0].startswith("step 2 'sleep 1': p95 30.00ms > 23.00ms")
+        assert regressions[1].startswith("overall")
+
+    def test_absolute_slack_covers_small_steps(self):
+        # +50% but only +0.5ms: within min_delta_ms
+        assert sb.compare(result_with([1.5]), result_with([1.0]),
+                          min_delta_ms=1.0) == []
+
+    def test_steps_with_few_samples_are_not_gated(self):
+        assert sb.compare(result_with([50.0], samples=2), result_with([10.0], samples=2)) == []
+
+    def test_changed_steps_are_not_gated(self):
+        current = result_with([50.0])
+        current["steps"][0]["step"] = "something else"
+        current["overall"]["p95"] = 10.0
+        assert sb.compare(current, result_with([10.0])) == []
+
+
+class TestMain:
+    def test_update_then_gate_on_baseline(self, debug_stub, tmp_path, monkeypatch):
+        path = write_scenario(tmp_path, "load 10\nload 20\n")
+        baseline = tmp_path / "baseline.json"
+        runner = frame_time_runner(debug_stub)
+        monkeypatch.setattr(sb, "run_step", runner)
+        args = [str(path), "--url", debug_stub.url, "--baseline", str(baseline),
+                "--interval", "0.01", "--no-reset"]
+
+        def bench(extra=()):
+            runner("load 10")  # samples before step 1 starts see 10ms too
+            return sb.main(args + list(extra))
+
+        assert bench(["--update-baseline"]) == 0
+        saved = json.loads(baseline.read_text())
+        assert saved["scenarios"]["bench"]["steps"][1]["p95"] == 20.0
+
+        assert bench() == 0
+        saved["scenarios"]["bench"]["steps"][1]["p95"] = 5.0
+        baseline.write_text(json.dumps(saved))
+        assert bench() == 1
+
+    def test_record_writes_step_column(self, debug_stub, tmp_path, monkeypatch):
+        path = write_scenario(tmp_path, "load 10\n")
+        monkeypatch.setattr(sb, "run_step", frame_time_runner(debug_stub, seconds=0.05))
+        assert sb.main([str(path), "--url", debug_stub.url, "--interval", "0.01",
+                        "--baseline", str(tmp_path / "none.json"),
+                        "--record", str(tmp_path / "rec")]) == 0
+        rec = read_recording(tmp_path / "rec" / "bench.perfrec")
+        assert set(rec.columns["step"]) <= {-1, 0}
+        assert rec.header["scenario"] == "bench"
+        assert ("POST", "/command") in debug_stub.requests
+
+    def test_missing_scenario(self, tmp_path):
+        assert sb.main([str(tmp_path / "nope.scenario")]) == 1
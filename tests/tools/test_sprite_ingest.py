@@ -0,0 +1,142 @@
+"""Tests for tools/sprite_ingest.py — declarative spritesheet ingest."""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import sprite_ingest as si
+
+try:
+    from PIL import Image as _PIL_Image
+    from PIL import ImageDraw as _PIL_ImageDraw
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+requires_pil = pytest.mark.skipif(not HAS_PIL, reason="Pillow not installed")
+
+
+def make_sheet(path, size=(200, 100), grid=(2, 1)):
+    """Light-grey sheet with one dark blob per cell, offset per cell."""
+    img = _PIL_Image.new("RGB", size, (244, 244, 243))
+    draw = _PIL_ImageDraw.Draw(img)
+    cols, rows = grid
+    cw, ch = size[0] // cols, size[1] // rows
+    for i in range(cols * rows):
+        x0, y0 = (i % cols) * cw, (i // cols) * ch
+        draw.rectangle([x0 + 10 + i * 5, y0 + 20, x0 + 40 + i * 5, y0 + 70],
+                       fill=(60, 40, 20))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    img.save(path)
+
+
+def make_spec(tmp_path, with_sheet=True, **overrides):
+    """Write a goat ingest spec (and its source sheet, which needs Pillow)."""
+    spec = {
+        "unit": "goat",
+        "source_dir": str(tmp_path / "source"),
+        "output_dir": str(tmp_path / "out"),
+        "canvas_size": [64, 64],
+        "background": {"mode": "uniform", "min_value": 235, "max_spread": 6},
+        "sheets": {"walk": {"file": "walk.png", "grid": [2, 1]}},
+        "frames": [
+            {"sheet": "walk", "cell": 0, "animation": "walk", "direction": "w",
+             "frame": 1},
+            {"sheet": "walk", "cell": 1, "animation": "walk", "direction": "w",
+             "frame": 2},
+            {"sheet": "walk", "cell": 0, "animation": ["idle", "walk"],
+             "direction": "s"},
+        ],
+        "mirrors": {"e": "w"},
+    }
+    spec.update(overrides)
+    path = tmp_path / "goat.json"
+    path.write_text(json.dumps(spec))
+    if with_sheet:
+        make_sheet(tmp_path / "source" / "walk.png")
+    return path
+
+
+class TestCellBox:
+    def test_two_by_two_matches_half_split(self):
+        size = (101, 51)
+        assert [si.cell_box(size, (2, 2), c) for c in range(4)] == [
+            (0, 0, 50, 25), (50, 0, 101, 25),
+            (0, 25, 50, 51), (50, 25, 101, 51),
+        ]
+
+
+class TestPlanFrames:
+    def test_expands_animation_lists_and_mirrors(self, tmp_path):
+        spec = si.load_spec(make_spec(tmp_path, with_sheet=False))
+        frames, mirrored = si.plan_frames(spec)
+        names = sorted(f["filename"] for f in frames)
+        assert names == ["goat_idle_s_01.png", "goat_walk_s_01.png",
+                         "goat_walk_w_01.png", "goat_walk_w_02.png"]
+        assert sorted((f["filename"], f["mirrored_from"]) for f in mirrored) == [
+            ("goat_walk_e_01.png", "goat_walk_w_01.png"),
+            ("goat_walk_e_02.png", "goat_walk_w_02.png"),
+        ]
+
+    def test_explicit_frame_wins_over_mirror(self, tmp_path):
+        path = make_spec(tmp_path, with_sheet=False)
+        spec = json.loads(path.read_text())
+        spec["frames"].append({"sheet": "walk", "cell": 1, "animation": "walk",
+                               "direction": "e"})
+        path.write_text(json.dumps(spec))
+        _, mirrored = si.plan_frames(si.load_spec(path))
+        assert [f["filename"] for f in mirrored] == ["goat_walk_e_02.png"]
+
+
+class TestLoadSpec:
+    def test_rejects_cell_outside_grid(self, tmp_path):
+        path = make_spec(tmp_path, with_sheet=False)
+        spec = json.loads(path.read_text())
+        spec["frames"][0]["cell"] = 2
+        path.write_text(json.dumps(spec))
+        with pytest.raises(si.IngestSpecError):
+            si.load_spec(path)
+
+    def test_rejects_unknown_background_mode(self, tmp_path):
+        with pytest.raises(si.IngestSpecError):
+            si.load_spec(make_spec(tmp_path, with_sheet=False,
+                                   background={"mode": "magic"}))
+
+
+class TestIngest:
+    @requires_pil
+    def test_writes_frames_mirrors_and_manifest(self, tmp_path):
+        assert si.main(["--spec", str(make_spec(tmp_path)), "--jobs", "2"]) == 0
+        out = tmp_path / "out"
+        manifest = json.loads((out / "manifest.json").read_text())
+        assert manifest["canvas_size"] == [64, 64]
+        assert manifest["animations"] == ["idle", "walk"]
+        assert manifest["directions"] == ["s", "e", "w"]
+        assert len(manifest["sprites"]) == 6
+
+        west = _PIL_Image.open(out / "goat_walk_w_01.png")
+        east = _PIL_Image.open(out / "goat_walk_e_01.png")
+        assert west.size == (64, 64)
+        assert west.getpixel((0, 0))[3] == 0
+        assert east.tobytes() == west.transpose(_PIL_Image.FLIP_LEFT_RIGHT).tobytes()
+
+    def test_missing_sheet_fails(self, tmp_path):
+        path = make_spec(tmp_path, with_sheet=False)
+        assert si.main(["--spec", str(path)]) == 1
+
+    @requires_pil
+    def test_dry_run_writes_nothing(self, tmp_path):
+        assert si.main(["--spec", str(make_spec(tmp_path)), "--dry-run"]) == 0
+        assert not (tmp_path / "out").exists()
+
+    def test_bundled_sheep_spec_is_valid(self):
+        spec = si.load_spec(si.SPECS_DIR / "sheep.json")
+        frames, mirrored = si.plan_frames(spec)
+        assert len(frames) + len(mirrored) == 40
@@ -0,0 +1,175 @@
+"""Tests for tools/sprite_masks.py — array-based background removal."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+import sprite_masks as sm
+
+try:
+    from PIL import Image as _PIL_Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+requires_pil = pytest.mark.skipif(not HAS_PIL, reason="Pillow not installed")
+
+
+def mask_points(mask):
+    """Set of (x, y) pixels set in a mask."""
+    w = mask.width
+    return {(i % w, i // w) for i, v in enumerate(mask.tobytes()) if v}
+
+
+def ring_image():
+    """7x7 light background with a dark ring enclosing a light centre."""
+    img = _PIL_Image.new("RGBA", (7, 7), (240, 240, 240, 255))
+    for x in range(2, 5):
+        for y in range(2, 5):
+            img.putpixel((x, y), (30, 30, 30, 255))
+    img.putpixel((3, 3), (240, 240, 240, 255))
+    return img
+
+
+@requires_pil
+class TestMasks:
+    def test_color_key_within_tolerance(self):
+        img = _PIL_Image.new("RGBA", (3, 1))
+        img.putdata([(100, 100, 100, 255), (110, 90, 100, 0),
+                     (111, 100, 100, 255)])
+        mask = sm.color_key_mask(img, (100, 100, 100), 10)
+        assert mask_points(mask) == {(0, 0), (1, 0)}
+
+    def test_uniform_mask_spread_and_min(self):
+        img = _PIL_Image.new("RGBA", (3, 1))
+        img.putdata([(240, 242, 238, 255), (240, 250, 230, 255),
+                     (100, 100, 100, 255)])
+        assert mask_points(sm.uniform_mask(img, 235, 6)) == {(0, 0)}
+        assert mask_points(sm.uniform_mask(img, 0, 6)) == {(0, 0), (2, 0)}
+
+    def test_and_or(self):
+        a = _PIL_Image.new("L", (2, 1))
+        a.putdata([255, 0])
+        b = _PIL_Image.new("L", (2, 1))
+        b.putdata([255, 255])
+        assert mask_points(sm.mask_and(a, b)) == {(0, 0)}
+        assert mask_points(sm.mask_or(a, b)) == {(0, 0), (1, 0)}
+
+    def test_corner_color_majority(self):
+        img = _PIL_Image.new("RGBA", (4, 4), (9, 9, 9, 255))
+        img.putpixel((0, 0), (1, 2, 3, 255))
+        assert sm.corner_color(img) == (9, 9, 9, 255)
+
+
+@requires_pil
+class TestFloodFill:
+    def test_fill_stops_at_enclosed_region(self):
+        img = ring_image()
+        light = sm.uniform_mask(img, 200, 10)
+        region = mask_points(sm.flood_fill(light, sm.corner_seeds(img)))
+        assert (0, 0) in region
+        assert (3, 3) not in region
+        assert len(region) == 49 - 9
+
+    def test_seed_outside_mask_is_ignored(self):
+        img = ring_image()
+        light = sm.uniform_mask(img, 200, 10)
+        assert not mask_points(sm.flood_fill(light, [(2, 2)]))
+
+    def test_fill_does_not_wrap_rows(self):
+        mask = _PIL_Image.new("L", (3, 2), 0)
+        mask.putpixel((2, 0), 255)
+        mask.putpixel((0, 1), 255)
+        assert mask_points(sm.flood_fill(mask, [(2, 0)])) == {(2, 0)}
+
+    def test_fill_follows_spiral_back_upwards(self):
+        rows = [
+            "#####",
+            "....#",
+            "###.#",
+            "#...#",
+            "#####",
+        ]
+        mask = _PIL_Image.new("L", (5, 5), 0)
+        for y, row in enumerate(rows):
+            for x, ch in enumerate(row):
+                if ch == "#":
+                    mask.putpixel((x, y), 255)
+        region = mask_points(sm.flood_fill(mask, [(0, 0)]))
+        assert region == mask_points(mask)
+
+    def test_any_nonzero_mask_value_is_filled(self):
+        mask = _PIL_Image.new("L", (3, 1), 1)
+        assert len(mask_points(sm.flood_fill(mask, [(0, 0)]))) == 3
+
+
+@requires_pil
+class TestClearPixels:
+    def test_clears_to_transparent_black(self):
+        img = ring_image()
+        sm.clear_pixels(img, sm.color_key_mask(img, (30, 30, 30), 0))
+        assert img.getpixel((2, 2)) == (0, 0, 0, 0)
+        assert img.getpixel((0, 0)) == (240, 240, 240, 255)
+
+    def test_keep_rgb_only_zeroes_alpha(self):
+        img = ring_image()
+        sm.clear_pixels(img, sm.color_key_mask(img, (30, 30, 30), 0),
+                        keep_rgb=True)
+        assert img.getpixel((2, 2)) == (30, 30, 30, 0)
+
+
+def mask_from_rows(rows):
+    """Mask from strings of '#' (set) and '.' (clear)."""
+    mask = _PIL_Image.new("L", (len(rows[0]), len(rows)), 0)
+    for y, row in enumerate(rows):
+        for x, ch in enumerate(row):
+            if ch == "#":
+                mask.putpixel((x, y), 255)
+    return mask
+
+
+@requires_pil
+class TestComponentBboxes:
+    ROWS = [
+        "##..#",
+        ".#..#",
+        "..#..",
+        "##...",
+    ]
+
+    def test_four_connectivity(self):
+        boxes = sm.component_bboxes(mask_from_rows(self.ROWS))
+        assert boxes == [(0, 0, 2, 2), (4, 0, 5, 2), (2, 2, 3, 3),
+                         (0, 3, 2, 4)]
+
+    def test_eight_connectivity_joins_diagonals(self):
+        boxes = sm.component_bboxes(mask_from_rows(self.ROWS), connectivity=8)
+        assert boxes == [(0, 0, 3, 4), (4, 0, 5, 2)]
+
+    def test_u_shape_is_one_island(self):
+        rows = ["#.#", "#.#", "###"]
+        assert sm.component_bboxes(mask_from_rows(rows)) == [(0, 0, 3, 3)]
+
+    def test_rejects_bad_connectivity(self):
+        with pytest.raises(ValueError):
+            sm.component_bboxes(mask_from_rows(["#"]), connectivity=6)
+
+
+class TestMergeBboxes:
+    def test_merges_boxes_within_distance(self):
+        boxes = [(0, 0, 10, 10), (12, 2, 14, 8), (40, 40, 50, 50)]
+        assert sm.merge_bboxes(boxes, 2) == [(0, 0, 14, 10), (40, 40, 50, 50)]
+
+    def test_keeps_boxes_beyond_distance(self):
+        boxes = [(0, 0, 10, 10), (13, 0, 20, 10)]
+        assert sm.merge_bboxes(boxes, 2) == boxes
+
+    def test_merge_is_transitive(self):
+        boxes = [(0, 0, 2, 2), (10, 0, 12, 2), (4, 0, 8, 2)]
+        assert sm.merge_bboxes(boxes, 2) == [(0, 0, 12, 2)]
@@ -147,6 +147,112 @@ class TestBuildStrip:
         assert strip.height == 64 + ss.LABEL_HEIGHT
 
 
+@requires_pil
+class TestFrameCache:
+    def _frame(self, path, color=(1, 2, 3, 255), size=(4, 4)):
+        from PIL import Image
+
+        Image.new("RGBA", size, color).save(path, "PNG")
+        return path
+
+    def test_second_get_is_a_hit(self, tmp_path):
+        cache = ss.FrameCache()
+        path = self._frame(tmp_path / "a.png")
+        first = cache.get(path)
+        assert cache.get(path) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert ss.FrameCache().get(tmp_path / "missing.png") is None
+
+    def test_rewritten_file_is_decoded_again(self, tmp_path):
+        import os
+
+        cache = ss.FrameCache()
+        path = self._frame(tmp_path / "a.png", (10, 0, 0, 255))
+        assert cache.get(path).getpixel((0, 0)) == (10, 0, 0, 255)
+        self._frame(path, (20, 0, 0, 255))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert cache.get(path).getpixel((0, 0)) == (20, 0, 0, 255)
+
+    def test_evicts_least_recently_used_over_cap(self, tmp_path):
+        cache = ss.FrameCache(max_bytes=2 * 4 * 4 * 4)  # two 4x4 frames
+        a, b, c = (self._frame(tmp_path / f"{n}.png") for n in "abc")
+        cache.get(a)
+        cache.get(b)
+        cache.get(a)  # b is now least recently used
+        cache.get(c)
+        assert len(cache) == 2
+        assert cache.size_bytes == 2 * 4 * 4 * 4
+        misses = cache.misses
+        cache.get(a)
+        assert cache.misses == misses
+        cache.get(b)
+        assert cache.misses == misses + 1
+
+
+def pack_variant(variant_dir: Path) -> None:
+    """Pack a fake variant's frames into atlas sheets with the real packer."""
+    import spritesheet_packer
+
+    manifest = json.loads((variant_dir / "manifest.json").read_text())
+    atlas, _ = spritesheet_packer.pack_spritesheet(variant_dir, manifest, 1536, 1536)
+    spritesheet_packer.write_atlas_json(variant_dir, atlas)
+
+
+@requires_pil
+class TestAtlasFrames:
+    def test_reads_frames_from_atlas_sheets(self, tmp_path, monkeypatch):
+        variant_dir = make_variant(tmp_path, "test_unit", {"walk": {"s": 3, "n": 2}})
+        pack_variant(variant_dir)
+        for png in variant_dir.glob("test_unit_*.png"):
+            png.unlink()
+        monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "assets" / "sprites" / "units")
+        monkeypatch.setattr(ss, "OUTPUT_DIR", tmp_path / "output")
+        monkeypatch.setattr(ss, "frame_cache", ss.FrameCache())
+
+        outputs = ss.generate_gif("test_unit", "walk", "s")
+        assert ss.frame_cache.misses == 1  # the one atlas sheet
+
+        from PIL import Image
+
+        gif = Image.open(outputs[0])
+        assert gif.n_frames == 3
+        # Packed frames are the 48x48 source resized to the 64x64 canvas
+        assert gif.convert("RGBA").getpixel((0, 0)) != (40, 40, 40, 255)
+
+    def test_atlas_matches_individual_frames(self, tmp_path, monkeypatch):
+        variant_dir = make_variant(tmp_path, "test_unit", {"walk": {"s": 2}})
+        manifest = json.loads((variant_dir / "manifest.json").read_text())
+        from PIL import Image
+
+        for entry in manifest["sprites"]:
+            Image.new("RGBA", (64, 64), (entry["frame"] * 50, 9, 9, 255)).save(
+                variant_dir / entry["filename"]
+            )
+        pack_variant(variant_dir)
+        atlas_frames = ss.load_atlas_frames(variant_dir)
+        for entry in manifest["sprites"]:
+            from_atlas = ss.load_frame(variant_dir, entry, atlas_frames)
+            from_png = ss.load_frame(variant_dir, entry)
+            assert from_atlas.tobytes() == from_png.tobytes()
+
+    def test_unpacked_variant_has_no_atlas(self, tmp_path):
+        variant_dir = make_variant(tmp_path, "test_unit", {"walk": {"s": 1}})
+        assert ss.load_atlas_frames(variant_dir) is None
+
+    def test_no_atlas_flag_reads_pngs(self, tmp_path, monkeypatch):
+        variant_dir = make_variant(tmp_path, "test_unit", {"walk": {"s": 3}})
+        pack_variant(variant_dir)
+        monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "assets" / "sprites" / "units")
+        monkeypatch.setattr(ss, "OUTPUT_DIR", tmp_path / "output")
+        monkeypatch.setattr(ss, "frame_cache", ss.FrameCache())
+
+        assert ss.main(["test_unit", "walk", "s", "--no-atlas"]) == 0
+        assert ss.frame_cache.misses == 3
+
+
 @requires_pil
 class TestSaveGif:
     def test_creates_animated_gif(self, tmp_path):
@@ -266,6 +372,59 @@ class TestGenerateSheet:
         assert "test_unit_walk.png" in names
 
 
+@requires_pil
+class TestAnimationFormats:
+    @pytest.mark.parametrize("fmt", ["webp", "apng"])
+    def test_alpha_formats_keep_transparency(self, tmp_path, monkeypatch, fmt):
+        make_variant(tmp_path, "test_unit", {"walk": {"s": 3}})
+        monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "assets" / "sprites" / "units")
+        monkeypatch.setattr(ss, "OUTPUT_DIR", tmp_path / "output")
+
+        outputs = ss.generate_gif("test_unit", "walk", "s", fmt=fmt)
+        assert outputs == [tmp_path / "output" / f"test_unit_walk_s{ss.ANIMATION_FORMATS[fmt]}"]
+
+        from PIL import Image
+
+        anim = Image.open(outputs[0])
+        assert anim.n_frames == 3
+        anim.seek(1)
+        frame = anim.convert("RGBA")
+        assert frame.getpixel((0, 0))[3] == 0  # outside the 48x48 sprite
+        assert frame.getpixel((32, 32)) == (130, 150, 200, 255)
+
+
+def make_units(tmp_path: Path, monkeypatch) -> None:
+    make_variant(tmp_path, "unit_a", {"walk": {"s": 2}})
+    make_variant(tmp_path, "unit_b", {"idle": {"n": 2}, "walk": {"n": 2}})
+    (tmp_path / "assets" / "sprites" / "units" / "no_manifest").mkdir()
+    monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "assets" / "sprites" / "units")
+    monkeypatch.setattr(ss, "OUTPUT_DIR", tmp_path / "output")
+
+
+@requires_pil
+class TestRenderAll:
+    def test_find_variants_needs_manifest(self, tmp_path, monkeypatch):
+        make_units(tmp_path, monkeypatch)
+        assert ss.find_variants(ss.SPRITES_DIR) == ["unit_a", "unit_b"]
+
+    def test_all_renders_every_variant(self, tmp_path, monkeypatch):
+        make_units(tmp_path, monkeypatch)
+        assert ss.main(["--all", "--jobs", "2", "--format", "webp", "--speed", "100"]) == 0
+        names = sorted(p.name for p in (tmp_path / "output").iterdir())
+        assert names == ["unit_a_walk_s.webp", "unit_b_idle_n.webp",
+                         "unit_b_walk_n.webp"]
+
+    def test_all_rejects_variant(self, tmp_path, monkeypatch):
+        make_units(tmp_path, monkeypatch)
+        with pytest.raises(SystemExit):
+            ss.main(["unit_a", "--all"])
+
+    def test_all_with_no_variants_fails(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "missing")
+        monkeypatch.setattr(ss, "OUTPUT_DIR", tmp_path / "output")
+        assert ss.main(["--all", "--speed", "100"]) == 1
+
+
 @requires_pil
 class TestCLI:
     def test_invalid_variant(self, tmp_path, monkeypatch):
@@ -288,6 +447,19 @@ class TestCLI:
         assert ss.main(["test_unit", "walk", "s", "--png"]) == 0
         assert (tmp_path / "output" / "test_unit_walk_s.png").is_file()
 
+    def test_both_decodes_each_frame_once(self, tmp_path, monkeypatch):
+        make_variant(tmp_path, "test_unit", {"walk": {"s": 3, "n": 2}})
+        monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "assets" / "sprites" / "units")
+        monkeypatch.setattr(ss, "OUTPUT_DIR", tmp_path / "output")
+        monkeypatch.setattr(ss, "frame_cache", ss.FrameCache())
+
+        assert ss.main(["test_unit", "--both"]) == 0
+        assert (tmp_path / "output" / "test_unit_walk_s.gif").is_file()
+        assert (tmp_path / "output" / "test_unit_walk_n.gif").is_file()
+        assert (tmp_path / "output" / "test_unit_walk.png").is_file()
+        assert ss.frame_cache.misses == 5
+        assert ss.frame_cache.hits == 5
+
     def test_speed_flag(self, tmp_path, monkeypatch):
         make_variant(tmp_path, "test_unit", {"walk": {"s": 3}})
         monkeypatch.setattr(ss, "SPRITES_DIR", tmp_path / "assets" / "sprites" / "units")
@@ -254,3 +254,59 @@ class TestMain:
         assert result == 0
         assert (sprite_dir / "atlas.json").exists()
         assert (sprite_dir / "spritesheet_00.png").exists()
+
+
+# ---------------------------------------------------------------------------
+# Level-of-detail atlases
+# ---------------------------------------------------------------------------
+
+@requires_pil
+class TestLods:
+    def _make_lod_sprites(self, tmp_path, sizes=(64, 32)):
+        sprite_dir = tmp_path / "archer"
+        manifest, sprites = make_test_manifest(sprite_dir)
+        manifest["lods"] = [
+            {"canvas_size": [size, size], "dir": f"lod_{size}"}
+            for size in sizes
+        ]
+        with open(sprite_dir / "manifest.json", "w") as fp:
+            json.dump(manifest, fp)
+        for entry in sprites:
+            make_frame_png(sprite_dir / entry["filename"])
+            for size in sizes:
+                make_frame_png(sprite_dir / f"lod_{size}" / entry["filename"],
+                               size, size)
+        return sprite_dir, manifest
+
+    def test_packs_each_lod_at_its_canvas_size(self, tmp_path):
+        sprite_dir, manifest = self._make_lod_sprites(tmp_path)
+        lods = sp.pack_lods(sprite_dir, manifest, 1536, 1536)
+
+        assert [lod["canvas_size"] for lod in lods] == [[64, 64], [32, 32]]
+        frames = lods[1]["sheets"][0]["frames"]
+        assert len(frames) == len(manifest["sprites"])
+        assert all(f["w"] == 32 and f["h"] == 32 for f in frames)
+        from PIL import Image
+        with Image.open(sprite_dir / "spritesheet_lod32_00.png") as sheet:
+            assert sheet.size == (lods[1]["sheets"][0]["width"],
+                                  lods[1]["sheets"][0]["height"])
+
+    def test_main_writes_lods_section(self, tmp_path):
+        sprite_dir, _ = self._make_lod_sprites(tmp_path, sizes=(64,))
+        assert sp.main(["archer", "--sprite-dir", str(sprite_dir)]) == 0
+
+        atlas = json.loads((sprite_dir / "atlas.json").read_text())
+        assert atlas["canvas_size"] == [128, 128]
+        assert atlas["lods"][0]["dir"] == "lod_64"
+        assert atlas["lods"][0]["sheets"][0]["filename"] == \
+            "spritesheet_lod64_00.png"
+        assert (sprite_dir / "spritesheet_00.png").exists()
+
+    def test_no_lods_section_without_manifest_lods(self, tmp_path):
+        sprite_dir = tmp_path / "archer"
+        _, sprites = make_test_manifest(sprite_dir)
+        for entry in sprites:
+            make_frame_png(sprite_dir / entry["filename"])
+        assert sp.main(["archer", "--sprite-dir", str(sprite_dir)]) == 0
+        atlas = json.loads((sprite_dir / "atlas.json").read_text())
+        assert "lods" not in atlas
@@ -4,18 +4,39 @@
 Spawns a villager, issues movement commands, captures timed screenshots,
 crops around the unit, and stitches frames into a horizontal filmstrip.
 
+Frames are captured by an asyncio loop that schedules each one against a
+monotonic clock (so request latency does not stretch the cadence), fetches
+the screenshot and entity list concurrently, and crops in a worker thread.
+Each frame's actual capture time is written to walk_<dir>.json next to the
+filmstrip.
+
+--concurrent captures all 8 directions in one pass: 8 villagers are spawned
+around a centre, each is sent off in its own direction, and every frame's
+single screenshot is cropped once per villager using its screen position.
+
+By default each frame asks the server for just the region around each
+villager (/screenshot?entity=<name>&padding=80&format=raw), as raw RGBA8,
+so neither side encodes or decodes a full-viewport PNG. --full-frame
+downloads whole PNG screenshots and crops locally, for game builds without
+region screenshots.
+
 Requires: Pillow (PIL), running game with --debug-server on port 9222.
+Requests go through debug_client.DebugClient, which reuses keep-alive
+connections so per-frame screenshot/entity fetches skip TCP setup.
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
 import json
 import sys
 import time
-import urllib.error
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from debug_client import DebugClient, DebugServerError, Screenshot
+
 Image = None  # lazy import
 
 
@@ -60,76 +81,86 @@ DIRECTION_VECTORS: dict[str, tuple[int, int]] = {
 # Movement animations that make sense for live capture
 MOVEMENT_ANIMATIONS = ["walk"]
 
+# Pixels captured on each side of a villager
+CROP_PADDING = 80
+
+# Grid distance from the centre at which --concurrent spawns each villager,
+# on the side it will walk towards so the eight never cross
+CONCURRENT_SPREAD = 4
+
+
+_client: DebugClient | None = None
+
+
+def get_client() -> DebugClient:
+    """Shared keep-alive client for DEBUG_SERVER (recreated if it changes)."""
+    global _client
+    if _client is None or _client.base_url != DEBUG_SERVER:
+        if _client is not None:
+            _client.close()
+        _client = DebugClient(DEBUG_SERVER)
+    return _client
+
 
 def debug_get(endpoint: str) -> dict | bytes:
     """GET request to debug server, returning parsed JSON or raw bytes."""
-    url = f"{DEBUG_SERVER}{endpoint}"
-    req = urllib.request.Request(url)
-    with urllib.request.urlopen(req, timeout=5) as resp:
-        content_type = resp.headers.get("Content-Type", "")
-        data = resp.read()
-        if "json" in content_type:
-            return json.loads(data)
-        return data
+    return get_client().get(endpoint)
 
 
 def debug_post(endpoint: str, payload: dict) -> dict:
     """POST JSON to debug server."""
-    url = f"{DEBUG_SERVER}{endpoint}"
-    body = json.dumps(payload).encode()
-    req = urllib.request.Request(
-        url, data=body, headers={"Content-Type": "application/json"}
-    )
-    with urllib.request.urlopen(req, timeout=5) as resp:
-        return json.loads(resp.read())
+    return get_client().post(endpoint, payload)
 
 
 def ping_server() -> bool:
     """Check if the debug server is alive."""
-    try:
-        debug_get("/status")
-        return True
-    except (urllib.error.URLError, OSError):
-        return False
+    return get_client().ping()
 
 
 def spawn_villager(x: int = 50, y: int = 50) -> dict:
-    """Spawn a villager at the given position."""
-    return debug_post(
-        "/command",
-        {"action": "spawn", "type": "villager", "x": x, "y": y},
-    )
+    """Spawn a villager at the given grid position."""
+    return get_client().command("spawn", type="villager", grid_x=x, grid_y=y)
+
 
+def move_in_direction(
+    origin_x: int,
+    origin_y: int,
+    direction: str,
+    unit_ids: list[str] | None = None,
+) -> dict:
+    """Issue a right-click move command in the given direction.
 
-def move_in_direction(origin_x: int, origin_y: int, direction: str) -> dict:
-    """Issue a right-click move command in the given direction."""
+    Moves the selected units, or only the units named in unit_ids.
+    """
     dx, dy = DIRECTION_VECTORS[direction]
-    return debug_post(
-        "/command",
-        {
-            "action": "right_click",
-            "x": origin_x + dx,
-            "y": origin_y + dy,
-        },
-    )
+    fields = {"grid_x": origin_x + dx, "grid_y": origin_y + dy}
+    if unit_ids:
+        fields["unit_ids"] = unit_ids
+    return get_client().command("right-click", **fields)
+
+
+def get_camera() -> dict:
+    """Camera {"position", "zoom"} from /status, for mapping world to screen."""
+    status = get_client().status()
+    return {
+        "position": status.get("camera_position", {"x": 0.0, "y": 0.0}),
+        "zoom": status.get("camera_zoom", {"x": 1.0, "y": 1.0}),
+    }
 
 
 def capture_screenshot() -> bytes:
     """Capture a screenshot from the debug server as PNG bytes."""
-    return debug_get("/screenshot")
+    return get_client().screenshot()
 
 
 def get_entities() -> list[dict]:
     """Get all entities from the debug server."""
-    result = debug_get("/entities")
-    if isinstance(result, dict):
-        return result.get("entities", [])
-    return []
+    return get_client().entities()
 
 
 def reset_game() -> None:
     """Reset game state via debug server."""
-    debug_post("/command", {"action": "reset"})
+    get_client().command("reset")
 
 
 def load_frame_count(direction: str) -> int:
@@ -154,38 +185,91 @@ def load_frame_duration() -> float:
     return float(data.get("frame_duration", 0.3))
 
 
-def crop_around_entity(
-    screenshot_bytes: bytes, entities: list[dict], padding: int = 80
-) -> "Image.Image":
-    """Crop a screenshot around the first villager entity."""
+def world_to_screen(
+    position: dict, camera: dict, viewport: tuple[int, int]
+) -> tuple[float, float]:
+    """Screen pixel of a world position (mirrors debug_server._world_to_screen)."""
+    cam, zoom = camera["position"], camera["zoom"]
+    return (
+        (position["x"] - cam["x"]) * zoom["x"] + viewport[0] / 2,
+        (position["y"] - cam["y"]) * zoom["y"] + viewport[1] / 2,
+    )
+
+
+def entity_screen_pos(
+    ent: dict, camera: dict | None, viewport: tuple[int, int]
+) -> tuple[float, float] | None:
+    """Screen position of an /entities entry, or None if it cannot be placed."""
+    if "screen_x" in ent and "screen_y" in ent:
+        return ent["screen_x"], ent["screen_y"]
+    if camera is not None and "position" in ent:
+        return world_to_screen(ent["position"], camera, viewport)
+    return None
+
+
+def _decode_screenshot(screenshot_bytes: bytes) -> "Image.Image":
     _require_pil()
     import io
 
-    img = Image.open(io.BytesIO(screenshot_bytes)).convert("RGBA")
+    return Image.open(io.BytesIO(screenshot_bytes)).convert("RGBA")
 
-    # Find a villager entity
-    for ent in entities:
-        if "villager" in ent.get("type", "").lower():
-            screen_x = ent.get("screen_x", ent.get("x", img.width // 2))
-            screen_y = ent.get("screen_y", ent.get("y", img.height // 2))
-            left = max(0, int(screen_x) - padding)
-            top = max(0, int(screen_y) - padding)
-            right = min(img.width, int(screen_x) + padding)
-            bottom = min(img.height, int(screen_y) + padding)
-            return img.crop((left, top, right, bottom))
-
-    # Fallback: center crop
-    cx, cy = img.width // 2, img.height // 2
+
+def _crop_at(
+    img: "Image.Image", center: tuple[float, float] | None, padding: int
+) -> "Image.Image":
+    """Crop padding pixels around center (the image centre if None)."""
+    cx, cy = center if center is not None else (img.width // 2, img.height // 2)
     return img.crop(
         (
-            max(0, cx - padding),
-            max(0, cy - padding),
-            min(img.width, cx + padding),
-            min(img.height, cy + padding),
+            max(0, int(cx) - padding),
+            max(0, int(cy) - padding),
+            min(img.width, int(cx) + padding),
+            min(img.height, int(cy) + padding),
         )
     )
 
 
+def crop_around_entity(
+    screenshot_bytes: bytes,
+    entities: list[dict],
+    padding: int = CROP_PADDING,
+    camera: dict | None = None,
+) -> "Image.Image":
+    """Crop a screenshot around the first villager entity.
+
+    The villager is placed from screen_x/screen_y if the entry has them,
+    otherwise from its world position and camera (see get_camera). Falls
+    back to a centre crop.
+    """
+    img = _decode_screenshot(screenshot_bytes)
+    for ent in entities:
+        if "villager" in str(ent.get("unit_category", ent.get("type", ""))).lower():
+            return _crop_at(img, entity_screen_pos(ent, camera, img.size), padding)
+    return _crop_at(img, None, padding)
+
+
+def crop_entities(
+    screenshot_bytes: bytes,
+    entities: list[dict],
+    names: dict[str, str],
+    padding: int = CROP_PADDING,
+    camera: dict | None = None,
+) -> dict[str, "Image.Image"]:
+    """Crop one screenshot around several entities, decoding it once.
+
+    names maps entity name -> result key. An entity missing from the list
+    gets a centre crop, so every filmstrip keeps its frame count.
+    """
+    img = _decode_screenshot(screenshot_bytes)
+    by_name = {ent.get("name"): ent for ent in entities}
+    crops = {}
+    for name, key in names.items():
+        ent = by_name.get(name)
+        center = entity_screen_pos(ent, camera, img.size) if ent else None
+        crops[key] = _crop_at(img, center, padding)
+    return crops
+
+
 def stitch_filmstrip(frames: list["Image.Image"]) -> "Image.Image":
     """Stitch a list of cropped frame images into a horizontal filmstrip."""
     _require_pil()
@@ -205,10 +289,137 @@ def stitch_filmstrip(frames: list["Image.Image"]) -> "Image.Image":
     return filmstrip
 
 
+def fetch_region(client: DebugClient, name: str, padding: int) -> Screenshot | None:
+    """Raw region screenshot around a named entity, or None if it is gone."""
+    try:
+        return client.screenshot_region(entity=name, padding=padding)
+    except DebugServerError as e:
+        if e.status == 404:
+            return None
+        raise
+
+
+def screenshot_to_image(shot: Screenshot) -> "Image.Image":
+    """Decode a region screenshot (raw RGBA8 or PNG) to an RGBA image."""
+    if shot.format == "png":
+        return _decode_screenshot(shot.data)
+    _require_pil()
+    return Image.frombytes("RGBA", shot.region[2:], shot.data)
+
+
+def decode_regions(
+    keys: list[str], shots: list[Screenshot | None], padding: int
+) -> dict[str, "Image.Image"]:
+    """{key: image} for region screenshots; missing entities get a blank frame."""
+    _require_pil()
+    images = {}
+    for key, shot in zip(keys, shots):
+        if shot is None:
+            images[key] = Image.new("RGBA", (padding * 2, padding * 2), (0, 0, 0, 0))
+        else:
+            images[key] = screenshot_to_image(shot)
+    return images
+
+
+async def capture_frames(
+    num_frames: int,
+    frame_duration: float,
+    crop=None,
+    client: DebugClient | None = None,
+    regions: dict[str, str] | None = None,
+    padding: int = CROP_PADDING,
+) -> list[dict]:
+    """Capture num_frames frames, one every frame_duration seconds.
+
+    Frame i is requested at start + i * frame_duration on the monotonic
+    clock, whether or not earlier frames have arrived.
+
+    With regions (entity name -> key), each frame fetches a raw region
+    screenshot around every entity concurrently and its image is
+    {key: Image}. Otherwise the full screenshot and entity list are fetched
+    concurrently and the image is crop(screenshot, entities). Decoding and
+    cropping run in a worker thread. Returns one dict per frame, in order:
+    {"index", "scheduled", "captured", "received", "image"}, with times in
+    seconds from the start ("captured" is when the requests were sent).
+    """
+    crop = crop or crop_around_entity
+    client = client or get_client()
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="crop") as crop_pool:
+
+        async def grab(index: int, scheduled: float) -> dict:
+            captured = time.monotonic() - start
+            if regions:
+                shots = await asyncio.gather(*(
+                    asyncio.to_thread(fetch_region, client, name, padding)
+                    for name in regions
+                ))
+                received = time.monotonic() - start
+                image = await loop.run_in_executor(
+                    crop_pool, decode_regions, list(regions.values()), shots, padding
+                )
+            else:
+                screenshot_data, entities = await asyncio.gather(
+                    asyncio.to_thread(client.screenshot),
+                    asyncio.to_thread(client.entities),
+                )
+                received = time.monotonic() - start
+                image = await loop.run_in_executor(
+                    crop_pool, crop, screenshot_data, entities
+                )
+            return {
+                "index": index,
+                "scheduled": scheduled,
+                "captured": captured,
+                "received": received,
+                "image": image,
+            }
+
+        tasks = []
+        for i in range(num_frames):
+            scheduled = i * frame_duration
+            delay = start + scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(grab(i, scheduled)))
+        return list(await asyncio.gather(*tasks))
+
+
+def frame_timings(frames: list[dict], frame_duration: float) -> dict:
+    """JSON-ready capture timings (milliseconds) for a list of captured frames."""
+    return {
+        "frame_duration_ms": round(frame_duration * 1000, 3),
+        "frames": [
+            {
+                "index": f["index"],
+                "scheduled_ms": round(f["scheduled"] * 1000, 3),
+                "captured_ms": round(f["captured"] * 1000, 3),
+                "latency_ms": round((f["received"] - f["captured"]) * 1000, 3),
+            }
+            for f in frames
+        ],
+    }
+
+
+def save_filmstrip(direction: str, images: list["Image.Image"], timings: dict) -> Path:
+    """Stitch and write walk_<direction>.png plus its timings JSON."""
+    filmstrip = stitch_filmstrip(images)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = OUTPUT_DIR / f"walk_{direction}.png"
+    filmstrip.save(out_path, "PNG")
+    with open(out_path.with_suffix(".json"), "w") as f:
+        json.dump(timings, f, indent=2)
+        f.write("\n")
+    return out_path
+
+
 def capture_filmstrip(
     direction: str,
     spawn_x: int = 50,
     spawn_y: int = 50,
+    full_frame: bool = False,
 ) -> Path:
     """Capture a full filmstrip for a walk animation in one direction."""
     _require_pil()
@@ -216,32 +427,27 @@ def capture_filmstrip(
     num_frames = load_frame_count(direction)
 
     # Spawn and select
-    spawn_villager(spawn_x, spawn_y)
+    name = spawn_villager(spawn_x, spawn_y)["name"]
     time.sleep(0.5)
 
     # Select all units
-    debug_post("/command", {"action": "select_all"})
+    get_client().command("select-all")
     time.sleep(0.2)
 
     # Issue move command
     move_in_direction(spawn_x, spawn_y, direction)
     time.sleep(0.3)
 
-    # Capture frames
-    frames = []
-    for _ in range(num_frames):
-        screenshot_data = capture_screenshot()
-        entities = get_entities()
-        cropped = crop_around_entity(screenshot_data, entities)
-        frames.append(cropped)
-        time.sleep(frame_duration)
-
-    # Stitch
-    filmstrip = stitch_filmstrip(frames)
-
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    out_path = OUTPUT_DIR / f"walk_{direction}.png"
-    filmstrip.save(out_path, "PNG")
+    # Capture frames on a fixed cadence
+    if full_frame:
+        crop = functools.partial(crop_around_entity, camera=get_camera())
+        frames = asyncio.run(capture_frames(num_frames, frame_duration, crop))
+        images = [f["image"] for f in frames]
+    else:
+        frames = asyncio.run(capture_frames(
+            num_frames, frame_duration, regions={name: direction}))
+        images = [f["image"][direction] for f in frames]
+    out_path = save_filmstrip(direction, images, frame_timings(frames, frame_duration))
 
     # Reset for next capture
     reset_game()
@@ -250,6 +456,58 @@ def capture_filmstrip(
     return out_path
 
 
+def spread_origin(
+    center_x: int, center_y: int, direction: str, spread: int = CONCURRENT_SPREAD
+) -> tuple[int, int]:
+    """Spawn cell for a concurrent capture: spread cells out towards direction."""
+    dx, dy = DIRECTION_VECTORS[direction]
+    return (
+        center_x + spread * ((dx > 0) - (dx < 0)),
+        center_y + spread * ((dy > 0) - (dy < 0)),
+    )
+
+
+def capture_all_directions(
+    center_x: int = 50, center_y: int = 50, full_frame: bool = False
+) -> list[Path]:
+    """Capture walk filmstrips for all 8 directions from one screenshot stream."""
+    _require_pil()
+    frame_duration = load_frame_duration()
+    num_frames = max(load_frame_count(d) for d in ALL_DIRECTIONS)
+    client = get_client()
+
+    client.command("camera-to", grid_x=center_x, grid_y=center_y)
+    origins = {d: spread_origin(center_x, center_y, d) for d in ALL_DIRECTIONS}
+    names = {}
+    for d, (x, y) in origins.items():
+        names[spawn_villager(x, y)["name"]] = d
+    time.sleep(0.5)
+
+    # Send all eight villagers off at once
+    def move(item: tuple[str, str]) -> dict:
+        name, d = item
+        return move_in_direction(*origins[d], d, unit_ids=[name])
+
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        list(pool.map(move, names.items()))
+    time.sleep(0.3)
+
+    if full_frame:
+        crop = functools.partial(crop_entities, names=names, camera=get_camera())
+        frames = asyncio.run(capture_frames(num_frames, frame_duration, crop))
+    else:
+        frames = asyncio.run(capture_frames(num_frames, frame_duration, regions=names))
+    timings = frame_timings(frames, frame_duration)
+    outputs = [
+        save_filmstrip(d, [f["image"][d] for f in frames], timings)
+        for d in ALL_DIRECTIONS
+    ]
+
+    reset_game()
+    time.sleep(0.5)
+    return outputs
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Capture live animation filmstrips from the debug server.",
@@ -265,8 +523,22 @@ def main(argv: list[str] | None = None) -> int:
         nargs="?",
         help="Direction (e.g., s, ne). Omit for all 8 directions.",
     )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Capture all 8 directions at once with 8 villagers (omit direction)",
+    )
+    parser.add_argument(
+        "--full-frame",
+        action="store_true",
+        help="Download full-viewport PNGs and crop locally (no region screenshots)",
+    )
     args = parser.parse_args(argv)
 
+    if args.concurrent and args.direction:
+        print("Error: --concurrent captures all directions; omit direction", file=sys.stderr)
+        return 1
+
     if not ping_server():
         print(
             "Error: debug server not running. Start the game with --debug-server first.",
@@ -287,10 +559,16 @@ def main(argv: list[str] | None = None) -> int:
             print(f"Error: unknown direction '{d}'", file=sys.stderr)
             return 1
 
+    if args.concurrent:
+        print(f"Capturing {args.animation} in all directions...", file=sys.stderr)
+        for out_path in capture_all_directions(full_frame=args.full_frame):
+            print(out_path)
+        return 0
+
     outputs = []
     for d in directions:
         print(f"Capturing {args.animation} {d}...", file=sys.stderr)
-        out_path = capture_filmstrip(d)
+        out_path = capture_filmstrip(d, full_frame=args.full_frame)
         outputs.append(out_path)
         print(out_path)
 
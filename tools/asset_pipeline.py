@@ -4,29 +4,60 @@
 Chains: Blender render → manifest generation → spritesheet packing → validation.
 Supports both procedural (geometric) and imported (.blend/.fbx) models.
 
+Several subjects can be processed in one run. Their pipelines run
+concurrently, with separate caps on simultaneous Blender processes and on
+CPU post-processing (manifest + pack) workers. A unit's render can also be
+split into --shards background Blender processes, each rendering a disjoint
+slice of the (animation, frame, direction) job list; the merged frame set
+is verified before the manifest step. With --render-server, renders go to a
+pool of persistent Blender processes (render_isometric.py --server) that
+keep loaded models resident between jobs.
+
 Usage:
     python3 tools/asset_pipeline.py archer --type unit
     python3 tools/asset_pipeline.py archer --type unit --skip-render
     python3 tools/asset_pipeline.py archer --type unit --animations idle,walk --frames 4,8
     python3 tools/asset_pipeline.py house --type building --footprint 2
+    python3 tools/asset_pipeline.py archer clubman --blender-jobs 2
+    python3 tools/asset_pipeline.py --all-blueprints --blender-jobs 2 --cpu-jobs 4
+    python3 tools/asset_pipeline.py archer --type unit --shards 8
+    python3 tools/asset_pipeline.py archer --type unit --keyframed
+    python3 tools/asset_pipeline.py archer --type unit --mirror-symmetric
+    python3 tools/asset_pipeline.py --all-blueprints --render-server --blender-jobs 2
 """
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
+BLUEPRINTS_DIR = PROJECT_ROOT / "blender" / "blueprints"
 
 # Default animation config per unit type from asset_config.json
 DEFAULT_UNIT_ANIMS = ["idle", "walk", "attack", "death"]
 DEFAULT_UNIT_FRAMES = [4, 8, 6, 6]
 
+# All 8 render directions (render_isometric renders all of them for units)
+ALL_DIRECTIONS = ["s", "sw", "w", "nw", "n", "ne", "e", "se"]
+
+# Directions mirrored from another direction for symmetric units
+# (derived -> source); see render_isometric / generate_manifest
+MIRROR_DIRECTIONS = {"se": "sw", "e": "w", "ne": "nw"}
+
+# Render quality profiles defined in render_isometric.RENDER_PROFILES
+RENDER_PROFILES = ["preview", "draft", "final"]
+DEFAULT_RENDER_PROFILE = "final"
+
 
 def find_blender():
     """Find the Blender executable."""
@@ -57,8 +88,259 @@ def load_asset_config():
     return {}
 
 
-def step_render(args, blender_bin):
-    """Step 1: Render sprites via Blender."""
+def load_blueprint_subjects(blueprints_dir=None):
+    """Load unit subjects from blender/blueprints/*.json.
+
+    Returns list of (name, blueprint) tuples sorted by name, where
+    blueprint is the parsed blueprint dict. The JSON schema file is skipped.
+    """
+    blueprints_dir = Path(blueprints_dir or BLUEPRINTS_DIR)
+    subjects = []
+    for path in sorted(blueprints_dir.glob("*.json")):
+        if path.name == "schema.json":
+            continue
+        with open(path) as f:
+            blueprint = json.load(f)
+        subjects.append((blueprint.get("name", path.stem), blueprint))
+    subjects.sort(key=lambda s: s[0])
+    return subjects
+
+
+def expected_render_frames(subject, animations, frames, directions=None):
+    """List the frame filenames a full unit render should produce.
+
+    Naming matches render_isometric: {subject}_{anim}_{dir}_{NN}.png
+    """
+    directions = directions or ALL_DIRECTIONS
+    return [
+        f"{subject}_{anim}_{d}_{i:02d}.png"
+        for anim, n_frames in zip(animations, frames)
+        for i in range(1, n_frames + 1)
+        for d in directions
+    ]
+
+
+def missing_render_frames(render_dir, subject, animations, frames,
+                          directions=None):
+    """Return expected frame filenames not present in render_dir."""
+    render_dir = Path(render_dir)
+    return [
+        name for name in expected_render_frames(subject, animations, frames,
+                                                directions)
+        if not (render_dir / name).is_file()
+    ]
+
+
+def rendered_directions(directions=None, mirror_symmetric=False):
+    """Directions render_isometric actually renders for a unit.
+
+    Mirror-symmetric units skip each direction whose mirror source is
+    rendered (generate_manifest flips those frames instead).
+    """
+    directions = directions or ALL_DIRECTIONS
+    if not mirror_symmetric:
+        return list(directions)
+    return [d for d in directions if MIRROR_DIRECTIONS.get(d) not in directions]
+
+
+def mirror_check_direction(directions=None):
+    """Derived direction rendered for real to validate mirroring, or None.
+
+    The first derived direction whose mirror source is also rendered.
+    """
+    directions = directions or ALL_DIRECTIONS
+    for derived, source in MIRROR_DIRECTIONS.items():
+        if derived in directions and source in directions:
+            return derived
+    return None
+
+
+# Prefix of protocol lines written by render_isometric.py --server
+SERVER_REPLY_PREFIX = "@@ROR_RENDER "
+
+
+class BlenderWorker:
+    """A long-lived `render_isometric.py --server` Blender process.
+
+    Jobs are sent as JSON lines on stdin; Blender's own log output is
+    echoed with a worker tag until the prefixed reply line arrives.
+    """
+
+    def __init__(self, blender_bin, name="blender"):
+        self.name = name
+        render_script = PROJECT_ROOT / "blender" / "render_isometric.py"
+        self.proc = subprocess.Popen(
+            [blender_bin, "--background", "--python", str(render_script),
+             "--", "--server"],
+            cwd=str(PROJECT_ROOT), stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, text=True, bufsize=1,
+        )
+        self.jobs = 0
+        self._dead = False
+        ready = self._read_reply()
+        if not ready or not ready.get("ready"):
+            self.close()
+            raise RuntimeError(f"{name}: render server failed to start")
+
+    @property
+    def alive(self):
+        return not self._dead and self.proc.poll() is None
+
+    def _read_reply(self):
+        """Echo log lines until a reply arrives; None if the worker exited."""
+        for line in self.proc.stdout:
+            if line.startswith(SERVER_REPLY_PREFIX):
+                return json.loads(line[len(SERVER_REPLY_PREFIX):])
+            sys.stdout.write(f"  [{self.name}] {line}")
+        self._dead = True
+        return None
+
+    def run(self, argv):
+        """Run one render job (render_isometric CLI args); True on success."""
+        self.jobs += 1
+        job = {"id": self.jobs, "argv": list(argv)}
+        try:
+            self.proc.stdin.write(json.dumps(job) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self._dead = True
+            return False
+        reply = self._read_reply()
+        if reply is None:
+            print(f"Error: {self.name} exited during job", file=sys.stderr)
+            return False
+        if not reply.get("ok"):
+            print(f"Error: {self.name}: {reply.get('error')}", file=sys.stderr)
+            return False
+        return True
+
+    def close(self, timeout=30):
+        """Ask the server to exit, killing it if it does not."""
+        if self.proc.poll() is None:
+            try:
+                if not self._dead:
+                    self.proc.stdin.write(
+                        json.dumps({"command": "shutdown"}) + "\n")
+                self.proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+            try:
+                self.proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self._dead = True
+        if self.proc.stdout:
+            self.proc.stdout.close()
+
+
+class BlenderWorkerPool:
+    """Pool of up to `size` persistent Blender render servers.
+
+    Workers start lazily and are reused across jobs and subjects, so
+    Blender startup, addon loading and .blend loading are paid once per
+    worker instead of once per render step. A worker that dies is dropped
+    and replaced on the next job.
+    """
+
+    def __init__(self, blender_bin, size):
+        self.blender_bin = blender_bin
+        self.size = size
+        # Guards everything below; notified whenever a worker is returned
+        # or a slot frees up (a worker died or failed to start)
+        self._cond = threading.Condition()
+        self._idle = []
+        self._started = 0
+        self._workers = []
+
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and self._started >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+            index = self._started
+        try:
+            worker = BlenderWorker(self.blender_bin, name=f"blender-{index}")
+        except Exception:
+            with self._cond:
+                self._started -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._workers.append(worker)
+        return worker
+
+    def run(self, argv, run_times=None):
+        """Run a job on an idle worker (blocking while all are busy).
+
+        If run_times is a list, the seconds spent running (not waiting for
+        a worker) are appended to it.
+        """
+        try:
+            worker = self._acquire()
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return False
+        start = time.monotonic()
+        try:
+            return worker.run(argv)
+        finally:
+            if run_times is not None:
+                run_times.append(time.monotonic() - start)
+            alive = worker.alive
+            with self._cond:
+                if alive:
+                    self._idle.append(worker)
+                else:
+                    self._started -= 1
+                    self._workers.remove(worker)
+                self._cond.notify()
+            if not alive:
+                worker.close()
+
+    def close(self):
+        """Shut down every worker."""
+        with self._cond:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+
+def _run_blender(cmd, blender_slots=None, run_times=None):
+    """Run one Blender render, holding a Blender slot while it runs.
+
+    With a BlenderWorkerPool, the render_isometric arguments (after "--")
+    are sent as a job to a persistent worker instead. If run_times is a
+    list, the seconds spent rendering once a slot was acquired are
+    appended to it.
+    """
+    if isinstance(blender_slots, BlenderWorkerPool):
+        argv = cmd[cmd.index("--") + 1:]
+        print(f"  JOB: {' '.join(argv)}")
+        return blender_slots.run(argv, run_times)
+
+    print(f"  CMD: {' '.join(cmd)}")
+    with blender_slots or contextlib.nullcontext():
+        start = time.monotonic()
+        result = subprocess.run(cmd, cwd=str(PROJECT_ROOT))
+        if run_times is not None:
+            run_times.append(time.monotonic() - start)
+    return result.returncode == 0
+
+
+def step_render(args, blender_bin, blender_slots=None, run_times=None):
+    """Step 1: Render sprites via Blender.
+
+    blender_slots is an optional semaphore bounding concurrent Blender
+    processes across subjects, or a BlenderWorkerPool of render servers.
+    With args.shards > 1 (animated units only), one Blender process is
+    launched per shard and the merged frame set is verified once all
+    shards finish. With args.validate_mirror, one mirrored direction is
+    then rendered for real as the reference for generate_manifest.
+    run_times collects the seconds of each Blender run (see _run_blender).
+    """
     render_script = PROJECT_ROOT / "blender" / "render_isometric.py"
     if not render_script.exists():
         print("Error: blender/render_isometric.py not found", file=sys.stderr)
@@ -70,6 +352,7 @@ def step_render(args, blender_bin):
         "--",
         args.subject,
         "--type", args.type,
+        "--profile", args.profile,
     ]
 
     if args.type == "building" and args.footprint:
@@ -79,13 +362,62 @@ def step_render(args, blender_bin):
         cmd.extend(["--animations", ",".join(args.animations)])
     if args.frames:
         cmd.extend(["--frames-per-anim", ",".join(str(f) for f in args.frames)])
+    if args.keyframed:
+        cmd.append("--keyframed")
+    if args.no_render_cache:
+        cmd.append("--no-render-cache")
+
+    render_cmd = list(cmd)
     if args.directions:
-        for d in args.directions:
-            cmd.extend(["--directions", d])
+        render_cmd.append("--directions")
+        render_cmd.extend(args.directions)
+    if args.mirror_symmetric:
+        render_cmd.append("--mirror-symmetric")
+    if not _render_shards(args, render_cmd, blender_slots, run_times):
+        return False
 
-    print(f"  CMD: {' '.join(cmd)}")
-    result = subprocess.run(cmd, cwd=str(PROJECT_ROOT))
-    return result.returncode == 0
+    # Mirrored directions are never rendered above, so render one for real
+    # (every animation) for generate_manifest to pixel-diff against
+    check = (mirror_check_direction(args.directions)
+             if args.mirror_symmetric and args.validate_mirror
+             and args.type == "unit" else None)
+    if check is None:
+        return True
+    print(f"  Mirror check: rendering {check} for --validate-mirror")
+    return _run_blender(cmd + ["--directions", check], blender_slots,
+                        run_times)
+
+
+def _render_shards(args, cmd, blender_slots, run_times=None):
+    """Run cmd, split into args.shards Blender processes for animated units."""
+    shards = args.shards
+    if shards <= 1 or args.type != "unit" or not args.animations:
+        return _run_blender(cmd, blender_slots, run_times)
+
+    with ThreadPoolExecutor(max_workers=shards) as pool:
+        futures = [
+            pool.submit(_run_blender, cmd + ["--shard", f"{i}/{shards}"],
+                        blender_slots, run_times)
+            for i in range(shards)
+        ]
+        results = [f.result() for f in futures]
+    if not all(results):
+        failed = [str(i) for i, ok in enumerate(results) if not ok]
+        print(f"Error: render shard(s) failed: {', '.join(failed)}",
+              file=sys.stderr)
+        return False
+
+    # Merge: every shard writes into the same render dir; check coverage
+    render_dir = PROJECT_ROOT / "blender" / "renders" / args.subject
+    missing = missing_render_frames(
+        render_dir, args.subject, args.animations, args.frames,
+        rendered_directions(args.directions, args.mirror_symmetric))
+    if missing:
+        print(f"Error: {len(missing)} frame(s) missing after sharded render, "
+              f"e.g. {', '.join(missing[:5])}", file=sys.stderr)
+        return False
+    print(f"  Merged {shards} shards: frame set complete")
+    return True
 
 
 def step_manifest(args):
@@ -96,6 +428,15 @@ def step_manifest(args):
         return False
 
     cmd = [sys.executable, str(manifest_script), args.subject]
+    if args.mirror_symmetric:
+        cmd.append("--mirror-symmetric")
+        if args.validate_mirror:
+            cmd.append("--validate-mirror")
+            check = mirror_check_direction(args.directions)
+            if check:
+                cmd.extend(["--mirror-reference", check])
+    if args.lods:
+        cmd.extend(["--lods", args.lods])
     print(f"  CMD: {' '.join(cmd)}")
     result = subprocess.run(cmd, cwd=str(PROJECT_ROOT))
     return result.returncode == 0
@@ -127,13 +468,110 @@ def step_validate(args):
     return result.returncode == 0
 
 
+def parse_subject_options(args, blueprint=None):
+    """Resolve per-subject options into a fresh namespace.
+
+    Explicit --animations/--frames win; otherwise the blueprint's
+    frame_counts are used, then the unit defaults. A blueprint declaring
+    mirror_symmetric enables mirroring for that subject.
+    Returns (namespace, error_message).
+    """
+    opts = argparse.Namespace(**vars(args))
+    blueprint = blueprint or {}
+    frame_counts = blueprint.get("animations", {}).get("frame_counts")
+    opts.mirror_symmetric = (args.mirror_symmetric
+                             or bool(blueprint.get("mirror_symmetric")))
+
+    if args.animations:
+        opts.animations = [a.strip() for a in args.animations.split(",")]
+    elif frame_counts:
+        opts.animations = list(frame_counts.keys())
+    elif args.type == "unit":
+        opts.animations = DEFAULT_UNIT_ANIMS
+
+    if args.frames:
+        opts.frames = [int(f) for f in args.frames.split(",")]
+    elif frame_counts and all(a in frame_counts for a in opts.animations):
+        opts.frames = [frame_counts[a] for a in opts.animations]
+    elif args.type == "unit":
+        opts.frames = DEFAULT_UNIT_FRAMES
+
+    if opts.animations and opts.frames and len(opts.animations) != len(opts.frames):
+        return opts, "--animations and --frames must have same count"
+    return opts, None
+
+
+def run_subject(args, steps, blender_bin, blender_slots=None, cpu_slots=None,
+                tag=""):
+    """Run the per-subject pipeline steps in order.
+
+    Returns a result dict: {subject, ok, failed_step, timings, total}.
+    timings maps step name to seconds spent running, excluding time queued
+    for a Blender or CPU slot. Render is the sum of its Blender runs, so
+    sharded renders report Blender-seconds rather than wall time.
+    """
+    result = {
+        "subject": args.subject,
+        "ok": True,
+        "failed_step": None,
+        "timings": {},
+        "total": 0.0,
+    }
+    started = time.monotonic()
+
+    for i, (name, func) in enumerate(steps, 1):
+        print(f"\n{tag}--- Step {i}/{len(steps)}: {name} ---")
+        if name == "Render":
+            run_times = []
+            ok = func(args, blender_bin, blender_slots, run_times)
+            result["timings"][name] = sum(run_times)
+        else:
+            with cpu_slots or contextlib.nullcontext():
+                step_start = time.monotonic()
+                ok = func(args)
+            result["timings"][name] = time.monotonic() - step_start
+        if not ok:
+            print(f"\n{tag}ERROR: Step '{name}' failed. Pipeline aborted.",
+                  file=sys.stderr)
+            result["ok"] = False
+            result["failed_step"] = name
+            break
+        print(f"{tag}  OK: {name} complete")
+
+    result["total"] = time.monotonic() - started
+    return result
+
+
+def format_timing_table(results, step_names):
+    """Format a per-subject timing table (seconds per step + total)."""
+    name_w = max([len("Subject")] + [len(r["subject"]) for r in results])
+    col_w = max([10] + [len(n) + 2 for n in step_names])
+    header = f"  {'Subject':<{name_w}}"
+    header += "".join(f"{n:>{col_w}}" for n in step_names)
+    header += f"{'Total':>{col_w}}  Status"
+    lines = [header, "  " + "-" * (len(header) - 2)]
+    for r in results:
+        row = f"  {r['subject']:<{name_w}}"
+        for n in step_names:
+            t = r["timings"].get(n)
+            row += f"{t:>{col_w - 1}.1f}s" if t is not None else f"{'-':>{col_w}}"
+        row += f"{r['total']:>{col_w - 1}.1f}s"
+        row += "  ok" if r["ok"] else f"  FAILED ({r['failed_step']})"
+        lines.append(row)
+    return "\n".join(lines)
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Run the full 3D-to-2D asset pipeline."
     )
     parser.add_argument(
-        "subject",
-        help="Asset name (e.g., archer, villager, house)"
+        "subjects", nargs="*", metavar="subject",
+        help="Asset name(s) (e.g., archer, villager, house)"
+    )
+    parser.add_argument(
+        "--all-blueprints", action="store_true",
+        help="Process every unit in blender/blueprints/*.json"
     )
     parser.add_argument(
         "--type", choices=["unit", "building"], default="unit",
@@ -155,6 +593,53 @@ def main(argv=None):
         "--directions", nargs="+", default=None,
         help="Directions to render (default: all 8)"
     )
+    parser.add_argument(
+        "--shards", type=int, default=1,
+        help="Split each unit render across N Blender processes (default: 1)"
+    )
+    parser.add_argument(
+        "--keyframed", action="store_true",
+        help="Render each Blender job's frames with one keyframed "
+             "animation render instead of one render per frame"
+    )
+    parser.add_argument(
+        "--profile", choices=RENDER_PROFILES, default=DEFAULT_RENDER_PROFILE,
+        help="Render quality profile; preview renders Workbench at 1x "
+             f"without AA for quick checks (default: {DEFAULT_RENDER_PROFILE})"
+    )
+    parser.add_argument(
+        "--render-server", action="store_true",
+        help="Render through a pool of persistent Blender servers "
+             "(--blender-jobs workers) instead of one Blender per render"
+    )
+    parser.add_argument(
+        "--no-render-cache", action="store_true",
+        help="Re-render every frame even if its scene state is unchanged"
+    )
+    parser.add_argument(
+        "--mirror-symmetric", action="store_true",
+        help="Render s/n and one side only; mirror ne/e/se from nw/w/sw "
+             "(also enabled per blueprint via mirror_symmetric)"
+    )
+    parser.add_argument(
+        "--validate-mirror", action="store_true",
+        help="Also render one mirrored direction for real and pixel-diff "
+             "the mirrored frames against it"
+    )
+    parser.add_argument(
+        "--lods", type=str, default=None,
+        help="Comma-separated extra LOD canvas sizes to emit and pack "
+             "(e.g. 64,32)"
+    )
+    parser.add_argument(
+        "--blender-jobs", type=int, default=None,
+        help="Max concurrent Blender processes across subjects "
+             "(default: --shards)"
+    )
+    parser.add_argument(
+        "--cpu-jobs", type=int, default=os.cpu_count() or 1,
+        help="Max concurrent manifest/pack workers (default: CPU count)"
+    )
     parser.add_argument(
         "--skip-render", action="store_true",
         help="Skip Blender render step (use existing renders)"
@@ -169,23 +654,33 @@ def main(argv=None):
     )
     args = parser.parse_args(argv)
 
-    # Parse comma-separated args
-    if args.animations:
-        args.animations = [a.strip() for a in args.animations.split(",")]
-    elif args.type == "unit":
-        args.animations = DEFAULT_UNIT_ANIMS
-
-    if args.frames:
-        args.frames = [int(f) for f in args.frames.split(",")]
-    elif args.type == "unit":
-        args.frames = DEFAULT_UNIT_FRAMES
-
-    if args.animations and args.frames and len(args.animations) != len(args.frames):
-        print("Error: --animations and --frames must have same count",
-              file=sys.stderr)
-        return 1
+    # Resolve subjects: explicit names, then blueprint roster. Subjects
+    # with a blueprint take their frame counts and symmetry from it.
+    blueprints = dict(load_blueprint_subjects())
+    subject_specs = [(name, blueprints.get(name)) for name in args.subjects]
+    if args.all_blueprints:
+        known = set(args.subjects)
+        subject_specs.extend(
+            (name, bp) for name, bp in blueprints.items() if name not in known
+        )
+    if not subject_specs:
+        parser.error("at least one subject or --all-blueprints is required")
+    if args.blender_jobs is None:
+        args.blender_jobs = max(1, args.shards)
+    if args.shards < 1 or args.blender_jobs < 1 or args.cpu_jobs < 1:
+        parser.error("--shards, --blender-jobs and --cpu-jobs must be >= 1")
+
+    subjects = []
+    for name, blueprint in subject_specs:
+        opts, error = parse_subject_options(args, blueprint)
+        if error:
+            print(f"Error: {name}: {error}", file=sys.stderr)
+            return 1
+        opts.subject = name
+        subjects.append(opts)
 
-    print(f"=== Asset Pipeline: {args.subject} ({args.type}) ===")
+    names = ", ".join(s.subject for s in subjects)
+    print(f"=== Asset Pipeline: {names} ({args.type}) ===")
 
     steps = []
     if not args.skip_render:
@@ -193,8 +688,6 @@ def main(argv=None):
     steps.append(("Manifest", step_manifest))
     if not args.skip_pack:
         steps.append(("Pack", step_pack))
-    if not args.skip_validate:
-        steps.append(("Validate", step_validate))
 
     blender_bin = None
     if not args.skip_render:
@@ -205,19 +698,48 @@ def main(argv=None):
             return 1
         print(f"  Blender: {blender_bin}")
 
-    for i, (name, func) in enumerate(steps, 1):
-        print(f"\n--- Step {i}/{len(steps)}: {name} ---")
-        if name == "Render":
-            ok = func(args, blender_bin)
+    if args.render_server and blender_bin:
+        blender_slots = BlenderWorkerPool(blender_bin, args.blender_jobs)
+    else:
+        blender_slots = threading.BoundedSemaphore(args.blender_jobs)
+    cpu_slots = threading.BoundedSemaphore(args.cpu_jobs)
+    try:
+        if len(subjects) == 1:
+            results = [run_subject(subjects[0], steps, blender_bin,
+                                   blender_slots, cpu_slots)]
         else:
-            ok = func(args)
-        if not ok:
-            print(f"\nERROR: Step '{name}' failed. Pipeline aborted.",
-                  file=sys.stderr)
+            print(f"  Subjects: {len(subjects)} "
+                  f"(blender jobs: {args.blender_jobs}, "
+                  f"cpu jobs: {args.cpu_jobs})")
+            with ThreadPoolExecutor(max_workers=len(subjects)) as pool:
+                futures = [
+                    pool.submit(run_subject, opts, steps, blender_bin,
+                                blender_slots, cpu_slots, f"[{opts.subject}] ")
+                    for opts in subjects
+                ]
+                results = [f.result() for f in futures]
+    finally:
+        if isinstance(blender_slots, BlenderWorkerPool):
+            blender_slots.close()
+
+    failed = [r for r in results if not r["ok"]]
+
+    # Validation scans the whole asset tree, so it runs once at the end
+    if not failed and not args.skip_validate:
+        print("\n--- Validate ---")
+        if not step_validate(args):
+            print("\nERROR: Step 'Validate' failed.", file=sys.stderr)
             return 1
-        print(f"  OK: {name} complete")
+        print("  OK: Validate complete")
+
+    if len(results) > 1:
+        print("\n=== Timing Summary ===")
+        print(format_timing_table(results, [name for name, _ in steps]))
+
+    if failed:
+        return 1
 
-    print(f"\n=== Pipeline Complete: {args.subject} ===")
+    print(f"\n=== Pipeline Complete: {names} ===")
     return 0
 
 
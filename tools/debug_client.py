@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Client for the in-game HTTP debug server (scripts/debug/debug_server.gd).
+
+Keeps a small pool of keep-alive connections so that tools polling the
+server every frame (animate.py filmstrips, perf sampling) do not pay for a
+TCP handshake per request. Requests opt in with "Connection: keep-alive";
+a server that answers "Connection: close" (older builds) still works, the
+connection is simply not reused.
+
+Typed helpers cover the server's endpoints:
+    /status /entities /screenshot /perf /economy /fow /pathfinding /command
+
+Usage:
+    from debug_client import DebugClient
+
+    with DebugClient() as client:
+        print(client.status()["game_time"])
+        client.command("spawn", type="villager", grid_x=50, grid_y=50)
+        png = client.screenshot()
+        shot = client.screenshot_region(entity="DebugUnit_3", padding=80)
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import urllib.parse
+from typing import NamedTuple
+
+DEFAULT_URL = "http://127.0.0.1:9222"
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_MAX_IDLE = 4  # idle connections kept open per client
+
+
+class DebugServerError(OSError):
+    """The debug server returned an error status or a malformed response."""
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class Screenshot(NamedTuple):
+    """A /screenshot reply.
+
+    format is "raw" (data is width * height RGBA8 pixels) or "png". region
+    is (x, y, w, h) of the returned pixels in the viewport, or None if the
+    server did not say (builds without region support send the whole
+    viewport as PNG).
+    """
+
+    data: bytes
+    format: str
+    region: tuple[int, int, int, int] | None
+
+
+class DebugClient:
+    """Pooled keep-alive client for the debug server.
+
+    Safe to share between threads: each request takes an idle connection
+    from the pool (or opens one) and returns it when the response has been
+    read. A request that fails on a reused connection — the server closed
+    it while idle — is retried once on a fresh one.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_URL,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_idle: int = DEFAULT_MAX_IDLE,
+    ):
+        parts = urllib.parse.urlsplit(base_url)
+        self.base_url = base_url
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> DebugClient:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.connections_opened += 1
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self, method: str, path: str, body: bytes | None = None
+    ) -> tuple[str, bytes]:
+        """Send one request and return (content type, body bytes).
+
+        Raises DebugServerError for HTTP errors and malformed responses,
+        and OSError (e.g. ConnectionRefusedError) if the server is down.
+        """
+        headers, data = self._send(method, path, body)
+        return headers.get("Content-Type", ""), data
+
+    def _send(
+        self, method: str, path: str, body: bytes | None = None
+    ) -> tuple[http.client.HTTPMessage, bytes]:
+        headers = {"Connection": "keep-alive"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        retried = False
+        while True:
+            conn, reused = self._acquire()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused and not retried:
+                    retried = True
+                    continue
+                raise
+            except http.client.HTTPException as e:
+                conn.close()
+                raise DebugServerError(f"{method} {path}: bad response: {e!r}") from e
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            if resp.status >= 400:
+                raise DebugServerError(
+                    f"{method} {path}: HTTP {resp.status}", status=resp.status
+                )
+            return resp.headers, data
+
+    def get(self, endpoint: str, params: dict | None = None) -> dict | bytes:
+        """GET an endpoint, returning parsed JSON or raw bytes."""
+        if params:
+            endpoint = f"{endpoint}?{urllib.parse.urlencode(params)}"
+        content_type, data = self.request("GET", endpoint)
+        if "json" in content_type:
+            return json.loads(data)
+        return data
+
+    def post(self, endpoint: str, payload: dict) -> dict:
+        """POST JSON to an endpoint and return the parsed JSON reply."""
+        _, data = self.request("POST", endpoint, json.dumps(payload).encode())
+        return json.loads(data)
+
+    # -- Endpoint helpers ---------------------------------------------------
+
+    def ping(self) -> bool:
+        """Whether the debug server answers /status."""
+        try:
+            self.status()
+            return True
+        except OSError:
+            return False
+
+    def status(self) -> dict:
+        """Game time, speed, age, resources, unit counts and camera."""
+        return self.get("/status")
+
+    def entities(self, verbose: bool = False, **filters) -> list[dict]:
+        """Entities in the scene, optionally filtered by category/type/owner."""
+        params = {k: v for k, v in filters.items() if v is not None}
+        if verbose:
+            params["verbose"] = "true"
+        result = self.get("/entities", params)
+        if isinstance(result, dict):
+            return result.get("entities", [])
+        return []
+
+    def screenshot(self, annotate: bool = False) -> bytes:
+        """Current viewport as PNG bytes."""
+        result = self.get("/screenshot", {"annotate": "true"} if annotate else None)
+        if not isinstance(result, bytes):
+            raise DebugServerError(f"/screenshot returned JSON: {result}")
+        return result
+
+    def screenshot_region(
+        self,
+        x: int | None = None,
+        y: int | None = None,
+        w: int | None = None,
+        h: int | None = None,
+        entity: str | None = None,
+        padding: int | None = None,
+        fmt: str = "raw",
+    ) -> Screenshot:
+        """Part of the viewport, as raw RGBA8 (default) or PNG.
+
+        Select the region with x/y/w/h in viewport pixels, or centre it on
+        the named entity with padding pixels each side. The server clamps
+        it to the viewport; Screenshot.region is what was returned.
+        """
+        params = {"x": x, "y": y, "w": w, "h": h, "entity": entity, "padding": padding}
+        params = {k: v for k, v in params.items() if v is not None}
+        params["format"] = fmt
+        query = urllib.parse.urlencode(params)
+        headers, data = self._send("GET", f"/screenshot?{query}")
+        region = headers.get("X-Region")
+        return Screenshot(
+            data=data,
+            format="png" if "png" in headers.get("Content-Type", "") else "raw",
+            region=tuple(int(v) for v in region.split(",")) if region else None,
+        )
+
+    def perf(self) -> dict:
+        """FPS, frame/physics times, memory and entity counts."""
+        return self.get("/perf")
+
+    def economy(self, limit: int = 50) -> dict:
+        """Recent economy events."""
+        return self.get("/economy", {"limit": limit})
+
+    def fow(self, player: int = 0) -> dict:
+        """Fog-of-war visibility summary for a player."""
+        return self.get("/fow", {"player": player})
+
+    def pathfinding(self, unit: str | None = None, fmt: str | None = None) -> dict:
+        """Solid pathfinding cells, plus a unit's path if named.
+
+        fmt="rle" asks for run-length encoded rows instead of one object
+        per solid cell (see pathfinding_grid.py to decode them).
+        """
+        params = {k: v for k, v in (("unit", unit), ("format", fmt)) if v}
+        return self.get("/pathfinding", params or None)
+
+    def command(self, action: str, **fields) -> dict:
+        """POST a /command, e.g. command("spawn", type="villager", grid_x=50, grid_y=50)."""
+        return self.post("/command", {"action": action, **fields})
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Fetch, decode and diff pathfinding solidity grids from the debug server.
+
+/pathfinding?format=rle sends one string per row of run lengths,
+alternating open/solid and starting with open ("2,3,251" = 2 open, 3
+solid, 251 open), instead of one {"x", "y"} object per solid cell — a few
+KB rather than megabytes on 256x256+ maps. Grids decode into a row-major
+bytearray (1 = solid), so comparing snapshots is a bytes comparison per
+row and only rows that differ are scanned cell by cell.
+
+Snapshots are saved in the same RLE form and can be diffed against each
+other or against the live game. Replies in the old solid_cells format
+(servers without format=rle) are decoded too.
+
+Usage:
+    python3 tools/pathfinding_grid.py fetch [--unit NAME] [--save before.json]
+    python3 tools/pathfinding_grid.py diff before.json after.json
+    python3 tools/pathfinding_grid.py diff before.json          # vs. the live game
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+from debug_client import DEFAULT_URL, DebugClient
+
+
+class GridFormatError(Exception):
+    """A pathfinding reply or snapshot is malformed."""
+
+
+class GridDiff(NamedTuple):
+    """Cells that became solid (added) or open (removed), as (x, y)."""
+
+    added: list[tuple[int, int]]
+    removed: list[tuple[int, int]]
+
+
+def decode_rle_row(text: str, width: int) -> bytearray:
+    """Decode one row of run lengths into width bytes (1 = solid)."""
+    try:
+        runs = [int(run) for run in text.split(",")]
+    except ValueError as e:
+        raise GridFormatError(f"bad run lengths: {text!r}") from e
+    row = bytearray()
+    for i, run in enumerate(runs):
+        row += (b"\x01" if i % 2 else b"\x00") * run
+    if len(row) != width:
+        raise GridFormatError(f"row decodes to {len(row)} cells, expected {width}")
+    return row
+
+
+def encode_rle_row(row) -> str:
+    """Run lengths of a row of cells, the inverse of decode_rle_row."""
+    runs = []
+    solid = False
+    length = 0
+    for cell in row:
+        if bool(cell) != solid:
+            runs.append(length)
+            solid = not solid
+            length = 0
+        length += 1
+    runs.append(length)
+    return ",".join(map(str, runs))
+
+
+class Grid:
+    """A width x height solidity grid backed by a row-major bytearray."""
+
+    def __init__(self, width: int, height: int, cells: bytearray | None = None):
+        self.width = width
+        self.height = height
+        self.cells = cells if cells is not None else bytearray(width * height)
+        if len(self.cells) != width * height:
+            raise GridFormatError(
+                f"{len(self.cells)} cells for a {width}x{height} grid"
+            )
+
+    @classmethod
+    def from_rle(cls, rows: list[str], width: int) -> Grid:
+        cells = bytearray()
+        for text in rows:
+            cells += decode_rle_row(text, width)
+        return cls(width, len(rows), cells)
+
+    @classmethod
+    def from_cells(cls, solid_cells: list[dict], size: int) -> Grid:
+        """From the old {"x", "y"}-per-solid-cell format."""
+        grid = cls(size, size)
+        for cell in solid_cells:
+            grid.cells[cell["y"] * size + cell["x"]] = 1
+        return grid
+
+    @classmethod
+    def from_reply(cls, reply: dict) -> Grid:
+        """From a /pathfinding reply (either format) or a saved snapshot."""
+        if "error" in reply:
+            raise GridFormatError(reply["error"])
+        size = reply.get("map_size")
+        if size is None:
+            raise GridFormatError("no map_size in pathfinding reply")
+        if reply.get("format") == "rle":
+            return cls.from_rle(reply["rows"], reply.get("width", size))
+        return cls.from_cells(reply.get("solid_cells", []), size)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (self.width, self.height, self.cells) == (other.width, other.height, other.cells)
+
+    def is_solid(self, x: int, y: int) -> bool:
+        return self.cells[y * self.width + x] != 0
+
+    def row(self, y: int) -> memoryview:
+        return memoryview(self.cells)[y * self.width:(y + 1) * self.width]
+
+    def solid_count(self) -> int:
+        return self.cells.count(1)
+
+    def to_rle(self) -> list[str]:
+        return [encode_rle_row(self.row(y)) for y in range(self.height)]
+
+    def to_snapshot(self) -> dict:
+        """A JSON-able snapshot that from_reply reads back."""
+        return {"map_size": self.width, "width": self.width, "format": "rle",
+                "solid_cell_count": self.solid_count(), "rows": self.to_rle()}
+
+
+def diff(before: Grid, after: Grid) -> GridDiff:
+    """Cells whose solidity changed between two snapshots of one map."""
+    if (before.width, before.height) != (after.width, after.height):
+        raise GridFormatError(
+            f"cannot diff a {before.width}x{before.height} grid with "
+            f"{after.width}x{after.height}"
+        )
+    added, removed = [], []
+    w = before.width
+    for y in range(before.height):
+        a, b = before.cells[y * w:(y + 1) * w], after.cells[y * w:(y + 1) * w]
+        if a == b:
+            continue
+        for x in range(w):
+            if a[x] != b[x]:
+                (added if b[x] else removed).append((x, y))
+    return GridDiff(added, removed)
+
+
+def fetch(client: DebugClient, unit: str | None = None) -> tuple[Grid, dict]:
+    """Live grid and the raw reply (which carries unit_path if unit is set)."""
+    reply = client.pathfinding(unit, fmt="rle")
+    return Grid.from_reply(reply), reply
+
+
+def load_snapshot(path: Path) -> Grid:
+    with open(path) as f:
+        return Grid.from_reply(json.load(f))
+
+
+def save_snapshot(grid: Grid, path: Path) -> None:
+    with open(path, "w") as f:
+        json.dump(grid.to_snapshot(), f)
+        f.write("\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fetch, save and diff pathfinding solidity grids from the debug server."
+    )
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Debug server (default: {DEFAULT_URL})")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    fetch_p = sub.add_parser("fetch", help="Summarise the live grid")
+    fetch_p.add_argument("--unit", default=None, help="Also print this unit's path")
+    fetch_p.add_argument("--save", type=Path, default=None, help="Save the grid as a snapshot")
+    diff_p = sub.add_parser("diff", help="Cells that changed between two snapshots")
+    diff_p.add_argument("before", type=Path)
+    diff_p.add_argument("after", type=Path, nargs="?", default=None,
+                        help="Snapshot to compare with (default: the live game)")
+    diff_p.add_argument("--json", action="store_true", help="Print the changed cells as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == "fetch":
+            with DebugClient(args.url) as client:
+                grid, reply = fetch(client, args.unit)
+            print(f"  Map: {grid.width}x{grid.height}, {grid.solid_count()} solid cells")
+            if "unit_path" in reply:
+                print(f"  Unit path: {json.dumps(reply['unit_path'])}")
+            if args.save:
+                save_snapshot(grid, args.save)
+                print(f"  Saved: {args.save}")
+        else:
+            before = load_snapshot(args.before)
+            if args.after is not None:
+                after = load_snapshot(args.after)
+            else:
+                with DebugClient(args.url) as client:
+                    after, _ = fetch(client)
+            changes = diff(before, after)
+            if args.json:
+                print(json.dumps(changes._asdict()))
+            else:
+                print(f"  +{len(changes.added)} solid, -{len(changes.removed)} solid")
+                for x, y in changes.added:
+                    print(f"  + ({x}, {y})")
+                for x, y in changes.removed:
+                    print(f"  - ({x}, {y})")
+    except (OSError, GridFormatError, KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
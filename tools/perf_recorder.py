@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""Record debug server performance telemetry for long soak games.
+
+Samples /perf (and optionally /status and /economy) at a fixed rate into a
+compact append-only columnar file, downsamples recordings, and summarises
+them: frame-time percentiles and a least-squares fit of frame time against
+entity count, to see how frame time scales as AI-vs-AI games grow.
+
+File format (.perfrec):
+    b"RORPERF1"                   magic
+    uint32 n + n bytes of JSON    header: columns [{"name", "type", "size"}],
+                                  interval, sources, created
+    blocks, each:
+        uint32 rows
+        per column, rows values   array typecode from the header,
+                                  little-endian, column after column
+
+Samples are buffered and written one block at a time (every --flush rows),
+so a killed recorder loses at most one block and a block cut short by a
+crash is ignored on read. Recording into an existing file appends blocks if
+its columns match. The "t" column is wall-clock seconds since the epoch;
+samples are scheduled on the monotonic clock and a slot missed because the
+game stalled is skipped rather than sampled late.
+
+Usage:
+    python3 tools/perf_recorder.py record soak.perfrec --interval 0.5
+    python3 tools/perf_recorder.py record soak.perfrec --status --economy --duration 3600
+    python3 tools/perf_recorder.py downsample soak.perfrec soak_10s.perfrec --every 10
+    python3 tools/perf_recorder.py summary soak.perfrec [--x total_node_count] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from debug_client import DEFAULT_URL, DebugClient
+
+MAGIC = b"RORPERF1"
+DEFAULT_INTERVAL = 1.0
+DEFAULT_FLUSH_ROWS = 60
+
+# (column name, array typecode, path into the endpoint's JSON reply)
+PERF_COLUMNS = (
+    ("fps", "f", ("fps",)),
+    ("frame_time_ms", "f", ("frame_time_ms",)),
+    ("physics_time_ms", "f", ("physics_time_ms",)),
+    ("memory_static_bytes", "q", ("memory_static_bytes",)),
+    ("orphan_node_count", "i", ("orphan_node_count",)),
+    ("total_node_count", "i", ("total_node_count",)),
+    ("units", "i", ("entity_counts", "unit")),
+    ("buildings", "i", ("entity_counts", "building")),
+    ("resource_nodes", "i", ("entity_counts", "resource_node")),
+)
+STATUS_COLUMNS = (
+    ("game_time", "d", ("game_time",)),
+    ("game_speed", "f", ("game_speed",)),
+)
+ECONOMY_COLUMNS = (
+    ("villagers", "i", ("total_villagers",)),
+    ("idle_villagers", "i", ("idle_villagers",)),
+    ("deposits_per_second", "f", ("deposits_per_second",)),
+    ("food", "i", ("player_resources", "food")),
+    ("wood", "i", ("player_resources", "wood")),
+    ("stone", "i", ("player_resources", "stone")),
+    ("gold", "i", ("player_resources", "gold")),
+)
+
+# source -> (DebugClient call, columns)
+SOURCES = {
+    "perf": (lambda client: client.perf(), PERF_COLUMNS),
+    "status": (lambda client: client.status(), STATUS_COLUMNS),
+    "economy": (lambda client: client.economy(limit=0), ECONOMY_COLUMNS),
+}
+AGGREGATES = ("mean", "max", "min")
+
+
+class RecordingError(Exception):
+    """A recording file is malformed or does not match the expected columns."""
+
+
+class Recording(NamedTuple):
+    """A recording read back into memory: header dict and name -> array."""
+
+    header: dict
+    columns: dict[str, array]
+
+    def __len__(self) -> int:
+        return len(self.columns["t"])
+
+
+def columns_for(sources) -> list[tuple[str, str]]:
+    """(name, typecode) of every column recorded for the given sources."""
+    columns = [("t", "d")]
+    for source in sources:
+        columns.extend((name, code) for name, code, _ in SOURCES[source][1])
+    return columns
+
+
+def _lookup(reply: dict, path: tuple[str, ...]):
+    value = reply
+    for key in path:
+        if not isinstance(value, dict):
+            return 0
+        value = value.get(key, 0)
+    return value if isinstance(value, (int, float)) else 0
+
+
+def _column_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_header(f) -> dict:
+    """Read and validate the magic and header from an open recording."""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise RecordingError(f"{f.name}: not a perf recording")
+    raw = f.read(4)
+    if len(raw) < 4:
+        raise RecordingError(f"{f.name}: truncated header")
+    (size,) = struct.unpack("<I", raw)
+    try:
+        header = json.loads(f.read(size))
+    except ValueError as e:
+        raise RecordingError(f"{f.name}: bad header: {e}") from e
+    for col in header.get("columns", []):
+        if array(col["type"]).itemsize != col["size"]:
+            raise RecordingError(
+                f"{f.name}: column {col['name']} has {col['size']}-byte "
+                f"'{col['type']}' values, this platform's are "
+                f"{array(col['type']).itemsize} bytes"
+            )
+    return header
+
+
+class RecordingWriter:
+    """Buffer rows and append them to a recording one block at a time.
+
+    An existing file is appended to if its columns match; otherwise a new
+    file is started with a header built from columns and meta.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: list[tuple[str, str]],
+        meta: dict | None = None,
+        flush_every: int = DEFAULT_FLUSH_ROWS,
+    ):
+        self.path = Path(path)
+        self.columns = columns
+        self.flush_every = max(1, flush_every)
+        self.rows_written = 0
+        self._buffer = {name: array(code) for name, code in columns}
+        spec = [{"name": n, "type": c, "size": array(c).itemsize} for n, c in columns]
+        if self.path.is_file() and self.path.stat().st_size > 0:
+            with open(self.path, "rb") as f:
+                existing = read_header(f)["columns"]
+            if existing != spec:
+                raise RecordingError(
+                    f"{self.path}: columns {[c['name'] for c in existing]} do not "
+                    f"match {[c['name'] for c in spec]}"
+                )
+            self._file = open(self.path, "ab")
+        else:
+            header = json.dumps({"columns": spec, **(meta or {})}).encode()
+            self._file = open(self.path, "wb")
+            self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def __enter__(self) -> RecordingWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, row: dict) -> None:
+        """Buffer one row (missing columns are 0); writes a block when full."""
+        for name, values in self._buffer.items():
+            value = row.get(name, 0)
+            values.append(value if values.typecode in "fd" else int(value))
+        if len(self._buffer["t"]) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows as one block."""
+        rows = len(self._buffer["t"])
+        if not rows:
+            return
+        block = [struct.pack("<I", rows)]
+        block.extend(_column_bytes(v) for v in self._buffer.values())
+        self._file.write(b"".join(block))
+        self._file.flush()
+        self.rows_written += rows
+        for values in self._buffer.values():
+            del values[:]
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_recording(path: Path) -> Recording:
+    """Read a whole recording, ignoring a block cut short by a crash."""
+    with open(path, "rb") as f:
+        header = read_header(f)
+        columns = {c["name"]: array(c["type"]) for c in header["columns"]}
+        row_size = sum(c["size"] for c in header["columns"])
+        while True:
+            raw = f.read(4)
+            if len(raw) < 4:
+                break
+            (rows,) = struct.unpack("<I", raw)
+            data = f.read(rows * row_size)
+            if len(data) < rows * row_size:
+                break
+            offset = 0
+            for values in columns.values():
+                size = rows * values.itemsize
+                chunk = array(values.typecode)
+                chunk.frombytes(data[offset:offset + size])
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                values.extend(chunk)
+                offset += size
+    return Recording(header, columns)
+
+
+def sample(client: DebugClient, sources) -> dict:
+    """One row of telemetry: every column of the given sources."""
+    row = {"t": time.time()}
+    for source in sources:
+        fetch, columns = SOURCES[source]
+        reply = fetch(client)
+        for name, _, path in columns:
+            row[name] = _lookup(reply, path)
+    return row
+
+
+def record(
+    client: DebugClient,
+    path: Path,
+    interval: float = DEFAULT_INTERVAL,
+    sources=("perf",),
+    duration: float | None = None,
+    max_samples: int | None = None,
+    flush_every: int = DEFAULT_FLUSH_ROWS,
+) -> dict:
+    """Sample the debug server every interval seconds into a recording.
+
+    Runs until duration seconds or max_samples samples (or Ctrl-C) and
+    returns counts of samples written, failed requests and skipped slots.
+    """
+    meta = {"interval": interval, "sources": list(sources), "created": time.time()}
+    stats = {"samples": 0, "errors": 0, "missed": 0}
+    start = time.monotonic()
+    tick = 0
+    with RecordingWriter(path, columns_for(sources), meta, flush_every) as writer:
+        try:
+            while max_samples is None or stats["samples"] < max_samples:
+                due = start + tick * interval
+                if duration is not None and due - start >= duration:
+                    break
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    writer.append(sample(client, sources))
+                    stats["samples"] += 1
+                except OSError as e:
+                    stats["errors"] += 1
+                    print(f"  sample failed: {e}", file=sys.stderr)
+                # Skip slots we are already past instead of bursting to catch up
+                next_tick = max(tick + 1, math.floor((time.monotonic() - start) / interval) + 1)
+                stats["missed"] += next_tick - tick - 1
+                tick = next_tick
+        except KeyboardInterrupt:
+            pass
+    return stats
+
+
+def downsample(src: Path, dst: Path, every: float, agg: str = "mean") -> int:
+    """Write src aggregated into every-second buckets to dst; returns rows.
+
+    Each bucket keeps its first timestamp; other columns are aggregated
+    with mean, max or min. Percentiles of a mean-downsampled recording
+    understate spikes — use agg="max" to keep them.
+    """
+    if agg not in AGGREGATES:
+        raise ValueError(f"unknown aggregate '{agg}', expected one of {AGGREGATES}")
+    rec = read_recording(src)
+    meta = {k: v for k, v in rec.header.items() if k != "columns"}
+    meta.update(interval=every, downsampled_from=Path(src).name, aggregate=agg)
+    columns = [(c["name"], c["type"]) for c in rec.header["columns"]]
+    if dst.exists():
+        dst.unlink()
+    reduce = {"mean": statistics.fmean, "max": max, "min": min}[agg]
+    t = rec.columns["t"]
+    with RecordingWriter(dst, columns, meta) as writer:
+        i = 0
+        while i < len(t):
+            bucket = math.floor((t[i] - t[0]) / every)
+            j = i
+            while j < len(t) and math.floor((t[j] - t[0]) / every) == bucket:
+                j += 1
+            row = {"t": t[i]}
+            for name, values in rec.columns.items():
+                if name != "t":
+                    value = reduce(values[i:j])
+                    row[name] = value if values.typecode in "fd" else round(value)
+            writer.append(row)
+            i = j
+    return writer.rows_written
+
+
+def percentile(values, p: float) -> float:
+    """p-th percentile (0-100), interpolating between closest ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("percentile of no values")
+    k = (len(ordered) - 1) * p / 100
+    lo = math.floor(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def regression(x, y) -> dict | None:
+    """Least-squares fit y = intercept + slope * x, or None if x is constant."""
+    if len(x) < 2 or min(x) == max(x):
+        return None
+    slope, intercept = statistics.linear_regression(x, y)
+    r = statistics.correlation(x, y) if min(y) != max(y) else 0.0
+    return {"slope": slope, "intercept": intercept, "r2": r * r, "n": len(x)}
+
+
+def summarize(rec: Recording, x: str = "units") -> dict:
+    """Frame-time percentiles and frame time vs. x (an entity count column)."""
+    if x not in rec.columns:
+        raise RecordingError(f"no column '{x}' in recording")
+    frame = rec.columns["frame_time_ms"]
+    summary = {"samples": len(rec)}
+    if not frame:
+        return summary
+    t = rec.columns["t"]
+    summary["duration_s"] = t[-1] - t[0]
+    summary["fps_mean"] = statistics.fmean(rec.columns["fps"])
+    for name in ("frame_time_ms", "physics_time_ms"):
+        values = rec.columns[name]
+        summary[name] = {
+            "mean": statistics.fmean(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": max(values),
+        }
+    summary["memory_peak_bytes"] = max(rec.columns["memory_static_bytes"])
+    summary[x] = {"min": min(rec.columns[x]), "max": max(rec.columns[x])}
+    fit = regression(rec.columns[x], frame)
+    summary["regression"] = {"x": x, **fit} if fit else None
+    return summary
+
+
+def print_summary(summary: dict, x: str) -> None:
+    print(f"  Samples:    {summary['samples']}")
+    if summary["samples"] == 0:
+        return
+    print(f"  Duration:   {summary['duration_s']:.1f}s")
+    print(f"  FPS mean:   {summary['fps_mean']:.1f}")
+    for name in ("frame_time_ms", "physics_time_ms"):
+        s = summary[name]
+        print(f"  {name + ':':<16} mean {s['mean']:.2f}  p50 {s['p50']:.2f}  "
+              f"p95 {s['p95']:.2f}  p99 {s['p99']:.2f}  max {s['max']:.2f}")
+    print(f"  Memory peak: {summary['memory_peak_bytes'] / 1e6:.1f} MB")
+    print(f"  {x}: {summary[x]['min']}..{summary[x]['max']}")
+    fit = summary["regression"]
+    if fit is None:
+        print(f"  Regression: {x} never changed")
+    else:
+        print(f"  Regression: frame_time_ms = {fit['intercept']:.3f} + "
+              f"{fit['slope']:.5f} * {x}  (r2 {fit['r2']:.3f}, n {fit['n']})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Record, downsample and summarise debug server perf telemetry."
+    )
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    rec = sub.add_parser("record", help="Sample the debug server into a recording")
+    rec.add_argument("output", type=Path, help="Recording file (appended if it exists)")
+    rec.add_argument("--url", default=DEFAULT_URL, help=f"Debug server (default: {DEFAULT_URL})")
+    rec.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                     help=f"Seconds between samples (default: {DEFAULT_INTERVAL})")
+    rec.add_argument("--duration", type=float, default=None,
+                     help="Stop after this many seconds (default: until Ctrl-C)")
+    rec.add_argument("--samples", type=int, default=None, help="Stop after this many samples")
+    rec.add_argument("--status", action="store_true", help="Also record /status game time/speed")
+    rec.add_argument("--economy", action="store_true", help="Also record /economy for player 0")
+    rec.add_argument("--flush", type=int, default=DEFAULT_FLUSH_ROWS,
+                     help=f"Rows per written block (default: {DEFAULT_FLUSH_ROWS})")
+
+    down = sub.add_parser("downsample", help="Aggregate a recording into coarser buckets")
+    down.add_argument("input", type=Path)
+    down.add_argument("output", type=Path)
+    down.add_argument("--every", type=float, required=True, help="Bucket length in seconds")
+    down.add_argument("--agg", choices=AGGREGATES, default="mean",
+                      help="How to aggregate each bucket (default: mean)")
+
+    summ = sub.add_parser("summary", help="Frame-time percentiles and scaling")
+    summ.add_argument("input", type=Path)
+    summ.add_argument("--x", default="units",
+                      help="Column to regress frame time against (default: units)")
+    summ.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == "record":
+            sources = ["perf"] + [s for s in ("status", "economy") if getattr(args, s)]
+            print(f"=== Recording {', '.join(sources)} every {args.interval}s "
+                  f"to {args.output} ===")
+            with DebugClient(args.url) as client:
+                if not client.ping():
+                    print(f"Error: debug server not reachable at {args.url}", file=sys.stderr)
+                    return 1
+                stats = record(client, args.output, args.interval, sources,
+                               args.duration, args.samples, args.flush)
+            print(f"  Samples: {stats['samples']}  errors: {stats['errors']}  "
+                  f"missed slots: {stats['missed']}")
+        elif args.mode == "downsample":
+            rows = downsample(args.input, args.output, args.every, args.agg)
+            print(f"  Wrote {rows} rows to {args.output}")
+        else:
+            summary = summarize(read_recording(args.input), args.x)
+            if args.json:
+                print(json.dumps(summary, indent=2))
+            else:
+                print(f"=== {args.input} ===")
+                print_summary(summary, args.x)
+    except (OSError, RecordingError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
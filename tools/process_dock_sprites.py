@@ -7,6 +7,8 @@ restores magenta player color, and stitches into a horizontal strip.
 
 from PIL import Image
 
+from sprite_masks import clear_pixels, color_key_mask, flood_fill
+
 
 FRAME_W = 384
 FRAME_H = 256
@@ -18,28 +20,9 @@ TOLERANCE = 30  # flood fill color tolerance
 def _flood_fill_transparent(img: Image.Image, start: tuple[int, int], tolerance: int) -> Image.Image:
     """Flood fill from start pixel, making connected similar-color pixels transparent."""
     rgba = img.convert("RGBA")
-    pixels = rgba.load()
-    w, h = rgba.size
-    sr, sg, sb = pixels[start[0], start[1]][:3]
-
-    visited = set()
-    stack = [start]
-
-    while stack:
-        x, y = stack.pop()
-        if (x, y) in visited:
-            continue
-        if x < 0 or x >= w or y < 0 or y >= h:
-            continue
-        r, g, b, a = pixels[x, y]
-        if abs(r - sr) <= tolerance and abs(g - sg) <= tolerance and abs(b - sb) <= tolerance:
-            visited.add((x, y))
-            pixels[x, y] = (0, 0, 0, 0)
-            stack.extend([(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)])
-        else:
-            visited.add((x, y))
-
-    return rgba
+    seed_color = rgba.getpixel(start)
+    region = flood_fill(color_key_mask(rgba, seed_color, tolerance), [start])
+    return clear_pixels(rgba, region)
 
 
 def remove_background(img: Image.Image) -> Image.Image:
@@ -5,14 +5,21 @@ Downscales source PNGs to the correct canvas size based on building
 footprint data, preserving magenta (#FF00FF) player-color mask pixels
 that would otherwise be destroyed by interpolation.
 
+The source may also be a directory or glob of PNGs (batch mode): images
+are processed in parallel worker processes and the per-image summaries
+are combined into one JSON file.
+
 Requires: Pillow (PIL)
 """
 from __future__ import annotations
 
 import argparse
+import glob
 import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 Image = None  # lazy import — Pillow not available in all CI environments
@@ -33,6 +40,7 @@ def _require_pil():
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 DEFAULT_CONFIG = SCRIPT_DIR / "asset_config.json"
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "assets" / "sprites" / "buildings" / "placeholder"
 
 # Magenta detection thresholds for post-downscale restoration.
 # LANCZOS interpolation blends pure #FF00FF with neighboring pixels,
@@ -76,6 +84,31 @@ def lookup_footprint(building_name: str, data_dir: Path) -> tuple[int, int]:
     return (int(fp[0]), int(fp[1]))
 
 
+def load_footprint_index(data_dir: Path) -> dict[str, tuple[int, int]]:
+    """Load every data/buildings/*.json footprint once, keyed by building name."""
+    index = {}
+    for data_path in sorted((data_dir / "buildings").glob("*.json")):
+        with open(data_path) as f:
+            data = json.load(f)
+        fp = data.get("footprint", [1, 1])
+        index[data_path.stem] = (int(fp[0]), int(fp[1]))
+    return index
+
+
+def indexed_footprint(building_name: str, index: dict, data_dir: Path) -> tuple[int, int]:
+    """Look up a footprint in a load_footprint_index() result.
+
+    Raises FileNotFoundError like lookup_footprint if the building is missing.
+    """
+    if building_name not in index:
+        data_path = data_dir / "buildings" / f"{building_name}.json"
+        raise FileNotFoundError(
+            f"No building data file found: {data_path}\n"
+            f"Create it with the correct 'footprint' field before processing."
+        )
+    return index[building_name]
+
+
 def footprint_to_canvas(footprint: tuple[int, int], config: dict) -> tuple[int, int]:
     """Map a building footprint to its target canvas dimensions."""
     size = max(footprint[0], footprint[1])
@@ -130,48 +163,14 @@ def _remove_background(img: Image.Image, tolerance: int = 30) -> Image.Image:
 
     AI-generated source sprites often have opaque light backgrounds.
     This flood-fills from each corner, marking reachable near-white
-    pixels as transparent.
+    pixels (all channels >= 180, spread <= tolerance) as transparent.
     """
+    from sprite_masks import (alpha_mask, clear_pixels, corner_seeds,
+                              flood_fill, mask_and, uniform_mask)
+
     img = img.copy()
-    w, h = img.size
-    pixels = img.load()
-
-    # Seed from all four corners
-    seeds = [(0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)]
-    visited = set()
-    queue = []
-
-    for sx, sy in seeds:
-        r, g, b, a = pixels[sx, sy]
-        if a == 0:
-            continue  # already transparent
-        # Only seed if the corner is light (near-white/gray)
-        if min(r, g, b) < 180:
-            continue
-        queue.append((sx, sy))
-
-    while queue:
-        x, y = queue.pop()
-        if (x, y) in visited:
-            continue
-        if x < 0 or x >= w or y < 0 or y >= h:
-            continue
-        visited.add((x, y))
-        r, g, b, a = pixels[x, y]
-        if a == 0:
-            continue
-        # Check if this pixel is close to white/light gray
-        if min(r, g, b) < 180 or max(r, g, b) - min(r, g, b) > tolerance:
-            continue
-        # Make transparent
-        pixels[x, y] = (r, g, b, 0)
-        # Expand to neighbors
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in visited:
-                queue.append((nx, ny))
-
-    return img
+    light = mask_and(alpha_mask(img, 1, 255), uniform_mask(img, 180, tolerance))
+    return clear_pixels(img, flood_fill(light, corner_seeds(img)), keep_rgb=True)
 
 
 def process_sprite(
@@ -238,7 +237,124 @@ def process_sprite(
 
 def default_output_path(building_name: str) -> Path:
     """Return the default output path for a processed building sprite."""
-    return PROJECT_ROOT / "assets" / "sprites" / "buildings" / "placeholder" / f"{building_name}.png"
+    return DEFAULT_OUTPUT_DIR / f"{building_name}.png"
+
+
+def parse_canvas(value: str) -> tuple[int, int]:
+    """Parse a WxH canvas size; raises ValueError if malformed."""
+    w, h = value.lower().split("x")
+    return (int(w), int(h))
+
+
+def is_batch_source(source: Path) -> bool:
+    """True if source names a directory or a glob pattern of images."""
+    return source.is_dir() or glob.has_magic(str(source))
+
+
+def find_batch_sources(source: Path) -> list[Path]:
+    """Resolve a batch source (directory or glob) to sorted PNG paths."""
+    if source.is_dir():
+        paths = source.glob("*.png")
+    else:
+        paths = (Path(p) for p in glob.glob(str(source)))
+    return sorted(p.resolve() for p in paths if p.is_file() and p.suffix.lower() == ".png")
+
+
+def _process_job(job: tuple) -> dict:
+    """Worker entry point: process one source, returning its summary or error."""
+    source, output, canvas_size, dry_run, building_name = job
+    try:
+        summary = process_sprite(source, output, canvas_size, dry_run=dry_run)
+    except (ValueError, OSError) as e:
+        return {"source": str(source), "error": str(e)}
+    summary["building"] = building_name
+    return summary
+
+
+def run_batch(args, source: Path, config: dict) -> int:
+    """Process every PNG in a directory or glob and write a combined summary."""
+    sources = find_batch_sources(source)
+    if not sources:
+        print(f"Error: no PNG files match {source}", file=sys.stderr)
+        return 1
+
+    canvas_override = None
+    if args.canvas:
+        try:
+            canvas_override = parse_canvas(args.canvas)
+        except (ValueError, IndexError):
+            print(f"Error: invalid canvas size '{args.canvas}' (expected WxH, e.g., 256x192)", file=sys.stderr)
+            return 1
+
+    output_dir = args.output or DEFAULT_OUTPUT_DIR
+    if not output_dir.is_absolute():
+        output_dir = (Path.cwd() / output_dir).resolve()
+
+    # Footprints come from one preloaded index instead of a file read per image
+    index = {} if canvas_override else load_footprint_index(args.data_dir)
+    jobs = []
+    errors = []
+    for path in sources:
+        building_name = extract_building_name(path)
+        if canvas_override:
+            canvas_size = canvas_override
+        else:
+            try:
+                footprint = indexed_footprint(building_name, index, args.data_dir)
+            except FileNotFoundError as e:
+                errors.append({"source": str(path), "error": str(e)})
+                continue
+            canvas_size = footprint_to_canvas(footprint, config)
+        output = output_dir / f"{building_name}.png"
+        jobs.append((path, output, canvas_size, args.dry_run, building_name))
+
+    # Variants like house_01/house_02 share an output; workers writing it
+    # concurrently would leave whichever finished last
+    by_output = {}
+    for job in jobs:
+        by_output.setdefault(job[1], []).append(job[0])
+    for output, paths in by_output.items():
+        if len(paths) > 1:
+            names = ", ".join(p.name for p in paths)
+            for path in paths:
+                errors.append({"source": str(path),
+                               "error": f"{names} would all write {output.name}"})
+    jobs = [job for job in jobs if len(by_output[job[1]]) == 1]
+
+    prefix = "[DRY RUN] " if args.dry_run else ""
+    print(f"{prefix}Batch: {len(sources)} source(s), {len(jobs)} to process, "
+          f"{args.jobs} worker(s)")
+    print(f"  Output dir: {output_dir}")
+
+    sprites = []
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for result in pool.map(_process_job, jobs):
+            if "error" in result:
+                errors.append(result)
+                print(f"  FAILED  {Path(result['source']).name}: {result['error']}")
+            else:
+                sprites.append(result)
+                print(f"  {Path(result['source']).name} -> {result['building']} "
+                      f"{result['canvas_size']} scale {result['scale_factor']}x")
+
+    summary_path = args.summary or (output_dir / "process_summary.json")
+    combined = {
+        "processed": len(sprites),
+        "failed": len(errors),
+        "dry_run": args.dry_run,
+        "sprites": sprites,
+        "errors": errors,
+    }
+    if args.dry_run:
+        print(f"  {prefix}Would write summary: {summary_path}")
+    else:
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(summary_path, "w") as f:
+            json.dump(combined, f, indent=2)
+            f.write("\n")
+        print(f"  Summary:   {summary_path}")
+    print(f"{prefix}Done: {len(sprites)} processed, {len(errors)} failed")
+    return 1 if errors else 0
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -249,7 +365,8 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument(
         "source",
         type=Path,
-        help="Path to source PNG file (e.g., assets/sprites/buildings/lumber_camp_01.png)",
+        help="Path to source PNG file (e.g., assets/sprites/buildings/lumber_camp_01.png), "
+        "or a directory / quoted glob of PNGs for batch mode",
     )
     parser.add_argument(
         "--building",
@@ -267,7 +384,8 @@ def main(argv: list[str] | None = None) -> int:
         "--output", "-o",
         type=Path,
         default=None,
-        help="Output path (default: assets/sprites/buildings/placeholder/{name}.png)",
+        help="Output path (default: assets/sprites/buildings/placeholder/{name}.png); "
+        "in batch mode, the output directory",
     )
     parser.add_argument(
         "--config",
@@ -281,6 +399,18 @@ def main(argv: list[str] | None = None) -> int:
         default=PROJECT_ROOT / "data",
         help="Path to data/ directory (default: auto-detect)",
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Batch mode: number of parallel worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        default=None,
+        help="Batch mode: combined JSON summary path (default: <output dir>/process_summary.json)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -288,7 +418,14 @@ def main(argv: list[str] | None = None) -> int:
     )
     args = parser.parse_args(argv)
 
-    source = args.source.resolve() if args.source.is_absolute() else (Path.cwd() / args.source).resolve()
+    source = args.source if args.source.is_absolute() else Path.cwd() / args.source
+    if is_batch_source(source):
+        if args.building:
+            print("Error: --building cannot be used with a directory or glob source", file=sys.stderr)
+            return 1
+        return run_batch(args, source, load_config(args.config))
+
+    source = source.resolve()
     if not source.is_file():
         print(f"Error: source file not found: {source}", file=sys.stderr)
         return 1
@@ -300,8 +437,7 @@ def main(argv: list[str] | None = None) -> int:
     config = load_config(args.config)
     if args.canvas:
         try:
-            w, h = args.canvas.lower().split("x")
-            canvas_size = (int(w), int(h))
+            canvas_size = parse_canvas(args.canvas)
         except (ValueError, IndexError):
             print(f"Error: invalid canvas size '{args.canvas}' (expected WxH, e.g., 256x192)", file=sys.stderr)
             return 1
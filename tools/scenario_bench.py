@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Benchmark .scenario files: frame-time percentiles per step, gated on a baseline.
+
+Replays each scenario step by step through `tools/ror scenario '<step>'`
+(so steps behave exactly as in `ror scenario --file`) while a background
+thread samples /perf. Each sample is attributed to the step running when
+it was taken; per step and for the whole scenario the frame-time p50, p95
+and p99 are reported and compared against a stored baseline.
+
+A step (or whole scenario) regresses when its p95 exceeds the baseline p95
+by more than --threshold (relative) AND --min-delta-ms (absolute), so
+noise on near-idle steps does not fail the gate. Steps with fewer than
+--min-samples samples — quick commands like spawn — are reported but not
+gated. The scenario is reset before each run, as `ror test-scenarios` does.
+
+Baseline format (tests/scenarios/perf_baseline.json by default):
+    {"interval": 0.1,
+     "scenarios": {"enemy_raid": {"steps": [{"index": 0, "step": "speed 5",
+                                             "samples": 3, "p50": .., "p95": .., ...}],
+                                  "overall": {...}}}}
+
+Usage:
+    python3 tools/scenario_bench.py enemy_raid resource_depletion
+    python3 tools/scenario_bench.py --update-baseline            # all scenarios
+    python3 tools/scenario_bench.py enemy_raid --threshold 0.25 --record /tmp/bench
+
+Requires the game running with --debug-server. Steps always go through
+ror, which talks to the default port; --url only affects /perf sampling.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from debug_client import DEFAULT_URL, DebugClient
+from perf_recorder import RecordingWriter, columns_for, percentile, sample
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+ROR = SCRIPT_DIR / "ror"
+SCENARIO_DIR = PROJECT_ROOT / "tests" / "scenarios"
+BASELINE_PATH = SCENARIO_DIR / "perf_baseline.json"
+
+DEFAULT_INTERVAL = 0.1
+DEFAULT_THRESHOLD = 0.15  # allowed relative p95 growth
+DEFAULT_MIN_DELTA_MS = 1.0  # ...and absolute growth before a regression counts
+DEFAULT_MIN_SAMPLES = 5
+RESET_TIMEOUT = 10.0
+
+
+def load_steps(path: Path) -> list[str]:
+    """Scenario steps, parsed the way `ror scenario --file` does."""
+    lines = [line for line in Path(path).read_text().splitlines()
+             if line.strip() and not line.lstrip().startswith("#")]
+    return [step.strip() for step in ";".join(lines).split(";") if step.strip()]
+
+
+def resolve_scenario(name: str) -> Path:
+    """A scenario path, or the name of one in tests/scenarios."""
+    path = Path(name)
+    if path.suffix == ".scenario" or path.is_file():
+        return path
+    return SCENARIO_DIR / f"{name}.scenario"
+
+
+def run_step(step: str) -> bool:
+    """Run one step through ror; prints its output if it fails."""
+    proc = subprocess.run([str(ROR), "scenario", step], capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stdout.write(proc.stdout)
+        sys.stderr.write(proc.stderr)
+    return proc.returncode == 0
+
+
+class StepSampler(threading.Thread):
+    """Samples /perf every interval seconds, tagging rows with the current step.
+
+    Set .step as the scenario advances; rows taken before the first step
+    are tagged -1, and a sample whose request spans a step change is
+    dropped. Rows are also appended to writer if one is given (its
+    columns must be the perf columns plus "step").
+    """
+
+    def __init__(self, client: DebugClient, interval: float,
+                 writer: RecordingWriter | None = None):
+        super().__init__(daemon=True)
+        self.client = client
+        self.interval = interval
+        self.writer = writer
+        self.step = -1
+        self.rows: list[dict] = []
+        self.errors = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        due = time.monotonic()
+        while not self._stop_event.wait(max(0.0, due - time.monotonic())):
+            step = self.step
+            try:
+                row = sample(self.client, ["perf"])
+            except OSError:
+                self.errors += 1
+            else:
+                # A sample straddling a step boundary belongs to neither step
+                if self.step == step:
+                    row["step"] = step
+                    self.rows.append(row)
+                    if self.writer is not None:
+                        self.writer.append(row)
+            due += self.interval
+            if due < time.monotonic():  # stalled: skip missed slots
+                due = time.monotonic()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def frame_stats(frame_times: list[float]) -> dict:
+    """Sample count and frame-time p50/p95/p99/max (None without samples)."""
+    stats = {"samples": len(frame_times)}
+    for key, p in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100)):
+        stats[key] = percentile(frame_times, p) if frame_times else None
+    return stats
+
+
+def bench_scenario(
+    client: DebugClient,
+    path: Path,
+    interval: float = DEFAULT_INTERVAL,
+    runner=run_step,
+    writer: RecordingWriter | None = None,
+) -> dict:
+    """Replay a scenario while sampling /perf and return per-step stats.
+
+    Stops at the first failing step; "failed_step" is its index (or None).
+    """
+    steps = load_steps(path)
+    sampler = StepSampler(client, interval, writer)
+    durations = []
+    failed_step = None
+    sampler.start()
+    try:
+        for i, step in enumerate(steps):
+            sampler.step = i
+            start = time.monotonic()
+            print(f"  [{i + 1}/{len(steps)}] {step}")
+            passed = runner(step)
+            durations.append(time.monotonic() - start)
+            if not passed:
+                failed_step = i
+                break
+    finally:
+        sampler.stop()
+
+    by_step: dict[int, list[float]] = {}
+    for row in sampler.rows:
+        by_step.setdefault(row["step"], []).append(row["frame_time_ms"])
+    return {
+        "scenario": Path(path).stem,
+        "steps": [
+            {"index": i, "step": steps[i], "duration_s": round(duration, 3),
+             **frame_stats(by_step.get(i, []))}
+            for i, duration in enumerate(durations)
+        ],
+        "overall": frame_stats([row["frame_time_ms"] for row in sampler.rows
+                                if row["step"] >= 0]),
+        "failed_step": failed_step,
+        "sample_errors": sampler.errors,
+    }
+
+
+def compare(
+    result: dict,
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+) -> list[str]:
+    """Descriptions of every p95 regression of result against baseline.
+
+    Steps are matched by index and text: after a scenario is edited, steps
+    that moved or changed are not gated until the baseline is updated.
+    """
+    def check(label: str, current: dict, base: dict | None) -> None:
+        if base is None or current["samples"] < min_samples or base["samples"] < min_samples:
+            return
+        limit = max(base["p95"] * (1 + threshold), base["p95"] + min_delta_ms)
+        if current["p95"] > limit:
+            regressions.append(f"{label}: p95 {current['p95']:.2f}ms > {limit:.2f}ms "
+                               f"(baseline {base['p95']:.2f}ms)")
+
+    regressions: list[str] = []
+    base_steps = {(s["index"], s["step"]): s for s in baseline.get("steps", [])}
+    for step in result["steps"]:
+        check(f"step {step['index'] + 1} '{step['step']}'", step,
+              base_steps.get((step["index"], step["step"])))
+    check("overall", result["overall"], baseline.get("overall"))
+    return regressions
+
+
+def load_baseline(path: Path) -> dict:
+    """Baseline file contents, or an empty baseline if there is none yet."""
+    if not path.is_file():
+        return {"scenarios": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, baseline: dict, results: list[dict], interval: float) -> None:
+    """Merge results into baseline (keyed by scenario name) and write it."""
+    baseline["interval"] = interval
+    for result in results:
+        baseline["scenarios"][result["scenario"]] = {
+            "steps": result["steps"], "overall": result["overall"],
+        }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def reset_scene(client: DebugClient) -> bool:
+    """Reset the scene and wait for the debug server to come back."""
+    try:
+        client.command("reset")
+    except OSError:
+        pass
+    deadline = time.monotonic() + RESET_TIMEOUT
+    while time.monotonic() < deadline:
+        if client.ping():
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def print_result(result: dict) -> None:
+    def fmt(value):
+        return f"{value:8.2f}" if value is not None else "       -"
+
+    print(f"  {'step':<40} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for step in result["steps"] + [{"step": "overall", **result["overall"]}]:
+        print(f"  {step['step'][:40]:<40} {step['samples']:>4} {fmt(step['p50'])} "
+              f"{fmt(step['p95'])} {fmt(step['p99'])}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay .scenario files while recording /perf and gate on p95 frame time."
+    )
+    parser.add_argument(
+        "scenarios", nargs="*",
+        help="Scenario names (tests/scenarios/<name>.scenario) or paths (default: all)",
+    )
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Debug server (default: {DEFAULT_URL})")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Seconds between /perf samples (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="Baseline JSON (default: tests/scenarios/perf_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write this run's results into the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed relative p95 growth (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"Allowed absolute p95 growth (default: {DEFAULT_MIN_DELTA_MS})")
+    parser.add_argument("--min-samples", type=int, default=DEFAULT_MIN_SAMPLES,
+                        help=f"Samples a step needs to be gated (default: {DEFAULT_MIN_SAMPLES})")
+    parser.add_argument("--no-reset", action="store_true",
+                        help="Do not reset the scene before each scenario")
+    parser.add_argument("--record", type=Path, default=None,
+                        help="Also write each run's samples to <dir>/<scenario>.perfrec")
+    parser.add_argument("--json", type=Path, default=None, help="Write all results to a JSON file")
+    args = parser.parse_args(argv)
+
+    paths = ([resolve_scenario(name) for name in args.scenarios]
+             or sorted(SCENARIO_DIR.glob("*.scenario")))
+    missing = [p for p in paths if not p.is_file()]
+    if missing:
+        print(f"Error: scenario not found: {', '.join(map(str, missing))}", file=sys.stderr)
+        return 1
+    baseline = load_baseline(args.baseline)
+    if args.record:
+        args.record.mkdir(parents=True, exist_ok=True)
+
+    results, failures = [], []
+    with DebugClient(args.url) as client:
+        if not client.ping():
+            print(f"Error: debug server not reachable at {args.url}", file=sys.stderr)
+            return 1
+        for path in paths:
+            print(f"\n=== {path.stem} ===")
+            if not args.no_reset and not reset_scene(client):
+                print("Error: debug server did not come back after reset", file=sys.stderr)
+                return 1
+            writer = None
+            if args.record:
+                out = args.record / f"{path.stem}.perfrec"
+                out.unlink(missing_ok=True)
+                writer = RecordingWriter(out, columns_for(["perf"]) + [("step", "i")],
+                                         {"interval": args.interval, "scenario": path.stem})
+            try:
+                result = bench_scenario(client, path, args.interval, run_step, writer)
+            finally:
+                if writer is not None:
+                    writer.close()
+            results.append(result)
+            print_result(result)
+            if result["failed_step"] is not None:
+                failures.append(f"{path.stem}: failed at step {result['failed_step'] + 1}")
+                continue
+            base = baseline["scenarios"].get(path.stem)
+            if args.update_baseline:
+                continue
+            if base is None:
+                print("  No baseline for this scenario (run with --update-baseline)")
+                continue
+            failures.extend(f"{path.stem}: {r}" for r in compare(
+                result, base, args.threshold, args.min_delta_ms, args.min_samples))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    if args.update_baseline:
+        passed = [r for r in results if r["failed_step"] is None]
+        save_baseline(args.baseline, baseline, passed, args.interval)
+        print(f"\n  Updated baseline for {len(passed)} scenario(s): {args.baseline}")
+
+    if failures:
+        print("\nFailures:")
+        for failure in failures:
+            print(f"  ✖ {failure}")
+        return 1
+    print("\n=== Done ===")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
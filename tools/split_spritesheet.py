@@ -32,56 +32,47 @@ from pathlib import Path
 
 from PIL import Image
 
+from sprite_masks import (
+    alpha_mask,
+    clear_pixels,
+    color_key_mask,
+    component_bboxes,
+    corner_color,
+    merge_bboxes,
+)
+
 
 def find_sprite_bboxes(
     img: Image.Image,
     alpha_threshold: int = 10,
     min_sprite_size: int = 16,
+    connectivity: int = 4,
+    merge_distance: int | None = None,
 ) -> list[tuple[int, int, int, int]]:
-    """Find bounding boxes of non-transparent regions using flood-fill connected components.
+    """Find bounding boxes of non-transparent regions using connected-component labelling.
 
     Args:
         img: RGBA image to scan.
         alpha_threshold: Minimum alpha value to consider a pixel non-transparent.
         min_sprite_size: Minimum width or height (in pixels) for a detected region
             to be kept. Filters out stray pixels and artifacts.
+        connectivity: 4 joins pixels sharing an edge; 8 also joins diagonal
+            neighbours.
+        merge_distance: If set, merge regions whose boxes are at most this many
+            pixels apart (detached parts such as a bow or arrow) before the
+            size filter is applied.
 
     Returns a list of (left, top, right, bottom) tuples sorted top-to-bottom,
     left-to-right.
     """
-    alpha = img.split()[-1]
-    width, height = alpha.size
-    pixels = alpha.load()
-    visited = [[False] * width for _ in range(height)]
-    bboxes: list[tuple[int, int, int, int]] = []
-
-    for y in range(height):
-        for x in range(width):
-            if visited[y][x] or pixels[x, y] < alpha_threshold:
-                visited[y][x] = True
-                continue
-            # BFS flood fill to find connected component
-            min_x, min_y = x, y
-            max_x, max_y = x, y
-            queue = [(x, y)]
-            visited[y][x] = True
-            while queue:
-                cx, cy = queue.pop()
-                min_x = min(min_x, cx)
-                min_y = min(min_y, cy)
-                max_x = max(max_x, cx)
-                max_y = max(max_y, cy)
-                for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-                    nx, ny = cx + dx, cy + dy
-                    if 0 <= nx < width and 0 <= ny < height and not visited[ny][nx]:
-                        visited[ny][nx] = True
-                        if pixels[nx, ny] >= alpha_threshold:
-                            queue.append((nx, ny))
-            bbox = (min_x, min_y, max_x + 1, max_y + 1)
-            bw = bbox[2] - bbox[0]
-            bh = bbox[3] - bbox[1]
-            if bw >= min_sprite_size and bh >= min_sprite_size:
-                bboxes.append(bbox)
+    opaque = alpha_mask(img, alpha_threshold, 255)
+    bboxes = component_bboxes(opaque, connectivity=connectivity)
+    if merge_distance is not None:
+        bboxes = merge_bboxes(bboxes, merge_distance)
+    bboxes = [
+        b for b in bboxes
+        if b[2] - b[0] >= min_sprite_size and b[3] - b[1] >= min_sprite_size
+    ]
 
     # Sort by row then column (top-to-bottom, left-to-right)
     bboxes.sort(key=lambda b: (b[1], b[0]))
@@ -112,25 +103,9 @@ def remove_background(img: Image.Image, tolerance: int = 30) -> Image.Image:
     Detects the background color from the image corners, then sets all pixels
     within `tolerance` distance (per channel) of that color to fully transparent.
     """
-    pixels = img.load()
-    w, h = img.size
-    # Sample corner pixels to determine background color
-    corners = [pixels[0, 0], pixels[w - 1, 0], pixels[0, h - 1], pixels[w - 1, h - 1]]
-    # Use the most common corner color as background
-    bg = max(set(corners), key=corners.count)
-
+    bg = corner_color(img)
     result = img.copy()
-    rpx = result.load()
-    for y in range(h):
-        for x in range(w):
-            r, g, b, a = rpx[x, y]
-            if (
-                abs(r - bg[0]) <= tolerance
-                and abs(g - bg[1]) <= tolerance
-                and abs(b - bg[2]) <= tolerance
-            ):
-                rpx[x, y] = (0, 0, 0, 0)
-    return result
+    return clear_pixels(result, color_key_mask(result, bg, tolerance))
 
 
 def parse_tile_size(s: str) -> tuple[int, int]:
@@ -199,6 +174,20 @@ def main() -> int:
         metavar="PX",
         help="Minimum sprite width/height in pixels to keep (filters artifacts, default: 16)",
     )
+    parser.add_argument(
+        "--connectivity",
+        type=int,
+        choices=[4, 8],
+        default=4,
+        help="Pixel connectivity for sprite detection: 4 (edges) or 8 (edges and diagonals, default: 4)",
+    )
+    parser.add_argument(
+        "--merge-distance",
+        type=int,
+        default=None,
+        metavar="PX",
+        help="Merge detected regions within PX pixels of each other (joins detached parts like bows)",
+    )
     parser.add_argument(
         "--grid",
         type=parse_grid,
@@ -251,7 +240,13 @@ def main() -> int:
         bboxes = grid_bboxes(img, cols, rows)
         print(f"Grid mode: {cols}x{rows} = {len(bboxes)} tile(s)")
     else:
-        bboxes = find_sprite_bboxes(img, alpha_threshold=args.alpha_threshold, min_sprite_size=args.min_size)
+        bboxes = find_sprite_bboxes(
+            img,
+            alpha_threshold=args.alpha_threshold,
+            min_sprite_size=args.min_size,
+            connectivity=args.connectivity,
+            merge_distance=args.merge_distance,
+        )
         if not bboxes:
             print("No sprites detected — image may be fully transparent.", file=sys.stderr)
             return 1
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Ingest hand-made or AI-generated unit spritesheets into game frames.
+
+Reads a per-unit ingest spec (tools/ingest_specs/<unit>.json) describing
+the source sheets, their cell grids, which cell becomes which
+(animation, direction, frame), which directions are mirrored from others,
+and the output canvas. Every referenced cell is background-removed,
+cropped and placed on the canvas in parallel worker processes; mirrored
+directions are derived by flipping, and manifest.json is written in the
+format blender/generate_manifest.py produces.
+
+Spec format:
+    {
+      "unit": "sheep",
+      "source_dir": "assets/sprites/units/sheep/source",
+      "output_dir": "assets/sprites/units/sheep",
+      "canvas_size": [128, 128],
+      "fit": 0.9,                      # max content size as canvas fraction
+      "background": {"mode": "uniform", "min_value": 235,
+                     "max_spread": 6, "clean_halo": true},
+      "sheets": {"idle": {"file": "idle.png", "grid": [2, 2]}},
+      "frames": [{"sheet": "idle", "cell": 0, "animation": "idle",
+                  "direction": "s", "frame": 1}],
+      "mirrors": {"sw": "se"}          # derived direction -> source direction
+    }
+
+Cells are numbered row-major from the top-left. "animation" may be a list
+to reuse one cell for several animations; "frame" defaults to 1.
+Background modes (see tools/sprite_masks.py):
+    uniform    light near-grey pixels (min_value, max_spread); clean_halo
+               also drops grey resize fringes
+    color_key  pixels within tolerance of the most common corner colour
+    flood      light pixels (min_value, max_spread) connected to a corner
+
+Usage:
+    python3 tools/sprite_ingest.py sheep
+    python3 tools/sprite_ingest.py --spec path/to/wolf.json --jobs 4
+    python3 tools/sprite_ingest.py sheep --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sprite_masks import (
+    alpha_mask,
+    clear_pixels,
+    color_key_mask,
+    corner_color,
+    corner_seeds,
+    flood_fill,
+    mask_and,
+    mask_or,
+    uniform_mask,
+)
+
+Image = None  # lazy import — Pillow not available in all CI environments
+ImageOps = None
+
+
+def _require_pil():
+    """Import PIL lazily so the module can be imported without Pillow."""
+    global Image, ImageOps
+    if Image is not None:
+        return
+    try:
+        from PIL import Image as _Image
+        from PIL import ImageOps as _ImageOps
+        Image = _Image
+        ImageOps = _ImageOps
+    except ImportError:
+        print("Error: Pillow is required. Install with: pip install Pillow",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+SPECS_DIR = SCRIPT_DIR / "ingest_specs"
+
+# generate_manifest lives with the Blender scripts but has no bpy dependency
+sys.path.append(str(PROJECT_ROOT / "blender"))
+from generate_manifest import generate_manifest, sort_frames  # noqa: E402
+
+BACKGROUND_MODES = ("uniform", "color_key", "flood")
+
+
+class IngestSpecError(Exception):
+    """An ingest spec is malformed or references missing data."""
+
+
+def load_spec(path: Path) -> dict:
+    """Load and validate an ingest spec."""
+    with open(path) as f:
+        spec = json.load(f)
+
+    missing = [k for k in ("unit", "source_dir", "output_dir", "sheets", "frames")
+               if k not in spec]
+    if missing:
+        raise IngestSpecError(f"{path}: missing fields: {missing}")
+    mode = spec.get("background", {}).get("mode", "uniform")
+    if mode not in BACKGROUND_MODES:
+        raise IngestSpecError(f"{path}: unknown background mode '{mode}'")
+    for i, entry in enumerate(spec["frames"]):
+        sheet = spec["sheets"].get(entry.get("sheet"))
+        if sheet is None:
+            raise IngestSpecError(f"{path}: frames[{i}] references unknown sheet "
+                                  f"'{entry.get('sheet')}'")
+        cols, rows = sheet.get("grid", [1, 1])
+        if not 0 <= entry.get("cell", 0) < cols * rows:
+            raise IngestSpecError(f"{path}: frames[{i}] cell {entry.get('cell')} "
+                                  f"outside {cols}x{rows} grid")
+    return spec
+
+
+def cell_box(size: tuple[int, int], grid, cell: int) -> tuple[int, int, int, int]:
+    """Crop box of a row-major cell in a cols x rows grid over an image size."""
+    w, h = size
+    cols, rows = grid
+    c, r = cell % cols, cell // cols
+    return (c * w // cols, r * h // rows, (c + 1) * w // cols, (r + 1) * h // rows)
+
+
+def remove_background(img: Image.Image, background: dict) -> Image.Image:
+    """Make the background of a cell transparent, returning an RGBA copy."""
+    img = img.convert("RGBA")
+    mode = background.get("mode", "uniform")
+    if mode == "uniform":
+        mask = uniform_mask(img, background.get("min_value", 235),
+                            background.get("max_spread", 6))
+    elif mode == "color_key":
+        mask = color_key_mask(img, corner_color(img),
+                              background.get("tolerance", 30))
+    else:
+        light = mask_and(alpha_mask(img, 1, 255),
+                         uniform_mask(img, background.get("min_value", 180),
+                                      background.get("max_spread", 30)))
+        mask = flood_fill(light, corner_seeds(img))
+    return clear_pixels(img, mask)
+
+
+def clean_resize_halo(img: Image.Image, background: dict) -> Image.Image:
+    """Remove semi-transparent grey fringes left by LANCZOS downscaling."""
+    min_value = background.get("min_value", 235)
+    max_spread = background.get("max_spread", 6)
+    halo = mask_or(
+        mask_and(alpha_mask(img, 1, 254), uniform_mask(img, 0, max_spread)),
+        mask_and(alpha_mask(img, 255, 255),
+                 uniform_mask(img, min_value, max_spread)),
+    )
+    return clear_pixels(img, halo)
+
+
+def place_on_canvas(img: Image.Image, canvas_size, fit: float,
+                    background: dict) -> Image.Image:
+    """Crop to content, shrink to fit a fraction of the canvas, and centre."""
+    _require_pil()
+    bbox = img.getchannel("A").getbbox()
+    if bbox is None:
+        return Image.new("RGBA", canvas_size, (0, 0, 0, 0))
+
+    cropped = img.crop(bbox)
+    cw, ch = cropped.size
+    scale = min(int(canvas_size[0] * fit) / cw, int(canvas_size[1] * fit) / ch)
+    if scale < 1.0:
+        cropped = cropped.resize((max(1, int(cw * scale)), max(1, int(ch * scale))),
+                                 Image.LANCZOS)
+        if background.get("clean_halo"):
+            cropped = clean_resize_halo(cropped, background)
+        cw, ch = cropped.size
+
+    canvas = Image.new("RGBA", canvas_size, (0, 0, 0, 0))
+    ox = (canvas_size[0] - cw) // 2
+    oy = (canvas_size[1] - ch) // 2
+    canvas.paste(cropped, (ox, oy), cropped)
+    return canvas
+
+
+def process_cell(job: tuple) -> Image.Image:
+    """Worker entry point: cut one cell from a sheet and place it on the canvas."""
+    _require_pil()
+    sheet_path, grid, cell, background, canvas_size, fit = job
+    with Image.open(sheet_path) as sheet:
+        img = sheet.crop(cell_box(sheet.size, grid, cell))
+    img = remove_background(img, background)
+    return place_on_canvas(img, tuple(canvas_size), fit, background)
+
+
+def plan_frames(spec: dict) -> tuple[list[dict], list[dict]]:
+    """Expand spec frames and mirrors into manifest frame dicts.
+
+    Returns (frames, mirrored). Each frame carries "cell" = (sheet, cell);
+    each mirrored frame carries "mirrored_from" (the source filename).
+    A mirror rule only fills directions no frame entry defines.
+    """
+    unit = spec["unit"]
+    frames = {}
+    for entry in spec["frames"]:
+        anims = entry["animation"]
+        for anim in [anims] if isinstance(anims, str) else anims:
+            key = (anim, entry["direction"], entry.get("frame", 1))
+            frames[key] = {
+                "filename": f"{unit}_{anim}_{key[1]}_{key[2]:02d}.png",
+                "animation": anim,
+                "direction": key[1],
+                "frame": key[2],
+                "cell": (entry["sheet"], entry.get("cell", 0)),
+            }
+
+    mirrored = []
+    for derived, source in spec.get("mirrors", {}).items():
+        for (anim, direction, frame), f in list(frames.items()):
+            if direction != source or (anim, derived, frame) in frames:
+                continue
+            mirrored.append({
+                "filename": f"{unit}_{anim}_{derived}_{frame:02d}.png",
+                "animation": anim,
+                "direction": derived,
+                "frame": frame,
+                "mirrored_from": f["filename"],
+            })
+    return list(frames.values()), mirrored
+
+
+def ingest(spec: dict, jobs: int = 1, dry_run: bool = False) -> dict:
+    """Run an ingest spec and return the manifest dict."""
+    source_dir = PROJECT_ROOT / spec["source_dir"]
+    output_dir = PROJECT_ROOT / spec["output_dir"]
+    canvas_size = tuple(spec.get("canvas_size", [128, 128]))
+    fit = spec.get("fit", 0.9)
+    background = spec.get("background", {})
+
+    frames, mirrored = plan_frames(spec)
+
+    # Each distinct (sheet, cell) is processed once, however many frames use it
+    cells = sorted({f["cell"] for f in frames})
+    for sheet_name in sorted({sheet for sheet, _ in cells}):
+        path = source_dir / spec["sheets"][sheet_name]["file"]
+        if not path.is_file():
+            raise IngestSpecError(f"source sheet not found: {path}")
+
+    prefix = "[DRY RUN] " if dry_run else ""
+    print(f"=== {prefix}Sprite Ingest: {spec['unit']} ===")
+    print(f"  Source dir: {source_dir}")
+    print(f"  Output dir: {output_dir}")
+    print(f"  Cells:      {len(cells)} from {len(spec['sheets'])} sheet(s)")
+    print(f"  Frames:     {len(frames)} + {len(mirrored)} mirrored")
+
+    manifest = generate_manifest(sort_frames(frames + mirrored), spec["unit"])
+    manifest["canvas_size"] = list(canvas_size)
+    if dry_run:
+        return manifest
+
+    _require_pil()
+    cell_jobs = [
+        (source_dir / spec["sheets"][sheet]["file"],
+         spec["sheets"][sheet].get("grid", [1, 1]), cell, background,
+         canvas_size, fit)
+        for sheet, cell in cells
+    ]
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        images = dict(zip(cells, pool.map(process_cell, cell_jobs)))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    saved = {}
+    for f in frames:
+        img = images[f["cell"]]
+        img.save(output_dir / f["filename"])
+        saved[f["filename"]] = img
+    for f in mirrored:
+        ImageOps.mirror(saved[f["mirrored_from"]]).save(output_dir / f["filename"])
+
+    manifest_path = output_dir / "manifest.json"
+    with open(manifest_path, "w") as fp:
+        json.dump(manifest, fp, indent=2)
+        fp.write("\n")
+    print(f"  Wrote {len(frames) + len(mirrored)} frames")
+    print(f"  Wrote: {manifest_path}")
+    return manifest
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ingest unit spritesheets into game frames from a declarative spec."
+    )
+    parser.add_argument(
+        "unit", nargs="?", default=None,
+        help="Unit name; reads tools/ingest_specs/<unit>.json",
+    )
+    parser.add_argument(
+        "--spec", type=Path, default=None,
+        help="Path to an ingest spec JSON (overrides the unit name)",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count() or 1,
+        help="Parallel worker processes for cell processing (default: CPU count)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Validate the spec and print the plan without writing files",
+    )
+    args = parser.parse_args(argv)
+
+    spec_path = args.spec or (SPECS_DIR / f"{args.unit}.json" if args.unit else None)
+    if spec_path is None:
+        parser.error("a unit name or --spec is required")
+    if not spec_path.is_file():
+        print(f"Error: ingest spec not found: {spec_path}", file=sys.stderr)
+        return 1
+
+    try:
+        spec = load_spec(spec_path)
+        ingest(spec, jobs=args.jobs, dry_run=args.dry_run)
+    except IngestSpecError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print("=== Done ===")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Array-based background removal shared by the sprite tools.
+
+Background pixels are described by masks: single-band "L" images that are
+255 where a pixel matches and 0 elsewhere. Masks are built with per-band
+lookup tables and ImageChops min/max, so every pixel test runs inside
+Pillow rather than in a Python loop. Three kinds of background are
+covered:
+
+- colour key: every RGB channel within a tolerance of a key colour
+  (split_spritesheet, process_dock_sprites)
+- uniformity key: light pixels whose channels are nearly equal, i.e. grey
+  or white rather than a light but coloured subject (split_sheep_sprites)
+- flood fill: the part of a mask connected to seed pixels such as the
+  image corners, so matching colours inside the subject survive
+  (process_sprite, process_dock_sprites)
+
+Callers combine masks with mask_and / mask_or and apply the result with
+clear_pixels. component_bboxes labels the islands of a mask (e.g. the
+sprites on a transparent sheet) from run-lengths of each row.
+"""
+from __future__ import annotations
+
+import sys
+
+Image = None  # lazy import — Pillow not available in all CI environments
+ImageChops = None
+
+
+def _require_pil():
+    """Import PIL lazily so the module can be imported without Pillow."""
+    global Image, ImageChops
+    if Image is not None:
+        return
+    try:
+        from PIL import Image as _Image
+        from PIL import ImageChops as _ImageChops
+        Image = _Image
+        ImageChops = _ImageChops
+    except ImportError:
+        print("Error: Pillow is required. Install with: pip install Pillow",
+              file=sys.stderr)
+        sys.exit(1)
+
+# Maps any nonzero mask value to 255
+_NONZERO_TO_FF = bytes([0]) + b"\xff" * 255
+
+
+def _band_mask(band: Image.Image, test) -> Image.Image:
+    """Mask of the pixels of an 8-bit band whose value passes test."""
+    return band.point([255 if test(v) else 0 for v in range(256)])
+
+
+def mask_and(*masks: Image.Image) -> Image.Image:
+    """Pixels set in every mask."""
+    _require_pil()
+    result = masks[0]
+    for mask in masks[1:]:
+        result = ImageChops.darker(result, mask)
+    return result
+
+
+def mask_or(*masks: Image.Image) -> Image.Image:
+    """Pixels set in any mask."""
+    _require_pil()
+    result = masks[0]
+    for mask in masks[1:]:
+        result = ImageChops.lighter(result, mask)
+    return result
+
+
+def corner_color(img: Image.Image) -> tuple:
+    """Most common colour among the four corner pixels."""
+    w, h = img.size
+    corners = [img.getpixel((0, 0)), img.getpixel((w - 1, 0)),
+               img.getpixel((0, h - 1)), img.getpixel((w - 1, h - 1))]
+    return max(set(corners), key=corners.count)
+
+
+def color_key_mask(img: Image.Image, color: tuple, tolerance: int) -> Image.Image:
+    """Pixels whose R, G and B are each within tolerance of color.
+
+    Alpha is ignored.
+    """
+    r, g, b = img.convert("RGBA").split()[:3]
+    return mask_and(*(
+        _band_mask(band, lambda v, c=c: abs(v - c) <= tolerance)
+        for band, c in zip((r, g, b), color[:3])
+    ))
+
+
+def _min_max_channels(img: Image.Image) -> tuple[Image.Image, Image.Image]:
+    _require_pil()
+    r, g, b = img.convert("RGBA").split()[:3]
+    return (ImageChops.darker(ImageChops.darker(r, g), b),
+            ImageChops.lighter(ImageChops.lighter(r, g), b))
+
+
+def uniform_mask(img: Image.Image, min_value: int, max_spread: int) -> Image.Image:
+    """Pixels with every channel >= min_value and max - min <= max_spread.
+
+    min_value=0 selects any near-grey pixel regardless of brightness.
+    Alpha is ignored.
+    """
+    low, high = _min_max_channels(img)
+    spread = ImageChops.subtract(high, low)
+    masks = [_band_mask(spread, lambda v: v <= max_spread)]
+    if min_value > 0:
+        masks.append(_band_mask(low, lambda v: v >= min_value))
+    return mask_and(*masks)
+
+
+def alpha_mask(img: Image.Image, low: int, high: int) -> Image.Image:
+    """Pixels whose alpha is in the inclusive range [low, high]."""
+    return _band_mask(img.convert("RGBA").getchannel("A"),
+                      lambda v: low <= v <= high)
+
+
+def _binary_bytes(mask: Image.Image) -> bytes:
+    """Mask pixels as bytes, with every nonzero value mapped to 255."""
+    return mask.tobytes().translate(_NONZERO_TO_FF)
+
+
+def flood_fill(mask: Image.Image, seeds) -> Image.Image:
+    """Part of mask 4-connected to any seed (x, y) that is in the mask.
+
+    Scanline fill: each popped pixel grows to the whole mask run around it,
+    which is written into the region with one slice assignment, and only
+    one pixel per run touching it on the rows above and below is pushed.
+    Memory is one byte per pixel for the region plus a stack of at most
+    one entry per run; every pixel is examined a constant number of times.
+    """
+    _require_pil()
+    w, h = mask.size
+    data = _binary_bytes(mask)
+    region = bytearray(w * h)
+    stack = [y * w + x for x, y in seeds]
+
+    while stack:
+        i = stack.pop()
+        if not data[i] or region[i]:
+            continue
+        row = i - i % w
+        row_end = row + w
+        # Region pixels always come in whole runs, so the run is unfilled
+        left = data.rfind(b"\x00", row, i) + 1 or row
+        right = data.find(b"\x00", i, row_end)
+        if right == -1:
+            right = row_end
+        region[left:right] = b"\xff" * (right - left)
+
+        for adj in (row - w, row_end):
+            if not 0 <= adj < w * h:
+                continue
+            offset = adj - row
+            pos = left + offset
+            stop = right + offset
+            while pos < stop:
+                pos = data.find(b"\xff", pos, stop)
+                if pos == -1:
+                    break
+                if not region[pos]:
+                    stack.append(pos)
+                pos = data.find(b"\x00", pos, adj + w)
+                if pos == -1:
+                    break
+
+    return Image.frombytes("L", (w, h), bytes(region))
+
+
+def corner_seeds(img: Image.Image) -> list[tuple[int, int]]:
+    """The four corner pixel coordinates, clockwise from top-left."""
+    w, h = img.size
+    return [(0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)]
+
+
+def clear_pixels(img: Image.Image, mask: Image.Image,
+                 keep_rgb: bool = False) -> Image.Image:
+    """Make masked pixels transparent in place and return img.
+
+    Masked pixels become (0, 0, 0, 0), or keep their colour with alpha 0
+    when keep_rgb is set. img must be RGBA.
+    """
+    _require_pil()
+    if keep_rgb:
+        alpha = img.getchannel("A")
+        zero = Image.new("L", img.size, 0)
+        img.putalpha(Image.composite(zero, alpha, mask))
+    else:
+        img.paste((0, 0, 0, 0), (0, 0, img.width, img.height), mask)
+    return img
+
+
+def _row_runs(row: bytes) -> list[tuple[int, int]]:
+    """[start, end) spans of 255 bytes in a binary mask row."""
+    runs = []
+    start = row.find(b"\xff")
+    while start != -1:
+        end = row.find(b"\x00", start)
+        if end == -1:
+            end = len(row)
+        runs.append((start, end))
+        start = row.find(b"\xff", end)
+    return runs
+
+
+def component_bboxes(mask: Image.Image,
+                     connectivity: int = 4) -> list[tuple[int, int, int, int]]:
+    """Bounding boxes of the connected islands of a mask.
+
+    Labels horizontal runs and unions runs that touch a run on the row
+    above (sharing a column for 4-connectivity, or also diagonally for 8).
+    Returns (left, top, right, bottom) boxes, right/bottom exclusive, in
+    raster order of each island's first pixel.
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"connectivity must be 4 or 8, got {connectivity}")
+    w, h = mask.size
+    data = _binary_bytes(mask)
+    reach = 1 if connectivity == 8 else 0
+
+    parent = []  # union-find over run ids; a root is its island's first run
+    runs = []    # (start, end, y) per run id
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    prev = []  # (start, end, run id) on the row above
+    for y in range(h):
+        cur = []
+        j = 0
+        for start, end in _row_runs(data[y * w:(y + 1) * w]):
+            rid = len(runs)
+            runs.append((start, end, y))
+            parent.append(rid)
+            # Skip runs above that end before this one can touch them
+            while j < len(prev) and prev[j][1] + reach <= start:
+                j += 1
+            k = j
+            while k < len(prev) and prev[k][0] < end + reach:
+                a, b = find(prev[k][2]), find(rid)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+                k += 1
+            cur.append((start, end, rid))
+        prev = cur
+
+    boxes = {}
+    for rid, (start, end, y) in enumerate(runs):
+        root = find(rid)
+        box = boxes.get(root)
+        if box is None:
+            boxes[root] = [start, y, end, y + 1]
+        else:
+            box[0] = min(box[0], start)
+            box[2] = max(box[2], end)
+            box[3] = y + 1
+    return [tuple(boxes[root]) for root in sorted(boxes)]
+
+
+def merge_bboxes(bboxes, distance: int) -> list[tuple[int, int, int, int]]:
+    """Merge boxes separated by at most distance pixels on both axes.
+
+    Joins detached parts of one sprite (a bow next to an archer) into a
+    single box. The merged box takes the position of its earliest member.
+    """
+    boxes = [list(b) for b in bboxes]
+    merged = True
+    while merged:
+        merged = False
+        i = 0
+        while i < len(boxes):
+            a = boxes[i]
+            for k in range(len(boxes) - 1, i, -1):
+                b = boxes[k]
+                gap_x = max(b[0] - a[2], a[0] - b[2])
+                gap_y = max(b[1] - a[3], a[1] - b[3])
+                if gap_x <= distance and gap_y <= distance:
+                    a[0], a[1] = min(a[0], b[0]), min(a[1], b[1])
+                    a[2], a[3] = max(a[2], b[2]), max(a[3], b[3])
+                    del boxes[k]
+                    merged = True
+            i += 1
+    return [tuple(b) for b in boxes]
@@ -2,7 +2,19 @@
 """Generate animated GIFs or static contact sheets from unit sprite manifests.
 
 Reads manifest.json and individual PNG frames. Default output is an animated
-GIF looping through frames. Use --png for static contact sheet grids.
+GIF looping through frames. Use --png for static contact sheet grids, or
+--both for GIFs and contact sheets in one pass. Decoded frames are kept in
+an LRU cache (keyed by path and mtime, capped by --cache-mb), so each frame
+PNG is decoded once per run however many previews use it.
+
+When the variant has been packed (spritesheet_packer.py wrote atlas.json),
+frames are cropped from the spritesheet_NN.png atlases instead, so previews
+show what the game loads and each sheet is opened once. --no-atlas reads
+the individual frame PNGs.
+
+--format webp or apng writes animated WebP / APNG with a transparent
+background instead of GIF (no palette step, smaller and faster to encode).
+--all renders every variant under assets/sprites/units in a process pool.
 No running game needed — purely offline.
 
 Requires: Pillow (PIL)
@@ -11,7 +23,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 Image = None  # lazy import — Pillow not available in all CI environments
@@ -19,6 +34,9 @@ ImageDraw = None
 ImageFont = None
 
 DEFAULT_GIF_FRAME_MS = 300  # milliseconds per frame in GIF output
+DEFAULT_FRAME_CACHE_MB = 256  # decoded RGBA frames kept across previews
+# Animated output formats and their file extensions; webp and apng keep alpha
+ANIMATION_FORMATS = {"gif": ".gif", "webp": ".webp", "apng": ".apng"}
 
 
 def _require_pil():
@@ -48,11 +66,64 @@ SPRITES_DIR = PROJECT_ROOT / "assets" / "sprites" / "units"
 SPRITE_DATA_DIR = PROJECT_ROOT / "data" / "units" / "sprites"
 OUTPUT_DIR = PROJECT_ROOT / "tests" / "screenshots" / "sprite-sheets"
 
+PREVIEW_BG = (40, 40, 40, 255)
 LABEL_HEIGHT = 16
 DIRECTION_LABEL_WIDTH = 32
 ALL_DIRECTIONS = ["s", "se", "e", "ne", "n", "nw", "w", "sw"]
 
 
+class FrameCache:
+    """LRU cache of decoded RGBA frames, keyed by path and mtime.
+
+    Holds at most max_bytes of pixel data (4 bytes per pixel); the least
+    recently used frames are evicted first. A rewritten file gets a new
+    mtime and so is decoded afresh. Cached images are shared — callers
+    must not modify them.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_FRAME_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self.size_bytes = 0
+
+    def get(self, path: Path) -> "Image.Image | None":
+        """Decoded RGBA image at path, or None if the file does not exist."""
+        try:
+            key = (str(path), path.stat().st_mtime_ns)
+        except OSError:
+            return None
+        img = self._frames.get(key)
+        if img is not None:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return img
+
+        self.misses += 1
+        _require_pil()
+        with Image.open(path) as src:
+            img = src.convert("RGBA")
+        nbytes = img.width * img.height * 4
+        if nbytes <= self.max_bytes:
+            self._frames[key] = img
+            self.size_bytes += nbytes
+            while self.size_bytes > self.max_bytes:
+                _, old = self._frames.popitem(last=False)
+                self.size_bytes -= old.width * old.height * 4
+        return img
+
+
+frame_cache = FrameCache()
+
+
 def load_manifest(variant: str) -> dict:
     """Load the manifest.json for a sprite variant."""
     manifest_path = SPRITES_DIR / variant / "manifest.json"
@@ -63,6 +134,43 @@ def load_manifest(variant: str) -> dict:
         return json.load(f)
 
 
+def load_atlas_frames(variant_dir: Path) -> dict[str, tuple[Path, tuple]] | None:
+    """Map frame filename -> (sheet path, crop box) from the variant's atlas.json.
+
+    Returns None when the variant has not been packed.
+    """
+    atlas_path = variant_dir / "atlas.json"
+    if not atlas_path.is_file():
+        return None
+    with open(atlas_path) as f:
+        atlas = json.load(f)
+    frames = {}
+    for sheet in atlas.get("sheets", []):
+        sheet_path = variant_dir / sheet["filename"]
+        for fr in sheet["frames"]:
+            box = (fr["x"], fr["y"], fr["x"] + fr["w"], fr["y"] + fr["h"])
+            frames[fr["filename"]] = (sheet_path, box)
+    return frames
+
+
+def load_frame(
+    variant_dir: Path,
+    entry: dict,
+    atlas_frames: dict | None = None,
+) -> "Image.Image | None":
+    """Decoded RGBA image for a manifest entry, or None if it is missing.
+
+    Frames listed in atlas_frames are cropped from their (cached) atlas
+    sheet; others are read from their individual PNG.
+    """
+    rect = atlas_frames.get(entry["filename"]) if atlas_frames else None
+    if rect is not None:
+        sheet = frame_cache.get(rect[0])
+        if sheet is not None:
+            return sheet.crop(rect[1])
+    return frame_cache.get(variant_dir / entry["filename"])
+
+
 def load_sprite_data(unit_type: str = "villager") -> dict:
     """Load animation_map data from data/units/sprites/{unit_type}.json."""
     data_path = SPRITE_DATA_DIR / f"{unit_type}.json"
@@ -112,15 +220,16 @@ def load_frame_images(
     frames: list[dict],
     canvas_w: int,
     canvas_h: int,
+    atlas_frames: dict | None = None,
+    background: tuple = PREVIEW_BG,
 ) -> list["Image.Image"]:
-    """Load and center frame PNGs onto canvas-sized images."""
+    """Load and center frames onto canvas-sized images filled with background."""
     _require_pil()
     images = []
     for entry in frames:
-        canvas = Image.new("RGBA", (canvas_w, canvas_h), (40, 40, 40, 255))
-        png_path = variant_dir / entry["filename"]
-        if png_path.is_file():
-            frame_img = Image.open(png_path).convert("RGBA")
+        canvas = Image.new("RGBA", (canvas_w, canvas_h), background)
+        frame_img = load_frame(variant_dir, entry, atlas_frames)
+        if frame_img is not None:
             x_off = (canvas_w - frame_img.width) // 2
             y_off = (canvas_h - frame_img.height) // 2
             canvas.paste(frame_img, (x_off, max(0, y_off)), frame_img)
@@ -140,7 +249,7 @@ def save_gif(
     # Convert RGBA to P (palette) mode for GIF, compositing onto background
     rgb_frames = []
     for img in images:
-        bg = Image.new("RGBA", img.size, (40, 40, 40, 255))
+        bg = Image.new("RGBA", img.size, PREVIEW_BG)
         bg.paste(img, (0, 0), img)
         rgb_frames.append(bg.convert("RGB"))
 
@@ -154,11 +263,42 @@ def save_gif(
     )
 
 
+def save_animation(
+    images: list["Image.Image"],
+    out_path: Path,
+    frame_ms: int = DEFAULT_GIF_FRAME_MS,
+    fmt: str = "gif",
+) -> None:
+    """Save RGBA images as an animated GIF, lossless WebP or APNG."""
+    if fmt == "gif":
+        save_gif(images, out_path, frame_ms)
+        return
+    _require_pil()
+    if not images:
+        return
+    if fmt == "webp":
+        # Keyframe every frame: otherwise libwebp crops frames to their opaque
+        # area and drops the file's alpha flag, so readers decode it as RGB
+        extra = {"lossless": True, "kmin": 1, "kmax": 1}
+    else:
+        extra = {"format": "PNG"}
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    images[0].save(
+        out_path,
+        save_all=True,
+        append_images=images[1:],
+        duration=frame_ms,
+        loop=0,
+        **extra,
+    )
+
+
 def build_strip(
     variant_dir: Path,
     frames: list[dict],
     canvas_w: int,
     canvas_h: int,
+    atlas_frames: dict | None = None,
 ) -> "Image.Image":
     """Build a horizontal strip image from a list of frame entries."""
     _require_pil()
@@ -172,9 +312,8 @@ def build_strip(
     draw = ImageDraw.Draw(strip)
 
     for i, entry in enumerate(frames):
-        png_path = variant_dir / entry["filename"]
-        if png_path.is_file():
-            frame_img = Image.open(png_path).convert("RGBA")
+        frame_img = load_frame(variant_dir, entry, atlas_frames)
+        if frame_img is not None:
             # Center the frame in the canvas cell
             x_off = i * canvas_w + (canvas_w - frame_img.width) // 2
             y_off = (canvas_h - frame_img.height) // 2
@@ -192,12 +331,20 @@ def generate_gif(
     animation: str | None = None,
     direction: str | None = None,
     frame_ms: int = DEFAULT_GIF_FRAME_MS,
+    use_atlas: bool = True,
+    fmt: str = "gif",
 ) -> list[Path]:
-    """Generate animated GIF(s) and return output path(s)."""
+    """Generate animated GIF(s) and return output path(s).
+
+    fmt "webp" or "apng" writes that format instead, with the frames on a
+    transparent background rather than the preview grey.
+    """
     _require_pil()
     manifest = load_manifest(variant)
     canvas_w, canvas_h = manifest["canvas_size"]
     variant_dir = SPRITES_DIR / variant
+    atlas_frames = load_atlas_frames(variant_dir) if use_atlas else None
+    background = PREVIEW_BG if fmt == "gif" else (0, 0, 0, 0)
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     outputs = []
@@ -210,14 +357,16 @@ def generate_gif(
             frames = get_frames(manifest, anim, d)
             if not frames:
                 continue
-            images = load_frame_images(variant_dir, frames, canvas_w, canvas_h)
+            images = load_frame_images(
+                variant_dir, frames, canvas_w, canvas_h, atlas_frames, background
+            )
             if len(images) < 2:
                 # Single-frame animations get a static PNG instead
                 out_path = OUTPUT_DIR / f"{variant}_{anim}_{d}.png"
                 images[0].save(out_path, "PNG")
             else:
-                out_path = OUTPUT_DIR / f"{variant}_{anim}_{d}.gif"
-                save_gif(images, out_path, frame_ms)
+                out_path = OUTPUT_DIR / f"{variant}_{anim}_{d}{ANIMATION_FORMATS[fmt]}"
+                save_animation(images, out_path, frame_ms, fmt)
             outputs.append(out_path)
 
     return outputs
@@ -227,12 +376,14 @@ def generate_sheet(
     variant: str,
     animation: str | None = None,
     direction: str | None = None,
+    use_atlas: bool = True,
 ) -> list[Path]:
     """Generate static contact sheet(s) and return output path(s)."""
     _require_pil()
     manifest = load_manifest(variant)
     canvas_w, canvas_h = manifest["canvas_size"]
     variant_dir = SPRITES_DIR / variant
+    atlas_frames = load_atlas_frames(variant_dir) if use_atlas else None
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     outputs = []
@@ -247,7 +398,9 @@ def generate_sheet(
             if not frames:
                 print(f"Warning: no frames for {anim}/{direction}", file=sys.stderr)
                 continue
-            strip = build_strip(variant_dir, frames, canvas_w, canvas_h)
+            strip = build_strip(
+                variant_dir, frames, canvas_w, canvas_h, atlas_frames
+            )
             out_path = OUTPUT_DIR / f"{variant}_{anim}_{direction}.png"
             strip.save(out_path, "PNG")
             outputs.append(out_path)
@@ -278,7 +431,9 @@ def generate_sheet(
                     fill=(200, 200, 200, 255),
                 )
                 # Frame strip
-                strip = build_strip(variant_dir, frames, canvas_w, canvas_h)
+                strip = build_strip(
+                    variant_dir, frames, canvas_w, canvas_h, atlas_frames
+                )
                 grid.paste(strip, (DIRECTION_LABEL_WIDTH, y_base))
 
             out_path = OUTPUT_DIR / f"{variant}_{anim}.png"
@@ -288,17 +443,128 @@ def generate_sheet(
     return outputs
 
 
+def generate_previews(
+    variant: str,
+    animation: str | None = None,
+    direction: str | None = None,
+    frame_ms: int = DEFAULT_GIF_FRAME_MS,
+    use_atlas: bool = True,
+    fmt: str = "gif",
+) -> list[Path]:
+    """Generate both animations and contact sheets, sharing decoded frames."""
+    outputs = generate_gif(variant, animation, direction, frame_ms, use_atlas, fmt)
+    return outputs + generate_sheet(variant, animation, direction, use_atlas)
+
+
+def render_variant(
+    variant: str,
+    animation: str | None,
+    direction: str | None,
+    kind: str,
+    frame_ms: int,
+    use_atlas: bool = True,
+    fmt: str = "gif",
+) -> list[Path]:
+    """Render one variant's previews; kind is "anim", "png" or "both"."""
+    if kind == "png":
+        return generate_sheet(variant, animation, direction, use_atlas)
+    if kind == "both":
+        return generate_previews(
+            variant, animation, direction, frame_ms, use_atlas, fmt
+        )
+    return generate_gif(variant, animation, direction, frame_ms, use_atlas, fmt)
+
+
+def find_variants(sprites_dir: Path) -> list[str]:
+    """Names of the variant directories under sprites_dir that have a manifest."""
+    if not sprites_dir.is_dir():
+        return []
+    return sorted(
+        d.name for d in sprites_dir.iterdir() if (d / "manifest.json").is_file()
+    )
+
+
+def _render_variant_job(job: tuple) -> dict:
+    """Worker entry point: render one variant, returning its outputs or error."""
+    (variant, sprites_dir, output_dir, kind, frame_ms, use_atlas, fmt,
+     cache_bytes) = job
+    global SPRITES_DIR, OUTPUT_DIR
+    SPRITES_DIR, OUTPUT_DIR = sprites_dir, output_dir
+    frame_cache.max_bytes = cache_bytes
+    try:
+        outputs = render_variant(variant, None, None, kind, frame_ms, use_atlas, fmt)
+    except (OSError, ValueError, KeyError) as e:
+        return {"variant": variant, "error": str(e)}
+    finally:
+        frame_cache.clear()
+    return {"variant": variant, "outputs": [str(p) for p in outputs]}
+
+
+def render_all(
+    kind: str,
+    frame_ms: int,
+    use_atlas: bool = True,
+    fmt: str = "gif",
+    jobs: int = 1,
+) -> tuple[list[Path], list[dict]]:
+    """Render previews for every variant in parallel worker processes.
+
+    Returns (output paths, errors), where each error is {"variant", "error"}.
+    """
+    _require_pil()
+    variants = find_variants(SPRITES_DIR)
+    job_args = [
+        (v, SPRITES_DIR, OUTPUT_DIR, kind, frame_ms, use_atlas, fmt,
+         frame_cache.max_bytes)
+        for v in variants
+    ]
+    outputs, errors = [], []
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for result in pool.map(_render_variant_job, job_args):
+            if "error" in result:
+                errors.append(result)
+                print(f"  FAILED  {result['variant']}: {result['error']}",
+                      file=sys.stderr)
+            else:
+                outputs.extend(Path(p) for p in result["outputs"])
+    return outputs, errors
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Generate animated GIFs (default) or static contact sheets from sprite manifests.",
     )
-    parser.add_argument("variant", help="Sprite variant (e.g., villager_woman)")
+    parser.add_argument("variant", nargs="?", help="Sprite variant (e.g., villager_woman)")
     parser.add_argument("animation", nargs="?", help="Animation name (e.g., walk_a)")
     parser.add_argument("direction", nargs="?", help="Direction (e.g., s, ne)")
     parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Render previews for every variant under assets/sprites/units",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel worker processes for --all (default: CPU count)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
         "--png",
         action="store_true",
-        help="Output static PNG contact sheets instead of animated GIFs",
+        help="Output static PNG contact sheets instead of animations",
+    )
+    mode.add_argument(
+        "--both",
+        action="store_true",
+        help="Output animations and PNG contact sheets in one pass",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(ANIMATION_FORMATS),
+        default="gif",
+        help="Animation format; webp and apng keep true alpha (default: gif)",
     )
     parser.add_argument(
         "--speed",
@@ -306,21 +572,48 @@ def main(argv: list[str] | None = None) -> int:
         default=0,
         help="Frame duration in ms (default: from villager.json, typically 300)",
     )
+    parser.add_argument(
+        "--no-atlas",
+        action="store_true",
+        help="Read individual frame PNGs even if atlas.json exists",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=DEFAULT_FRAME_CACHE_MB,
+        help=f"Memory cap for decoded frames in MB (default: {DEFAULT_FRAME_CACHE_MB})",
+    )
     args = parser.parse_args(argv)
 
+    if args.all and args.variant:
+        parser.error("--all cannot be combined with a variant")
+    if not args.all and not args.variant:
+        parser.error("a variant or --all is required")
+
+    frame_cache.max_bytes = args.cache_mb * 1024 * 1024
+    frame_ms = args.speed if args.speed > 0 else load_frame_duration_ms()
+    use_atlas = not args.no_atlas
+    kind = "png" if args.png else "both" if args.both else "anim"
+
+    if args.all:
+        outputs, errors = render_all(kind, frame_ms, use_atlas, args.format, args.jobs)
+        for p in outputs:
+            print(p)
+        if not outputs:
+            print(f"Error: no variants with frames in {SPRITES_DIR}", file=sys.stderr)
+            return 1
+        return 1 if errors else 0
+
     # Validate variant exists
     variant_dir = SPRITES_DIR / args.variant
     if not variant_dir.is_dir():
         print(f"Error: variant directory not found: {variant_dir}", file=sys.stderr)
         return 1
 
-    if args.png:
-        outputs = generate_sheet(args.variant, args.animation, args.direction)
-    else:
-        frame_ms = args.speed if args.speed > 0 else load_frame_duration_ms()
-        outputs = generate_gif(
-            args.variant, args.animation, args.direction, frame_ms
-        )
+    outputs = render_variant(
+        args.variant, args.animation, args.direction, kind, frame_ms,
+        use_atlas, args.format,
+    )
 
     if not outputs:
         print("Error: no frames found for the given arguments", file=sys.stderr)
@@ -5,6 +5,10 @@ Reads a manifest.json listing individual frame PNGs and packs them into
 grid-layout atlas spritesheets. Generates atlas.json with frame-to-rect
 mappings that UnitSpriteHandler can use via AtlasTexture.
 
+If the manifest lists LOD sets (generate_manifest --lods), each is packed
+into its own spritesheet_lod<size>_NN.png sheets and described in the
+"lods" section of atlas.json.
+
 Usage:
     python3 tools/spritesheet_packer.py villager
     python3 tools/spritesheet_packer.py archer --max-width 1536
@@ -84,16 +88,24 @@ def compute_grid(frame_count, frame_w, frame_h, max_width, max_height):
     return cols, rows, sheets
 
 
-def pack_spritesheet(sprite_dir, manifest, max_width, max_height, dry_run=False):
+def pack_spritesheet(sprite_dir, manifest, max_width, max_height, dry_run=False,
+                     frame_dir=None, canvas_size=None,
+                     sheet_prefix="spritesheet"):
     """Pack individual PNGs into atlas spritesheets.
 
+    Frames are read from frame_dir (default: sprite_dir) at canvas_size
+    (default: the manifest's); sheets are written to sprite_dir as
+    {sheet_prefix}_NN.png.
+
     Returns atlas metadata dict and list of generated sheet paths.
     """
     _require_pil()
 
     sprites = manifest.get("sprites", [])
-    canvas_size = manifest.get("canvas_size", [128, 128])
+    if canvas_size is None:
+        canvas_size = manifest.get("canvas_size", [128, 128])
     frame_w, frame_h = canvas_size
+    frame_dir = frame_dir or sprite_dir
 
     if not sprites:
         print("Error: no sprites in manifest", file=sys.stderr)
@@ -125,7 +137,7 @@ def pack_spritesheet(sprite_dir, manifest, max_width, max_height, dry_run=False)
         sheet_w = sheet_cols * frame_w
         sheet_h = sheet_rows * frame_h
 
-        sheet_name = f"spritesheet_{sheet_idx:02d}.png"
+        sheet_name = f"{sheet_prefix}_{sheet_idx:02d}.png"
         sheet_path = sprite_dir / sheet_name
 
         sheet_meta = {
@@ -161,7 +173,7 @@ def pack_spritesheet(sprite_dir, manifest, max_width, max_height, dry_run=False)
             sheet_meta["frames"].append(frame_meta)
 
             if not dry_run:
-                frame_path = sprite_dir / filename
+                frame_path = frame_dir / filename
                 if frame_path.exists():
                     frame_img = Image.open(frame_path).convert("RGBA")
                     if frame_img.size != (frame_w, frame_h):
@@ -182,6 +194,31 @@ def pack_spritesheet(sprite_dir, manifest, max_width, max_height, dry_run=False)
     return atlas, sheet_paths
 
 
+def pack_lods(sprite_dir, manifest, max_width, max_height, dry_run=False):
+    """Pack each LOD set listed in the manifest into its own sheets.
+
+    Returns the atlas "lods" list: one entry per LOD with its canvas_size,
+    frame dir and sheets (same layout as the top-level atlas).
+    """
+    lods = []
+    for lod in manifest.get("lods", []):
+        canvas_size = lod["canvas_size"]
+        print(f"  LOD {canvas_size[0]}x{canvas_size[1]}:")
+        atlas, _ = pack_spritesheet(
+            sprite_dir, manifest, max_width, max_height, dry_run=dry_run,
+            frame_dir=sprite_dir / lod["dir"], canvas_size=canvas_size,
+            sheet_prefix=f"spritesheet_lod{canvas_size[0]}",
+        )
+        if atlas is None:
+            return None
+        lods.append({
+            "canvas_size": canvas_size,
+            "dir": lod["dir"],
+            "sheets": atlas["sheets"],
+        })
+    return lods
+
+
 def write_atlas_json(sprite_dir, atlas, dry_run=False):
     """Write atlas.json with frame-to-rect mappings."""
     atlas_path = sprite_dir / "atlas.json"
@@ -247,6 +284,13 @@ def main(argv=None):
     if atlas is None:
         return 1
 
+    if manifest.get("lods"):
+        lods = pack_lods(sprite_dir, manifest, args.max_width,
+                         args.max_height, dry_run=args.dry_run)
+        if lods is None:
+            return 1
+        atlas["lods"] = lods
+
     write_atlas_json(sprite_dir, atlas, dry_run=args.dry_run)
 
     total_frames = sum(len(s["frames"]) for s in atlas["sheets"])
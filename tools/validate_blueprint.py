@@ -104,6 +104,11 @@ def validate_blueprint(blueprint_path, schema):
                 f"animations.frame_counts.{anim_name}: must be positive integer"
             )
 
+    # Validate mirror_symmetric
+    if "mirror_symmetric" in blueprint and not isinstance(
+            blueprint["mirror_symmetric"], bool):
+        errors.append("mirror_symmetric: must be true or false")
+
     # Validate stats_template
     valid_stats = {"ranged", "melee"}
     st = blueprint.get("stats_template", "")